@@ -12,12 +12,14 @@
 #   --require-tasks     Require tasks.md to exist (for implementation phase)
 #   --include-tasks     Include tasks.md in AVAILABLE_DOCS list
 #   --paths-only        Only output path variables (no validation)
+#   --all-paths         One JSON object with every path plus document availability (no validation)
 #   --help, -h          Show help message
 #
 # OUTPUTS:
 #   JSON mode: {"FEATURE_DIR":"...", "AVAILABLE_DOCS":["..."]}
 #   Text mode: FEATURE_DIR:... \n AVAILABLE_DOCS: \n ✓/✗ file.md
 #   Paths only: REPO_ROOT: ... \n BRANCH: ... \n FEATURE_DIR: ... etc.
+#   All paths: {"REPO_ROOT":"...", ..., "AVAILABLE_DOCS":["spec.md","plan.md",...]}
 
 set -e
 
@@ -26,6 +28,7 @@ JSON_MODE=false
 REQUIRE_TASKS=false
 INCLUDE_TASKS=false
 PATHS_ONLY=false
+ALL_PATHS=false
 
 for arg in "$@"; do
 	case "$arg" in
@@ -41,6 +44,9 @@ for arg in "$@"; do
 	--paths-only)
 		PATHS_ONLY=true
 		;;
+	--all-paths)
+		ALL_PATHS=true
+		;;
 	--help | -h)
 		cat <<'EOF'
 Usage: check-prerequisites.sh [OPTIONS]
@@ -52,6 +58,8 @@ OPTIONS:
   --require-tasks     Require tasks.md to exist (for implementation phase)
   --include-tasks     Include tasks.md in AVAILABLE_DOCS list
   --paths-only        Only output path variables (no prerequisite validation)
+  --all-paths         Every path plus document availability as one JSON object
+                      (no validation; replaces repeated --paths-only/--json calls)
   --help, -h          Show this help message
 
 EXAMPLES:
@@ -63,6 +71,9 @@ EXAMPLES:
   
   # Get feature paths only (no validation)
   ./check-prerequisites.sh --paths-only
+
+  # Resolve everything in one call (paths + which docs exist)
+  ./check-prerequisites.sh --all-paths
   
 EOF
 		exit 0
@@ -77,14 +88,24 @@ done
 # Source common functions
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/common.sh"
+trace_init check-prerequisites.sh
 
 # Get feature paths and validate branch
 # SAFETY: get_feature_paths() is an internal trusted function from common.sh
 # that only outputs shell variable assignments (REPO_ROOT=..., FEATURE_DIR=..., etc.)
 # No user input is evaluated here - all values come from git commands and file paths.
+trace_phase resolve
 eval $(get_feature_paths)
 check_feature_branch "$CURRENT_BRANCH" "$HAS_GIT" || exit 1
 
+trace_phase report
+
+# Batch mode: all paths and document availability in one object
+if $ALL_PATHS; then
+	get_feature_paths_json
+	exit 0
+fi
+
 # If paths-only mode, output paths and exit (support JSON + paths-only combined)
 if $PATHS_ONLY; then
 	if $JSON_MODE; then
@@ -103,6 +124,7 @@ if $PATHS_ONLY; then
 fi
 
 # Validate required directories and files
+trace_phase validate
 if [[ ! -d "$FEATURE_DIR" ]]; then
 	echo "ERROR: Feature directory not found: $FEATURE_DIR" >&2
 	echo "Run /speckit.specify first to create the feature structure." >&2
@@ -1,65 +1,135 @@
 #!/usr/bin/env bash
 # Common functions and variables for all scripts
 
-# Get repository root, with fallback for non-git repositories
-get_repo_root() {
-    if git rev-parse --show-toplevel >/dev/null 2>&1; then
-        git rev-parse --show-toplevel
+# Opt-in timing instrumentation (SPECIFY_TRACE)
+source "${BASH_SOURCE[0]%/*}/trace.sh"
+
+# Locate the enclosing work tree without forking: sets _SPECIFY_TOP to the
+# directory holding .git and _SPECIFY_GIT_DIR to the git dir it points at
+find_git_dir() {
+    local dir="$PWD" line
+    while true; do
+        if [[ -d "$dir/.git" ]]; then
+            _SPECIFY_TOP="${dir:-/}"
+            _SPECIFY_GIT_DIR="$dir/.git"
+            return 0
+        elif [[ -f "$dir/.git" ]]; then
+            # Worktrees and submodules: ".git" is a file with "gitdir: <path>"
+            IFS= read -r line < "$dir/.git" || return 1
+            [[ "$line" == "gitdir: "* ]] || return 1
+            _SPECIFY_TOP="${dir:-/}"
+            _SPECIFY_GIT_DIR="${line#gitdir: }"
+            [[ "$_SPECIFY_GIT_DIR" == /* ]] || _SPECIFY_GIT_DIR="$dir/$_SPECIFY_GIT_DIR"
+            return 0
+        fi
+        [[ -z "$dir" ]] && return 1
+        dir="${dir%/*}"
+    done
+}
+
+# Resolve repository state once. Sets SPECIFY_REPO_ROOT, SPECIFY_GIT_BRANCH
+# (empty outside git or on an unborn branch), SPECIFY_GIT_DIR and
+# SPECIFY_HAS_GIT. A cache in the git dir keyed on the work tree and the raw
+# HEAD contents answers repeat calls without spawning git; on a miss a single
+# `git rev-parse` provides root, git dir and branch together.
+resolve_repo_state() {
+    SPECIFY_REPO_ROOT=""
+    SPECIFY_GIT_BRANCH=""
+    SPECIFY_GIT_DIR=""
+    SPECIFY_HAS_GIT=false
+
+    local key="" cache="" head="" cached_key="" out=""
+
+    # GIT_DIR/GIT_WORK_TREE change git's discovery rules; always ask git then
+    if [[ -z "${GIT_DIR:-}" && -z "${GIT_WORK_TREE:-}" ]] && find_git_dir &&
+        IFS= read -r head 2>/dev/null < "$_SPECIFY_GIT_DIR/HEAD"; then
+        key="$_SPECIFY_TOP|$head"
+        cache="$_SPECIFY_GIT_DIR/specify-paths.cache"
+        if [[ -f "$cache" ]] && {
+            IFS= read -r cached_key
+            IFS= read -r SPECIFY_REPO_ROOT
+            IFS= read -r SPECIFY_GIT_DIR
+            IFS= read -r SPECIFY_GIT_BRANCH
+        } < "$cache" 2>/dev/null && [[ "$cached_key" == "$key" && -n "$SPECIFY_REPO_ROOT" ]]; then
+            SPECIFY_HAS_GIT=true
+            return 0
+        fi
+    fi
+
+    if out=$(git rev-parse --show-toplevel --absolute-git-dir --abbrev-ref HEAD 2>/dev/null); then
+        SPECIFY_REPO_ROOT="${out%%$'\n'*}"
+        out="${out#*$'\n'}"
+        SPECIFY_GIT_DIR="${out%%$'\n'*}"
+        SPECIFY_GIT_BRANCH="${out#*$'\n'}"
+        SPECIFY_HAS_GIT=true
+        # Unborn branches keep the same HEAD after the first commit: never cached
+        if [[ -n "$cache" ]]; then
+            printf '%s\n%s\n%s\n%s\n' "$key" "$SPECIFY_REPO_ROOT" "$SPECIFY_GIT_DIR" "$SPECIFY_GIT_BRANCH" \
+                > "$cache.$$" 2>/dev/null && mv -f "$cache.$$" "$cache" 2>/dev/null || rm -f "$cache.$$" 2>/dev/null
+        fi
+    elif out=$(git rev-parse --show-toplevel --absolute-git-dir 2>/dev/null); then
+        # Repository without commits yet: no branch to report
+        SPECIFY_REPO_ROOT="${out%%$'\n'*}"
+        SPECIFY_GIT_DIR="${out#*$'\n'}"
+        SPECIFY_HAS_GIT=true
     else
         # Fall back to script location for non-git repos
         local script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-        (cd "$script_dir/../../.." && pwd)
+        SPECIFY_REPO_ROOT="$(cd "$script_dir/../../.." && pwd)"
+    fi
+}
+
+# Highest-numbered NNN-* feature directory under $1/specs (empty if none)
+find_latest_feature() {
+    local dir name number highest=0 latest=""
+    for dir in "$1"/specs/[0-9][0-9][0-9]-*/; do
+        [[ -d "$dir" ]] || continue
+        dir="${dir%/}"
+        name="${dir##*/}"
+        number=$((10#${name:0:3}))
+        if [[ "$number" -gt "$highest" ]]; then
+            highest=$number
+            latest=$name
+        fi
+    done
+    echo "$latest"
+}
+
+# Get repository root, with fallback for non-git repositories
+get_repo_root() {
+    resolve_repo_state
+    echo "$SPECIFY_REPO_ROOT"
+}
+
+# Current feature: SPECIFY_FEATURE, then the git branch, then (non-git) the
+# latest feature directory, then "main". Uses state from resolve_repo_state.
+resolved_feature_branch() {
+    if [[ -n "${SPECIFY_FEATURE:-}" ]]; then
+        echo "$SPECIFY_FEATURE"
+    elif [[ -n "$SPECIFY_GIT_BRANCH" ]]; then
+        echo "$SPECIFY_GIT_BRANCH"
+    else
+        local latest_feature
+        latest_feature=$(find_latest_feature "$SPECIFY_REPO_ROOT")
+        echo "${latest_feature:-main}"  # Final fallback
     fi
 }
 
 # Get current branch, with fallback for non-git repositories
 get_current_branch() {
-    # First check if SPECIFY_FEATURE environment variable is set
+    # SPECIFY_FEATURE wins without touching git at all
     if [[ -n "${SPECIFY_FEATURE:-}" ]]; then
         echo "$SPECIFY_FEATURE"
         return
     fi
-    
-    # Then check git if available
-    if git rev-parse --abbrev-ref HEAD >/dev/null 2>&1; then
-        git rev-parse --abbrev-ref HEAD
-        return
-    fi
-    
-    # For non-git repos, try to find the latest feature directory
-    local repo_root=$(get_repo_root)
-    local specs_dir="$repo_root/specs"
-    
-    if [[ -d "$specs_dir" ]]; then
-        local latest_feature=""
-        local highest=0
-        
-        for dir in "$specs_dir"/*; do
-            if [[ -d "$dir" ]]; then
-                local dirname=$(basename "$dir")
-                if [[ "$dirname" =~ ^([0-9]{3})- ]]; then
-                    local number=${BASH_REMATCH[1]}
-                    number=$((10#$number))
-                    if [[ "$number" -gt "$highest" ]]; then
-                        highest=$number
-                        latest_feature=$dirname
-                    fi
-                fi
-            fi
-        done
-        
-        if [[ -n "$latest_feature" ]]; then
-            echo "$latest_feature"
-            return
-        fi
-    fi
-    
-    echo "main"  # Final fallback
+    resolve_repo_state
+    resolved_feature_branch
 }
 
 # Check if we have git available
 has_git() {
-    git rev-parse --show-toplevel >/dev/null 2>&1
+    resolve_repo_state
+    [[ "$SPECIFY_HAS_GIT" == "true" ]]
 }
 
 check_feature_branch() {
@@ -84,13 +154,10 @@ check_feature_branch() {
 get_feature_dir() { echo "$1/specs/$2"; }
 
 get_feature_paths() {
-    local repo_root=$(get_repo_root)
-    local current_branch=$(get_current_branch)
-    local has_git_repo="false"
-    
-    if has_git; then
-        has_git_repo="true"
-    fi
+    resolve_repo_state
+    local repo_root="$SPECIFY_REPO_ROOT"
+    local current_branch=$(resolved_feature_branch)
+    local has_git_repo="$SPECIFY_HAS_GIT"
     
     local feature_dir=$(get_feature_dir "$repo_root" "$current_branch")
     
@@ -109,5 +176,25 @@ CONTRACTS_DIR='$feature_dir/contracts'
 EOF
 }
 
+# Every path plus document availability as one JSON object (no validation).
+# Expects the variables from get_feature_paths to be set.
+get_feature_paths_json() {
+    local docs=() doc
+    for doc in spec.md plan.md tasks.md research.md data-model.md quickstart.md; do
+        [[ -f "$FEATURE_DIR/$doc" ]] && docs+=("$doc")
+    done
+    [[ -d "$CONTRACTS_DIR" && -n $(ls -A "$CONTRACTS_DIR" 2>/dev/null) ]] && docs+=("contracts/")
+
+    local json_docs="[]"
+    if [[ ${#docs[@]} -gt 0 ]]; then
+        json_docs=$(printf '"%s",' "${docs[@]}")
+        json_docs="[${json_docs%,}]"
+    fi
+
+    printf '{"REPO_ROOT":"%s","BRANCH":"%s","HAS_GIT":%s,"FEATURE_DIR":"%s","FEATURE_DIR_EXISTS":%s,"FEATURE_SPEC":"%s","IMPL_PLAN":"%s","TASKS":"%s","RESEARCH":"%s","DATA_MODEL":"%s","QUICKSTART":"%s","CONTRACTS_DIR":"%s","AVAILABLE_DOCS":%s}\n' \
+        "$REPO_ROOT" "$CURRENT_BRANCH" "$HAS_GIT" "$FEATURE_DIR" "$([[ -d "$FEATURE_DIR" ]] && echo true || echo false)" \
+        "$FEATURE_SPEC" "$IMPL_PLAN" "$TASKS" "$RESEARCH" "$DATA_MODEL" "$QUICKSTART" "$CONTRACTS_DIR" "$json_docs"
+}
+
 check_file() { [[ -f "$1" ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
 check_dir() { [[ -d "$1" && -n $(ls -A "$1" 2>/dev/null) ]] && echo "  ✓ $2" || echo "  ✗ $2"; }
@@ -0,0 +1,400 @@
+#!/usr/bin/env bash
+
+# Constitutional Complexity Budget analyzer
+#
+# Measures Δ LOC (additions - deletions) between the merge base of two refs and
+# the head, the way a pull request diff is computed, and checks it against the
+# constitution's size classes: S ≤ 80, M ≤ 250, L ≤ 600 Δ LOC.
+#
+# Usage: ./complexity-budget.sh [OPTIONS]
+#
+# OPTIONS:
+#   --base REF              Target branch of the change (default: origin/HEAD, then main)
+#   --head REF              Tip of the change (default: HEAD)
+#   --budget S|M|L          Declared size; larger changes are "over" (default: L)
+#   --exclude GLOB          Also exclude matching paths (repeatable, gitignore-like:
+#                           "*.lock" matches any basename, "docs/gen/" a directory)
+#   --no-default-excludes   Count lockfiles and generated files too
+#   --depth N               Directory depth of the per-directory breakdown (default: 2)
+#   --json                  Print the report as one JSON object
+#   --no-cache              Ignore and do not update cached results
+#   --help, -h              Show help message
+#
+# EXCLUDED BY DEFAULT:
+#   Lockfiles (package-lock.json, yarn.lock, pnpm-lock.yaml, Cargo.lock, go.sum, ...),
+#   minified bundles, source maps, snapshots, protobuf output, dist/, coverage/,
+#   vendor/, node_modules/, __generated__/ and any path marked linguist-generated
+#   in the head commit's .gitattributes (or info/attributes, core.attributesFile)
+#
+# CACHE:
+#   Results live in <git-common-dir>/specify-budget. A repeat run for the same
+#   commits, ref names, options and attributes prints the stored report. After
+#   new pushes only the paths that changed since the previous analyzed pair are
+#   diffed again; everything else is reused.
+
+set -e
+
+BASE_REF=""
+HEAD_REF="HEAD"
+BUDGET="L"
+EXCLUDES=()
+DEFAULT_EXCLUDES=true
+DEPTH=2
+JSON_MODE=false
+USE_CACHE=true
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --base) BASE_REF="${2:-}"; shift 2 ;;
+        --head) HEAD_REF="${2:-}"; shift 2 ;;
+        --budget) BUDGET="${2:-}"; shift 2 ;;
+        --exclude) EXCLUDES+=("${2:-}"); shift 2 ;;
+        --no-default-excludes) DEFAULT_EXCLUDES=false; shift ;;
+        --depth) DEPTH="${2:-}"; shift 2 ;;
+        --json) JSON_MODE=true; shift ;;
+        --no-cache) USE_CACHE=false; shift ;;
+        --help|-h)
+            sed -n '3,33p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            echo "ERROR: Unknown option '$1'. Use --help for usage information." >&2
+            exit 1
+            ;;
+    esac
+done
+
+case "$BUDGET" in
+    S|M|L) ;;
+    s|m|l) BUDGET=$(echo "$BUDGET" | tr 'sml' 'SML') ;;
+    *)
+        echo "ERROR: --budget must be S, M or L (got '$BUDGET')" >&2
+        exit 1
+        ;;
+esac
+if ! [[ "$DEPTH" =~ ^[1-9][0-9]*$ ]]; then
+    echo "ERROR: --depth must be a positive integer (got '$DEPTH')" >&2
+    exit 1
+fi
+
+DEFAULT_PATTERNS=(
+    package-lock.json npm-shrinkwrap.json yarn.lock pnpm-lock.yaml bun.lockb
+    Cargo.lock Gemfile.lock poetry.lock Pipfile.lock composer.lock uv.lock go.sum
+    '*.min.js' '*.min.css' '*.map' '*.snap' '*.pb.go' '*_pb2.py' '*.generated.*'
+    dist/ coverage/ vendor/ node_modules/ __generated__/
+)
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/trace.sh"
+trace_init complexity-budget.sh
+
+GIT=(git -c core.quotePath=false)
+
+trace_phase resolve
+if [[ -z "$BASE_REF" ]]; then
+    if git rev-parse --verify --quiet origin/HEAD > /dev/null; then
+        BASE_REF="origin/HEAD"
+    else
+        BASE_REF="main"
+    fi
+fi
+
+# One call: repository layout plus both commits
+if ! GIT_INFO=$(git rev-parse --show-toplevel --git-common-dir \
+    --verify "$BASE_REF^{commit}" 2>/dev/null); then
+    echo "ERROR: Not a git repository or unknown base ref '$BASE_REF'" >&2
+    exit 1
+fi
+if ! HEAD_COMMIT=$(git rev-parse --verify --quiet "$HEAD_REF^{commit}"); then
+    echo "ERROR: Unknown head ref '$HEAD_REF'" >&2
+    exit 1
+fi
+{
+    IFS= read -r REPO_ROOT
+    IFS= read -r GIT_COMMON_DIR
+    IFS= read -r BASE_COMMIT
+} <<< "$GIT_INFO"
+case "$GIT_COMMON_DIR" in
+    /*) ;;
+    *) GIT_COMMON_DIR="$PWD/$GIT_COMMON_DIR" ;;
+esac
+cd "$REPO_ROOT"
+
+CACHE_DIR="$GIT_COMMON_DIR/specify-budget"
+TMP_DIR=$(mktemp -d "${TMPDIR:-/tmp}/complexity-budget.XXXXXX")
+trap 'trace_finish; rm -rf "$TMP_DIR"' EXIT
+
+# Attributes behind the linguist-generated exclusions: every .gitattributes of
+# the head commit (blob ids), plus info/attributes and core.attributesFile
+ATTRIBUTE_BLOBS=""
+ATTRIBUTES_FILE=""
+if $DEFAULT_EXCLUDES; then
+    ATTRIBUTE_BLOBS=$(git ls-tree -r "$HEAD_COMMIT" 2>/dev/null |
+        awk -F'\t' '$2 ~ /(^|\/)\.gitattributes$/ { split($1, f, " "); print f[3] "\t" $2 }')
+    ATTRIBUTES_FILE=$(git config --path core.attributesFile 2>/dev/null ||
+        echo "${XDG_CONFIG_HOME:-$HOME/.config}/git/attributes")
+fi
+
+# Everything that shapes the report besides the commits: options, the ref names
+# it prints and the attributes
+PATTERNS=("${EXCLUDES[@]}")
+$DEFAULT_EXCLUDES && PATTERNS+=("${DEFAULT_PATTERNS[@]}")
+OPTIONS_KEY=$({
+    printf '%s\n' "$BUDGET" "$DEPTH" "$DEFAULT_EXCLUDES" "$BASE_REF" "$HEAD_REF" "${PATTERNS[@]}"
+    if $DEFAULT_EXCLUDES; then
+        printf '%s\n' "-- attributes" "$ATTRIBUTE_BLOBS" "-- info/attributes"
+        cat "$GIT_COMMON_DIR/info/attributes" 2>/dev/null || true
+        printf '%s\n' "-- $ATTRIBUTES_FILE"
+        cat "$ATTRIBUTES_FILE" 2>/dev/null || true
+    fi
+} | cksum | tr ' ' '-')
+REPORT="$CACHE_DIR/report-$BASE_COMMIT-$HEAD_COMMIT-$OPTIONS_KEY"
+
+print_report() {
+    if $JSON_MODE; then
+        cat "$1.json"
+    else
+        cat "$1.txt"
+    fi
+}
+
+if $USE_CACHE && [[ -f "$REPORT.json" && -f "$REPORT.txt" ]]; then
+    print_report "$REPORT"
+    exit 0
+fi
+
+trace_phase numstat
+if ! MERGE_BASE=$(git merge-base "$BASE_COMMIT" "$HEAD_COMMIT"); then
+    echo "ERROR: '$BASE_REF' and '$HEAD_REF' have no common history" >&2
+    exit 1
+fi
+
+NUMSTAT="$CACHE_DIR/numstat-$MERGE_BASE-$HEAD_COMMIT"
+# Incremental updates pass every touched path as a pathspec; past this many a
+# full diff is cheaper
+MAX_TOUCHED=2000
+
+full_numstat() {
+    "${GIT[@]}" diff --numstat --no-renames "$MERGE_BASE" "$HEAD_COMMIT" > "$1"
+}
+
+# Rebuild the numstat of MERGE_BASE..HEAD_COMMIT from the one of an earlier pair
+# PREV_BASE..PREV_HEAD. Without rename detection a path's line counts depend only
+# on its two blobs, so the entries of paths untouched by PREV_BASE..MERGE_BASE and
+# PREV_HEAD..HEAD_COMMIT carry over unchanged; only the touched paths are diffed.
+incremental_numstat() {
+    local prev="$1" out="$2" prev_base prev_head
+    prev_base="${prev##*/numstat-}"
+    prev_head="${prev_base#*-}"
+    prev_base="${prev_base%%-*}"
+
+    {
+        [[ "$prev_base" == "$MERGE_BASE" ]] ||
+            "${GIT[@]}" diff --name-only --no-renames "$prev_base" "$MERGE_BASE"
+        [[ "$prev_head" == "$HEAD_COMMIT" ]] ||
+            "${GIT[@]}" diff --name-only --no-renames "$prev_head" "$HEAD_COMMIT"
+    } > "$TMP_DIR/touched" 2>/dev/null || return 1
+
+    # Quoted names (tabs, newlines, quotes) cannot be turned back into pathspecs
+    grep -q '^"' "$TMP_DIR/touched" && return 1
+    sort -u -o "$TMP_DIR/touched" "$TMP_DIR/touched"
+    [[ $(wc -l < "$TMP_DIR/touched") -le $MAX_TOUCHED ]] || return 1
+
+    awk -F'\t' 'FILENAME == ARGV[1] { touched[$0] = 1; next } !($3 in touched)' \
+        "$TMP_DIR/touched" "$prev" > "$out"
+    if [[ -s "$TMP_DIR/touched" ]]; then
+        sed 's/^/:(literal)/' "$TMP_DIR/touched" | tr '\n' '\0' |
+            xargs -0 "${GIT[@]}" diff --numstat --no-renames "$MERGE_BASE" "$HEAD_COMMIT" -- \
+            >> "$out" || return 1
+    fi
+}
+
+if $USE_CACHE; then
+    mkdir -p "$CACHE_DIR"
+    if [[ ! -f "$NUMSTAT" ]]; then
+        PREV=$(ls -t "$CACHE_DIR"/numstat-* 2>/dev/null | head -n 1 || true)
+        if [[ -z "$PREV" ]] || ! incremental_numstat "$PREV" "$TMP_DIR/numstat"; then
+            full_numstat "$TMP_DIR/numstat"
+        fi
+        mv -f "$TMP_DIR/numstat" "$NUMSTAT"
+        # Keep the cache bounded: the newest pairs are the useful starting points
+        ls -t "$CACHE_DIR"/numstat-* 2>/dev/null | tail -n +21 | while IFS= read -r f; do rm -f "$f"; done
+        ls -t "$CACHE_DIR"/report-*.json 2>/dev/null | tail -n +51 | while IFS= read -r f; do
+            rm -f "$f" "${f%.json}.txt"
+        done
+    else
+        # Mark as most recently used for the next incremental update
+        touch "$NUMSTAT"
+    fi
+else
+    NUMSTAT="$TMP_DIR/numstat"
+    full_numstat "$NUMSTAT"
+fi
+
+trace_phase report
+
+# linguist-generated for the paths on stdin as of the head commit, not the work
+# tree; git before 2.40 has no check-attr --source, so read the head commit's
+# tree into a scratch index and check against that
+check_generated() {
+    if git check-attr --source "$HEAD_COMMIT" linguist-generated -- . >/dev/null 2>&1; then
+        git check-attr --source "$HEAD_COMMIT" --stdin linguist-generated
+    else
+        GIT_INDEX_FILE="$TMP_DIR/attr-index" git read-tree "$HEAD_COMMIT" &&
+            GIT_INDEX_FILE="$TMP_DIR/attr-index" git check-attr --cached --stdin linguist-generated
+    fi
+}
+
+# Paths marked linguist-generated count as generated files
+: > "$TMP_DIR/generated"
+if $DEFAULT_EXCLUDES && [[ -s "$NUMSTAT" ]] &&
+    [[ -n "$ATTRIBUTE_BLOBS" || -f "$GIT_COMMON_DIR/info/attributes" || -f "$ATTRIBUTES_FILE" ]]; then
+    cut -f3- "$NUMSTAT" | check_generated 2>/dev/null |
+        awk '/: linguist-generated: (set|true)$/ { sub(/: linguist-generated: (set|true)$/, ""); print }' \
+        > "$TMP_DIR/generated" || true
+fi
+
+# Aggregate totals and directories (records: T/D/X), sort, then render both the
+# JSON and the text report in one pass
+read -r -d '' AGGREGATE_AWK << 'AWK' || true
+function glob2re(g,    re, i, c, dir, anchored, n) {
+    dir = (g ~ /\/$/); sub(/\/+$/, "", g)
+    if (g ~ /^\//) { anchored = 1; sub(/^\/+/, "", g) } else anchored = (index(g, "/") > 0)
+    re = ""; n = length(g)
+    for (i = 1; i <= n; i++) {
+        c = substr(g, i, 1)
+        if (c == "*" && substr(g, i + 1, 1) == "*") {
+            if (substr(g, i + 2, 1) == "/") { re = re "(.*/)?"; i += 2 } else { re = re ".*"; i++ }
+        } else if (c == "*") re = re "[^/]*"
+        else if (c == "?") re = re "[^/]"
+        else if (c == "\\") re = re "\\\\"
+        else if (c == "^") re = re "\\^"
+        else if (c == "]") re = re "[]]"
+        else if (index(".+()[{}|$", c)) re = re "[" c "]"
+        else re = re c
+    }
+    return (anchored ? "^" : "(^|/)") re (dir ? "/" : "$")
+}
+
+BEGIN {
+    FS = "\t"
+    np = split(patterns, pat, "\n")
+    for (i = 1; i <= np; i++) if (pat[i] != "") re[i] = glob2re(pat[i])
+}
+
+FILENAME == ARGV[1] { generated[$0] = 1; next }
+
+{
+    path = $3
+    why = ""
+    if (path in generated) why = "linguist-generated"
+    else for (i = 1; i <= np; i++) if ((i in re) && path ~ re[i]) { why = pat[i]; break }
+
+    binary = ($1 == "-")
+    add = binary ? 0 : $1 + 0; del = binary ? 0 : $2 + 0
+
+    if (why != "") {
+        xfiles++; xadd += add; xdel += del
+        print "X\t" path "\t" add "\t" del "\t" why
+        next
+    }
+
+    files++; adds += add; dels += del; bins += binary
+    n = split(path, part, "/")
+    d = "."
+    if (n > 1) {
+        d = part[1]
+        for (i = 2; i <= depth && i < n; i++) d = d "/" part[i]
+    }
+    dadd[d] += add; ddel[d] += del; dfiles[d]++
+}
+
+END {
+    printf "T\t%d\t%d\t%d\t%d\t%d\t%d\t%d\n", adds, dels, files, bins, xfiles, xadd, xdel
+    for (d in dfiles) printf "D\t%s\t%d\t%d\t%d\n", d, dadd[d], ddel[d], dfiles[d]
+}
+AWK
+
+read -r -d '' RENDER_AWK << 'AWK' || true
+function jesc(s,    out, i, c) {
+    if (s !~ /[\\"\t]/) return s
+    out = ""
+    for (i = 1; i <= length(s); i++) {
+        c = substr(s, i, 1)
+        if (c == "\\" || c == "\"") out = out "\\" c
+        else if (c == "\t") out = out "\\t"
+        else out = out c
+    }
+    return out
+}
+
+BEGIN {
+    FS = "\t"
+    limit["S"] = 80; limit["M"] = 250; limit["L"] = 600
+    rank["S"] = 1; rank["M"] = 2; rank["L"] = 3; rank["XL"] = 4
+}
+
+$1 == "T" {
+    adds = $2; dels = $3; files = $4; bins = $5; xfiles = $6; xadd = $7; xdel = $8
+    next
+}
+$1 == "D" {
+    nd++; dpath[nd] = $2; dadd[nd] = $3; ddel[nd] = $4; dfiles[nd] = $5
+    next
+}
+$1 == "X" {
+    # The JSON lists at most 100 excluded paths; the counts cover all of them
+    if (++nx <= 100) { xpath[nx] = $2; xwhy[nx] = $5 }
+    next
+}
+
+END {
+    delta = adds - dels
+    size = delta <= 80 ? "S" : delta <= 250 ? "M" : delta <= 600 ? "L" : "XL"
+    verdict = rank[size] <= rank[budget] ? "within" : "over"
+
+    printf "{\"base\":\"%s\",\"head\":\"%s\",\"base_commit\":\"%s\",\"merge_base\":\"%s\",\"head_commit\":\"%s\",", \
+        jesc(base), jesc(head), base_commit, merge_base, head_commit > json
+    printf "\"additions\":%d,\"deletions\":%d,\"delta_loc\":%d,\"files\":%d,\"binary_files\":%d,", \
+        adds, dels, delta, files, bins > json
+    printf "\"size\":\"%s\",\"budget\":\"%s\",\"limit\":%d,\"verdict\":\"%s\",\"directories\":[", \
+        size, budget, limit[budget], verdict > json
+    for (i = 1; i <= nd; i++)
+        printf "%s{\"path\":\"%s\",\"additions\":%d,\"deletions\":%d,\"delta_loc\":%d,\"files\":%d}", \
+            (i > 1 ? "," : ""), jesc(dpath[i]), dadd[i], ddel[i], dadd[i] - ddel[i], dfiles[i] > json
+    printf "],\"excluded\":{\"files\":%d,\"additions\":%d,\"deletions\":%d,\"paths\":[", xfiles, xadd, xdel > json
+    for (i = 1; i <= nx && i <= 100; i++)
+        printf "%s{\"path\":\"%s\",\"reason\":\"%s\"}", (i > 1 ? "," : ""), jesc(xpath[i]), jesc(xwhy[i]) > json
+    printf "],\"truncated\":%s}}\n", (nx > 100 ? "true" : "false") > json
+
+    printf "Complexity budget: %s...%s (%s..%s)\n", base, head, substr(merge_base, 1, 7), substr(head_commit, 1, 7) > text
+    printf "  Δ LOC: +%d -%d = %d across %d file(s)", adds, dels, delta, files > text
+    if (bins) printf ", %d binary", bins > text
+    printf "\n" > text
+    if (xfiles) printf "  Excluded: %d file(s), +%d -%d\n", xfiles, xadd, xdel > text
+    if (size == "XL")
+        printf "  Size: XL (> 600) - exceeds every class, needs the exception process\n" > text
+    else
+        printf "  Size: %s (≤ %d)\n", size, limit[size] > text
+    printf "  Verdict: %s budget %s (≤ %d Δ LOC)\n", (verdict == "within" ? "✅ within" : "❌ over"), budget, limit[budget] > text
+    if (nd) {
+        printf "\n  %-40s %8s %8s %8s %6s\n", "Directory", "+", "-", "Δ", "files" > text
+        for (i = 1; i <= nd; i++)
+            printf "  %-40s %8d %8d %8d %6d\n", dpath[i], dadd[i], ddel[i], dadd[i] - ddel[i], dfiles[i] > text
+    }
+}
+AWK
+
+awk -v depth="$DEPTH" -v patterns="$(printf '%s\n' "${PATTERNS[@]}")" "$AGGREGATE_AWK" \
+    "$TMP_DIR/generated" "$NUMSTAT" | LC_ALL=C sort -t $'\t' -k1,1 -k2,2 |
+    awk -v base="$BASE_REF" -v head="$HEAD_REF" -v base_commit="$BASE_COMMIT" \
+        -v merge_base="$MERGE_BASE" -v head_commit="$HEAD_COMMIT" -v budget="$BUDGET" \
+        -v json="$TMP_DIR/report.json" -v text="$TMP_DIR/report.txt" "$RENDER_AWK"
+
+if $USE_CACHE; then
+    mv -f "$TMP_DIR/report.json" "$REPORT.json"
+    mv -f "$TMP_DIR/report.txt" "$REPORT.txt"
+    print_report "$REPORT"
+else
+    print_report "$TMP_DIR/report"
+fi
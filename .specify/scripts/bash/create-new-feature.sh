@@ -3,11 +3,35 @@
 set -e
 
 JSON_MODE=false
+REINDEX=false
+# Branch numbers to reserve besides specs/: none | local | all (local + remote-tracking)
+BRANCH_SCAN="${SPECIFY_BRANCH_SCAN:-none}"
 ARGS=()
 for arg in "$@"; do
     case "$arg" in
         --json) JSON_MODE=true ;;
-        --help|-h) echo "Usage: $0 [--json] <feature_description>"; exit 0 ;;
+        --reindex) REINDEX=true ;;
+        --branch-scan) BRANCH_SCAN=local ;;
+        --include-remote) BRANCH_SCAN=all ;;
+        --no-branch-scan) BRANCH_SCAN=none ;;
+        --help|-h)
+            cat << EOF
+Usage: $0 [--json] [--reindex] [--branch-scan|--include-remote] <feature_description>
+
+OPTIONS:
+  --json              Output in JSON format
+  --reindex           Rebuild the feature index from a full scan of specs/
+  --branch-scan       Also skip numbers used by local NNN-* branches
+  --include-remote    Also skip numbers used by local and remote-tracking NNN-* branches
+  --no-branch-scan    Only consider the index and specs/ when numbering (default)
+  --help, -h          Show this help message
+
+ENVIRONMENT:
+  SPECIFY_BRANCH_SCAN   none | local | all (default: none)
+  SPECIFY_LOCK_TIMEOUT  Seconds to wait for the allocation lock (default: 30)
+EOF
+            exit 0
+            ;;
         *) ARGS+=("$arg") ;;
     esac
 done
@@ -18,6 +42,11 @@ if [ -z "$FEATURE_DESCRIPTION" ]; then
     exit 1
 fi
 
+case "$BRANCH_SCAN" in
+    none|local|all) ;;
+    *) echo "ERROR: SPECIFY_BRANCH_SCAN must be none, local or all (got '$BRANCH_SCAN')" >&2; exit 1 ;;
+esac
+
 # Function to find the repository root by searching for existing project markers
 find_repo_root() {
     local dir="$1"
@@ -31,13 +60,22 @@ find_repo_root() {
     return 1
 }
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/trace.sh"
+trace_init create-new-feature.sh
+
 # Resolve repository root. Prefer git information when available, but fall back
 # to searching for repository markers so the workflow still functions in repositories that
 # were initialised with --no-git.
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-
-if git rev-parse --show-toplevel >/dev/null 2>&1; then
-    REPO_ROOT=$(git rev-parse --show-toplevel)
+trace_phase resolve
+if GIT_INFO=$(git rev-parse --show-toplevel --git-common-dir 2>/dev/null); then
+    REPO_ROOT="${GIT_INFO%%$'\n'*}"
+    GIT_COMMON_DIR="${GIT_INFO#*$'\n'}"
+    # --git-common-dir is relative to the current directory unless absolute
+    case "$GIT_COMMON_DIR" in
+        /*) ;;
+        *) GIT_COMMON_DIR="$PWD/$GIT_COMMON_DIR" ;;
+    esac
     HAS_GIT=true
 else
     REPO_ROOT="$(find_repo_root "$SCRIPT_DIR")"
@@ -53,15 +91,149 @@ cd "$REPO_ROOT"
 SPECS_DIR="$REPO_ROOT/specs"
 mkdir -p "$SPECS_DIR"
 
-HIGHEST=0
-if [ -d "$SPECS_DIR" ]; then
-    for dir in "$SPECS_DIR"/*; do
-        [ -d "$dir" ] || continue
-        dirname=$(basename "$dir")
-        number=$(echo "$dirname" | grep -o '^[0-9]\+' || echo "0")
-        number=$((10#$number))
-        if [ "$number" -gt "$HIGHEST" ]; then HIGHEST=$number; fi
+# The index and its lock live in the shared git dir when available: never in the
+# work tree (nothing to commit or merge), and every worktree of the repository
+# allocates from the same counter inside the same critical section
+if [ "$HAS_GIT" = true ]; then
+    INDEX_FILE="$GIT_COMMON_DIR/specify-feature.index"
+    LOCK_DIR="$GIT_COMMON_DIR/specify-feature.lock"
+else
+    INDEX_FILE="$REPO_ROOT/.specify/feature.index"
+    LOCK_DIR="$REPO_ROOT/.specify/feature.lock"
+fi
+INDEX_HEADER="# specify feature index v2 - one line per allocated feature; safe to delete"
+
+# mkdir is atomic on every filesystem we care about, unlike flock (missing on macOS)
+acquire_lock() {
+    local timeout="${SPECIFY_LOCK_TIMEOUT:-30}" waited=0
+    until mkdir "$LOCK_DIR" 2>/dev/null; do
+        if break_stale_lock; then
+            continue
+        fi
+        if [ "$waited" -ge $((timeout * 10)) ]; then
+            echo "ERROR: Timed out waiting for feature allocation lock $LOCK_DIR" >&2
+            echo "If no other specify run is active, remove it and retry." >&2
+            exit 1
+        fi
+        sleep 0.1
+        waited=$((waited + 1))
     done
+    echo $$ > "$LOCK_DIR/pid"
+    trap 'trace_finish; rm -rf "$LOCK_DIR"' EXIT
+}
+
+# Seconds a lock may stay without a pid file: the holder writes it right after
+# mkdir, so an older lock without one belongs to a run that died in between
+LOCK_PIDLESS_GRACE=5
+
+# GNU and BSD stat spell "mtime" differently
+lock_mtime() {
+    stat -c '%Y' "$LOCK_DIR" 2>/dev/null || stat -f '%m' "$LOCK_DIR" 2>/dev/null || true
+}
+
+# Remove the lock if its holder died without releasing it. Breakers serialize on
+# a second directory, and the owner is re-read after the liveness check so a lock
+# that changed hands in between is left alone.
+break_stale_lock() {
+    local owner mtime broken=1
+    mkdir "$LOCK_DIR.break" 2>/dev/null || return 1
+    owner=$(cat "$LOCK_DIR/pid" 2>/dev/null || true)
+    if [ -n "$owner" ]; then
+        if ! kill -0 "$owner" 2>/dev/null &&
+            [ "$(cat "$LOCK_DIR/pid" 2>/dev/null || true)" = "$owner" ]; then
+            rm -rf "$LOCK_DIR"
+            broken=0
+        fi
+    else
+        mtime=$(lock_mtime)
+        if [ -n "$mtime" ] && [ $(($(date +%s) - mtime)) -gt "$LOCK_PIDLESS_GRACE" ] &&
+            [ ! -e "$LOCK_DIR/pid" ] && [ "$(lock_mtime)" = "$mtime" ]; then
+            rm -rf "$LOCK_DIR"
+            broken=0
+        fi
+    fi
+    rmdir "$LOCK_DIR.break"
+    return "$broken"
+}
+
+release_lock() {
+    rm -rf "$LOCK_DIR"
+    trap trace_finish EXIT
+}
+
+# Print "number<TAB>dir" for every numbered directory in specs/, sorted
+scan_specs() {
+    local dir name
+    for dir in "$SPECS_DIR"/*/; do
+        [ -d "$dir" ] || continue
+        dir="${dir%/}"
+        name="${dir##*/}"
+        [[ "$name" =~ ^[0-9]+ ]] || continue
+        printf '%d\t%s\n' "$((10#${BASH_REMATCH[0]}))" "$name"
+    done | sort -n -k1,1
+}
+
+# Rebuild the index from this worktree's specs/ and set HIGHEST
+rebuild_index() {
+    local tmp="$INDEX_FILE.tmp.$$"
+    HIGHEST=0
+    {
+        echo "$INDEX_HEADER"
+        scan_specs
+    } > "$tmp"
+    mv -f "$tmp" "$INDEX_FILE"
+    read_index || HIGHEST=0
+}
+
+# Set HIGHEST from the last index entry; fail if the index is missing or unreadable
+read_index() {
+    local last number
+    [ -f "$INDEX_FILE" ] || return 1
+    last=$(tail -n 1 "$INDEX_FILE")
+    if [ "$last" = "$INDEX_HEADER" ]; then
+        HIGHEST=0
+        return 0
+    fi
+    number="${last%%$'\t'*}"
+    [[ "$number" =~ ^[0-9]+$ ]] || return 1
+    HIGHEST=$number
+}
+
+# Whether specs/ may hold numbers the index has not seen: it changed since the
+# last allocation (checkout, merge, manual mkdir) or the next number is taken.
+# The index is shared by every worktree, so a number missing from this
+# worktree's specs/ is never handed out again (--reindex reclaims it).
+specs_ahead_of_index() {
+    [ "$SPECS_DIR" -nt "$INDEX_FILE" ] ||
+        compgen -G "$SPECS_DIR/$(printf '%03d' $((HIGHEST + 1)))*/" >/dev/null
+}
+
+# Highest NNN- prefix among branches (opt-in: --branch-scan / --include-remote),
+# so numbers taken in other clones are not handed out again. Any NNN+- prefix
+# counts, including issue-number branches such as 4512-fix-login-bug.
+highest_branch_number() {
+    local refs=(refs/heads)
+    [ "$BRANCH_SCAN" = all ] && refs+=(refs/remotes)
+    git for-each-ref --format='%(refname)' "${refs[@]}" 2>/dev/null | awk '
+        { sub(/.*\//, "") }
+        match($0, /^[0-9][0-9][0-9]+-/) { n = substr($0, 1, RLENGTH - 1) + 0; if (n > max) max = n }
+        END { print max + 0 }'
+}
+
+trace_phase allocate
+acquire_lock
+
+HIGHEST=0
+if [ "$REINDEX" = true ] || ! read_index; then
+    rebuild_index
+elif specs_ahead_of_index; then
+    SPECS_HIGHEST=$(scan_specs | tail -n 1)
+    SPECS_HIGHEST="${SPECS_HIGHEST%%$'\t'*}"
+    if [ "${SPECS_HIGHEST:-0}" -gt "$HIGHEST" ]; then HIGHEST=$SPECS_HIGHEST; fi
+fi
+if [ "$HAS_GIT" = true ] && [ "$BRANCH_SCAN" != none ]; then
+    BRANCH_HIGHEST=$(highest_branch_number)
+    if [ "$BRANCH_HIGHEST" -gt "$HIGHEST" ]; then HIGHEST=$BRANCH_HIGHEST; fi
 fi
 
 NEXT=$((HIGHEST + 1))
@@ -71,6 +243,7 @@ BRANCH_NAME=$(echo "$FEATURE_DESCRIPTION" | tr '[:upper:]' '[:lower:]' | sed 's/
 WORDS=$(echo "$BRANCH_NAME" | tr '-' '\n' | grep -v '^$' | head -3 | tr '\n' '-' | sed 's/-$//')
 BRANCH_NAME="${FEATURE_NUM}-${WORDS}"
 
+trace_phase branch
 if [ "$HAS_GIT" = true ]; then
     git checkout -b "$BRANCH_NAME"
 else
@@ -79,7 +252,12 @@ fi
 
 FEATURE_DIR="$SPECS_DIR/$BRANCH_NAME"
 mkdir -p "$FEATURE_DIR"
+# Appending after mkdir also leaves the index newer than specs/
+printf '%d\t%s\n' "$NEXT" "$BRANCH_NAME" >> "$INDEX_FILE"
+
+release_lock
 
+trace_phase template
 TEMPLATE="$REPO_ROOT/.specify/templates/spec-template.md"
 SPEC_FILE="$FEATURE_DIR/spec.md"
 if [ -f "$TEMPLATE" ]; then cp "$TEMPLATE" "$SPEC_FILE"; else touch "$SPEC_FILE"; fi
@@ -0,0 +1,566 @@
+#!/usr/bin/env bash
+
+# Dependency-aware scheduler for tasks.md
+#
+# Parses the tasks-template.md structure ([P] markers, [USn] story tags, phases,
+# "###" sub-sections and **Checkpoint** lines) into a dependency graph, then
+# prints the parallel execution waves and critical path, or runs the tasks'
+# attached shell commands through a bounded worker pool.
+#
+# Usage: ./schedule-tasks.sh [OPTIONS]
+#
+# OPTIONS:
+#   --tasks FILE        tasks.md to schedule (default: current feature's tasks.md)
+#   --json              Plan as one JSON object; with --run, JSON-lines progress events
+#   --run               Execute attached commands as soon as their dependencies finish
+#   --jobs N            Worker pool size for --run (default: number of CPUs)
+#   --keep-going        After a failure, keep running tasks that do not depend on it
+#   --log-dir DIR       Per-task output logs for --run (default: temporary directory)
+#   --mark-done         Check off ([X]) tasks whose command succeeded
+#   --help, -h          Show help message
+#
+# DEPENDENCY RULES:
+#   - Phases without story tags (Setup, Foundational, Polish) are barriers
+#   - Story phases start after the preceding barrier phase; different stories run in parallel
+#   - Within a story/phase, a task without [P] waits for every task before it; a [P] task
+#     only waits for the last task without [P]
+#   - "###" sub-sections and **Checkpoint** lines wait for everything above them
+#   - Tasks naming the same file (src/a.py, src/api/, setup.py) run in file order
+#   - "(depends on T012, T013)" and mentions of another story ("User Story 1", "US1")
+#     add explicit edges to earlier tasks
+#
+# COMMANDS:
+#   An indented "run:" line under a task attaches a shell command, run from REPO_ROOT:
+#     - [ ] T003 [P] Configure linting in .eslintrc.json
+#       - run: `npx eslint --init`
+#   Tasks without a command (and already checked-off tasks) complete immediately.
+
+set -e
+
+TASKS_FILE=""
+JSON_MODE=false
+RUN_MODE=false
+JOBS=""
+KEEP_GOING=false
+LOG_DIR=""
+MARK_DONE=false
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --tasks) TASKS_FILE="${2:-}"; shift 2 ;;
+        --json) JSON_MODE=true; shift ;;
+        --run) RUN_MODE=true; shift ;;
+        --jobs|-j) JOBS="${2:-}"; shift 2 ;;
+        --keep-going) KEEP_GOING=true; shift ;;
+        --log-dir) LOG_DIR="${2:-}"; shift 2 ;;
+        --mark-done) MARK_DONE=true; shift ;;
+        --help|-h)
+            sed -n '3,35p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            echo "ERROR: Unknown option '$1'. Use --help for usage information." >&2
+            exit 1
+            ;;
+    esac
+done
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/common.sh"
+trace_init schedule-tasks.sh
+
+trace_phase resolve
+if [[ -z "$TASKS_FILE" ]]; then
+    eval $(get_feature_paths)
+    check_feature_branch "$CURRENT_BRANCH" "$HAS_GIT" || exit 1
+    TASKS_FILE="$TASKS"
+else
+    REPO_ROOT=$(get_repo_root)
+fi
+
+if [[ ! -f "$TASKS_FILE" ]]; then
+    echo "ERROR: tasks.md not found: $TASKS_FILE" >&2
+    echo "Run /speckit.tasks first to create the task list." >&2
+    exit 1
+fi
+
+if [[ -z "$JOBS" ]]; then
+    JOBS=$(getconf _NPROCESSORS_ONLN 2>/dev/null || sysctl -n hw.ncpu 2>/dev/null || echo 4)
+fi
+if ! [[ "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+    echo "ERROR: --jobs must be a positive integer (got '$JOBS')" >&2
+    exit 1
+fi
+
+# Parse tasks.md and build the graph in one awk pass. Barrier phases, sub-sections
+# and story entries become zero-cost "gate" nodes so that N tasks waiting on M
+# tasks cost N + M edges instead of N * M. Every edge points from an earlier node
+# to a later one, so node order is already a topological order.
+#
+# MODE=plan prints the text report, MODE=json the JSON plan, MODE=nodes one
+# \037-separated record per node for the runner:
+#   node kind id done line wave deps(space-separated nodes) command description
+read -r -d '' GRAPH_AWK << 'AWK' || true
+function trim(s) { sub(/^[ \t]+/, "", s); sub(/[ \t]+$/, "", s); return s }
+
+function jesc(s,    out, i, c) {
+    if (s !~ /[\\"\t]/) return s
+    out = ""
+    for (i = 1; i <= length(s); i++) {
+        c = substr(s, i, 1)
+        if (c == "\\" || c == "\"") out = out "\\" c
+        else if (c == "\t") out = out "\\t"
+        else out = out c
+    }
+    return out
+}
+
+# Add a node; returns its number
+function node(kind, task, deps,    k) {
+    k = ++nn
+    nkind[k] = kind; ntask[k] = task; ndeps[k] = uniq(deps)
+    return k
+}
+
+# One node standing for every node in list (the list itself when it has one entry)
+function gate(list,    n, parts) {
+    list = uniq(list)
+    n = split(list, parts, " ")
+    if (n == 0) return ""
+    if (n == 1) return parts[1]
+    return node("gate", 0, list)
+}
+
+function uniq(list,    n, parts, i, out, seen) {
+    n = split(list, parts, " ")
+    out = ""
+    for (i = 1; i <= n; i++) {
+        if (parts[i] in seen) continue
+        seen[parts[i]] = 1
+        out = out (out == "" ? "" : " ") parts[i]
+    }
+    return out
+}
+
+function exits(key) { return sc_last[key] " " sc_pend[key] }
+
+# Exits of every scope of story s seen so far
+function story_exits(s,    n, keys, i, out) {
+    n = split(story_scopes[s], keys, SUBSEP_LIST)
+    out = ""
+    for (i = 1; i <= n; i++) if (keys[i] != "") out = out " " exits(keys[i])
+    return out
+}
+
+# Candidate file paths mentioned in a task description: dir/name.ext and dir/
+# tokens with any name (src/a.py, src/models/), and bare names with a known
+# file extension (setup.py). Library names such as Node.js are prose, not files.
+function paths_of(desc,    n, words, i, w, base, out) {
+    n = split(desc, words, /[ \t]+/)
+    out = ""
+    for (i = 1; i <= n; i++) {
+        w = words[i]
+        gsub(/^[`'"(]+|[`'",;:.)]+$/, "", w)
+        sub(/^\.\//, "", w)
+        if (w !~ /^[A-Za-z0-9_.~\/\[\]{}@-]+$/ || w !~ /[A-Za-z0-9_]/) continue
+        base = w; sub(/.*\//, "", base)
+        if (w ~ /\//) {
+            if (base == "" || base ~ /\.[A-Za-z0-9]+$/ || base ~ BARE_NAME) out = out " " w
+        } else if ((w ~ FILE_EXT && tolower(w) !~ PROSE_NAME) || w ~ BARE_NAME) {
+            out = out " " w
+        }
+    }
+    return out
+}
+
+BEGIN {
+    SUBSEP_LIST = "\035"
+    FILE_EXT = "[.](c|cc|cfg|cjs|conf|cpp|cs|css|csv|dart|env|gitignore|go|gradle|h|hpp|html|ini|java|js|json|jsx|kt|lock|md|mdc|mjs|php|prisma|proto|py|rb|rs|scss|sh|sql|svelte|swift|toml|ts|tsx|txt|vue|xml|yaml|yml)$"
+    BARE_NAME = "^(Dockerfile|Gemfile|Makefile|Procfile|Rakefile)$"
+    PROSE_NAME = "^(alpine|angular|backbone|chart|d3|ember|express|knockout|meteor|moment|nest|next|node|nuxt|p5|react|solid|three|vue)[.]js$"
+    phase = 0; group = 0; nt = 0; last = 0
+}
+
+/^```/ { fence = !fence; last = 0; next }
+fence { next }
+comment { if ($0 ~ /-->/) comment = 0; next }
+/^[ \t]*<!--/ { if ($0 !~ /-->/) comment = 1; next }
+/^## / { phase++; group++; last = 0; next }
+/^### / { group++; last = 0; next }
+/^\*\*Checkpoint/ { group++; last = 0; next }
+
+/^[ \t]*[-*] \[[ xX]\] +T[0-9A-Za-z]+/ {
+    line = $0
+    sub(/^[ \t]*[-*] \[/, "", line)
+    done = (substr(line, 1, 1) != " ")
+    line = trim(substr(line, 3))
+    id = line; sub(/[ \t].*/, "", id)
+    rest = substr(line, length(id) + 1)
+    par = 0; story = ""
+    while (1) {
+        rest = trim(rest)
+        if (rest ~ /^\[P\]/) { par = 1; rest = substr(rest, 4); continue }
+        if (match(rest, /^\[US[0-9]+\]/)) { story = substr(rest, 2, RLENGTH - 2); rest = substr(rest, RLENGTH + 1); continue }
+        break
+    }
+    # Duplicate or placeholder IDs (TXXX) stay distinct
+    if (id in seen_id) id = id "." (++seen_id[id])
+    else seen_id[id] = 1
+    nt++
+    tid[nt] = id; tdone[nt] = done; tpar[nt] = par; tstory[nt] = story
+    tphase[nt] = phase; tgroup[nt] = group; tline[nt] = NR; tdesc[nt] = rest; tcmd[nt] = ""
+    if (story != "") story_phase[phase] = 1
+    last = nt
+    next
+}
+
+last && /^[ \t]+([-*] )?[Rr]un: */ {
+    cmd = $0
+    sub(/^[ \t]+([-*] )?[Rr]un: */, "", cmd)
+    cmd = trim(cmd)
+    if (cmd ~ /^`.*`$/) cmd = substr(cmd, 2, length(cmd) - 2)
+    tcmd[last] = tcmd[last] (tcmd[last] == "" ? "" : "\n") cmd
+    next
+}
+
+/^[^ \t]/ { last = 0 }
+
+END {
+    nn = 0
+    cur_phase = -1
+    stage = ""          # scopes since the last barrier phase started
+    foundation = ""     # gate every story scope of the current stage starts from
+    foundation_made = 0
+    for (i = 1; i <= nt; i++) {
+        p = tphase[i]
+        if (p != cur_phase) {
+            if (!(p in story_phase)) {
+                # Barrier phase: wait for everything in the previous stage
+                entry = ""
+                ns = split(stage, keys, SUBSEP_LIST)
+                for (j = 1; j <= ns; j++) if (keys[j] != "") entry = entry " " exits(keys[j])
+                entry = gate(entry)
+                stage = ""
+                foundation_made = 0
+            } else if (!foundation_made) {
+                entry = ""
+                ns = split(stage, keys, SUBSEP_LIST)
+                for (j = 1; j <= ns; j++) if (keys[j] != "") entry = entry " " exits(keys[j])
+                foundation = gate(entry)
+                foundation_made = 1
+                # Story phases also run after (not alongside) earlier story-free work
+                stage = ""
+            }
+            cur_phase = p
+        }
+        if (p in story_phase) {
+            key = p SUBSEP tstory[i]
+            if (!(key in sc_group)) {
+                scope_entry = foundation
+                if (tstory[i] != "") scope_entry = scope_entry " " story_exits(tstory[i])
+                scope_entry = gate(scope_entry)
+                story_scopes[tstory[i]] = story_scopes[tstory[i]] SUBSEP_LIST key
+            }
+        } else {
+            key = p SUBSEP ""
+            scope_entry = entry
+        }
+        if (!(key in sc_group)) {
+            sc_group[key] = tgroup[i]; sc_last[key] = scope_entry; sc_pend[key] = ""
+            stage = stage SUBSEP_LIST key
+        } else if (sc_group[key] != tgroup[i]) {
+            sc_last[key] = gate(exits(key)); sc_pend[key] = ""; sc_group[key] = tgroup[i]
+        }
+
+        deps = sc_last[key]
+        if (!tpar[i]) deps = deps " " sc_pend[key]
+
+        # Explicit "(depends on T012, T013)" references to earlier tasks
+        d = tdesc[i]
+        if (match(d, /[Dd]epends on [^)]*/)) {
+            ref = substr(d, RSTART, RLENGTH)
+            while (match(ref, /T[0-9]+/)) {
+                r = substr(ref, RSTART, RLENGTH)
+                if (r in task_node) deps = deps " " task_node[r]
+                else printf "WARNING: %s depends on %s, which is not an earlier task; ignored\n", tid[i], r > "/dev/stderr"
+                ref = substr(ref, RSTART + RLENGTH)
+            }
+        }
+        # Mentions of another story wait for that story's tasks so far
+        ref = d
+        while (match(ref, /(User Story |US)[0-9]+/)) {
+            r = substr(ref, RSTART, RLENGTH)
+            sub(/^User Story /, "US", r)
+            if (r != tstory[i] && (r in story_scopes)) deps = deps " " gate(story_exits(r))
+            ref = substr(ref, RSTART + RLENGTH)
+        }
+        # Same-file conflicts run in file order
+        np = split(paths_of(d), pl, " ")
+        for (j = 1; j <= np; j++) {
+            if (pl[j] in path_node) deps = deps " " path_node[pl[j]]
+        }
+
+        k = node("task", i, deps)
+        task_node[tid[i]] = k
+        for (j = 1; j <= np; j++) path_node[pl[j]] = k
+        if (tpar[i]) sc_pend[key] = sc_pend[key] " " k
+        else { sc_last[key] = k; sc_pend[key] = "" }
+    }
+
+    # Earliest start of every node; tasks cost 1 unless already done
+    maxfin = 0; endnode = 0; width = 0; nwaves = 0; todo = 0
+    for (k = 1; k <= nn; k++) {
+        start = 0; pred[k] = 0
+        n = split(ndeps[k], dl, " ")
+        for (j = 1; j <= n; j++) if (!pred[k] || fin[dl[j]] > start) { start = fin[dl[j]]; pred[k] = dl[j] }
+        w = (nkind[k] == "task" && !tdone[ntask[k]]) ? 1 : 0
+        fin[k] = start + w
+        if (w) {
+            todo++
+            wave[k] = start + 1
+            members[start + 1] = members[start + 1] (members[start + 1] == "" ? "" : " ") tid[ntask[k]]
+            count[start + 1]++
+            if (count[start + 1] > width) width = count[start + 1]
+            if (start + 1 > nwaves) nwaves = start + 1
+            if (fin[k] > maxfin) { maxfin = fin[k]; endnode = k }
+        } else {
+            wave[k] = 0
+        }
+    }
+    cp = ""; cplen = 0
+    for (k = endnode; k; k = pred[k]) {
+        if (nkind[k] == "task" && !tdone[ntask[k]]) { cp = tid[ntask[k]] (cp == "" ? "" : " ") cp; cplen++ }
+    }
+
+    if (MODE == "nodes") {
+        for (k = 1; k <= nn; k++) {
+            t = ntask[k]
+            c = tcmd[t]; gsub(/\n/, "\036", c)
+            printf "%d\037%s\037%s\037%d\037%d\037%d\037%s\037%s\037%s\n", k, nkind[k], (t ? tid[t] : ""), (t ? tdone[t] : 0), (t ? tline[t] : 0), wave[k], ndeps[k], c, (t ? tdesc[t] : "")
+        }
+        exit
+    }
+
+    if (MODE == "json") {
+        printf "{\"TASKS_FILE\":\"%s\",\"tasks\":%d,\"done\":%d,\"waves\":[", jesc(FILE), nt, nt - todo
+        for (wv = 1; wv <= nwaves; wv++) {
+            n = split(members[wv], ml, " ")
+            printf "%s[", (wv > 1 ? "," : "")
+            for (j = 1; j <= n; j++) printf "%s\"%s\"", (j > 1 ? "," : ""), jesc(ml[j])
+            printf "]"
+        }
+        n = split(cp, ml, " ")
+        printf "],\"critical_path\":["
+        for (j = 1; j <= n; j++) printf "%s\"%s\"", (j > 1 ? "," : ""), jesc(ml[j])
+        printf "],\"max_parallelism\":%d,\"nodes\":[", width
+        for (k = 1; k <= nn; k++) {
+            t = ntask[k]
+            printf "%s{\"node\":%d,\"kind\":\"%s\"", (k > 1 ? "," : ""), k, nkind[k]
+            if (t) {
+                printf ",\"id\":\"%s\",\"line\":%d,\"done\":%s,\"parallel\":%s,\"story\":\"%s\",\"wave\":%d,\"has_command\":%s,\"description\":\"%s\"", \
+                    jesc(tid[t]), tline[t], (tdone[t] ? "true" : "false"), (tpar[t] ? "true" : "false"), \
+                    tstory[t], wave[k], (tcmd[t] != "" ? "true" : "false"), jesc(tdesc[t])
+            }
+            n = split(ndeps[k], dl, " ")
+            printf ",\"deps\":["
+            for (j = 1; j <= n; j++) printf "%s%d", (j > 1 ? "," : ""), dl[j]
+            printf "]}"
+        }
+        printf "]}\n"
+        exit
+    }
+
+    printf "📋 Tasks: %s\n", FILE
+    printf "   %d tasks (%d done), %d waves, widest wave %d\n\n", nt, nt - todo, nwaves, width
+    for (wv = 1; wv <= nwaves; wv++) printf "Wave %d (%d): %s\n", wv, count[wv], members[wv]
+    if (todo == 0) print "✅ All tasks are done"
+    else {
+        out = cp; gsub(/ /, " → ", out)
+        printf "\n🎯 Critical path (%d): %s\n", cplen, out
+    }
+}
+AWK
+
+trace_phase plan
+if ! $RUN_MODE; then
+    if $JSON_MODE; then mode=json; else mode=plan; fi
+    awk -v MODE="$mode" -v FILE="$TASKS_FILE" "$GRAPH_AWK" "$TASKS_FILE"
+    exit 0
+fi
+
+# --- Runner -------------------------------------------------------------------
+
+json_escape() {
+    local s="$1"
+    s="${s//\\/\\\\}"
+    s="${s//\"/\\\"}"
+    s="${s//$'\t'/\\t}"
+    s="${s//$'\n'/\\n}"
+    printf '%s' "$s"
+}
+
+RUN_DIR=$(mktemp -d "${TMPDIR:-/tmp}/specify-tasks.XXXXXX")
+if [[ -z "$LOG_DIR" ]]; then
+    # Kept after the run so failure logs can be inspected
+    LOG_DIR=$(mktemp -d "${TMPDIR:-/tmp}/specify-task-logs.XXXXXX")
+fi
+mkdir -p "$LOG_DIR"
+LOG_DIR="$(cd "$LOG_DIR" && pwd)"
+trap 'trace_finish; rm -rf "$RUN_DIR"' EXIT
+trap 'kill $(jobs -p) 2>/dev/null; exit 130' INT TERM
+
+# Node tables, indexed by node number (bash 3.2 has no associative arrays)
+KIND=() ID=() CMD=() DESC=() WAVE=() PENDING=() DEPENDENTS=() STATE=() STARTED=() LINE=()
+NODES=0
+while IFS=$'\037' read -r k kind id done line wave deps cmd desc; do
+    KIND[k]="$kind"; ID[k]="$id"; LINE[k]="$line"; WAVE[k]="$wave"; DESC[k]="$desc"
+    CMD[k]="${cmd//$'\036'/$'\n'}"
+    STATE[k]=""
+    [[ "$done" == 1 ]] && STATE[k]=checked
+    n=0
+    for d in $deps; do
+        DEPENDENTS[d]="${DEPENDENTS[d]:-} $k"
+        n=$((n + 1))
+    done
+    PENDING[k]=$n
+    NODES=$k
+done < <(awk -v MODE=nodes -v FILE="$TASKS_FILE" "$GRAPH_AWK" "$TASKS_FILE")
+
+# READY is append-only; RHEAD is the next node to consider
+READY=()
+RHEAD=0
+for ((k = 1; k <= NODES; k++)); do
+    [[ "${PENDING[k]}" -eq 0 ]] && READY+=("$k")
+done
+
+trace_phase run
+RUNNING=()
+FAILED=0 SUCCEEDED=0 SKIPPED=0 STOPPED=false
+RUN_STARTED=$(now_ms)
+OK_LINES=""
+
+emit() {
+    # emit EVENT NODE [STATUS] [EXTRA_JSON] [TEXT]
+    local event="$1" k="$2" status="${3:-}" extra="${4:-}" text="${5:-}"
+    if $JSON_MODE; then
+        printf '{"event":"%s","task":"%s","wave":%d,"ts":%s%s%s}\n' \
+            "$event" "$(json_escape "${ID[k]}")" "${WAVE[k]}" "$(now_ms)" \
+            "${status:+,\"status\":\"$status\"}" "$extra"
+    else
+        echo "$text"
+    fi
+}
+
+# Mark node $1 finished with status $2 and release or block its dependents
+finish() {
+    local k="$1" status="$2" j
+    STATE[k]="$status"
+    for j in ${DEPENDENTS[k]:-}; do
+        [[ -z "${STATE[j]}" || "${STATE[j]}" == checked ]] || continue
+        if [[ "$status" == failed || "$status" == blocked ]]; then
+            [[ "${KIND[j]}" == task ]] && {
+                SKIPPED=$((SKIPPED + 1))
+                emit skip "$j" blocked "" "⏭️  ${ID[j]} blocked by a failed dependency"
+            }
+            finish "$j" blocked
+        else
+            PENDING[j]=$((PENDING[j] - 1))
+            [[ "${PENDING[j]}" -eq 0 ]] && READY+=("$j")
+        fi
+    done
+    return 0
+}
+
+launch() {
+    local k="$1"
+    STARTED[k]=$(now_ms)
+    emit start "$k" "" "" "▶️  ${ID[k]} ${DESC[k]}"
+    (
+        cd "$REPO_ROOT"
+        rc=0
+        SPECIFY_TASK_ID="${ID[k]}" bash -c "${CMD[k]}" > "$LOG_DIR/${ID[k]}.log" 2>&1 < /dev/null || rc=$?
+        echo "$rc" > "$RUN_DIR/$k.rc.tmp"
+        mv "$RUN_DIR/$k.rc.tmp" "$RUN_DIR/$k.rc"
+    ) &
+    RUNNING+=("$k")
+}
+
+while :; do
+    # Start everything that is ready, up to the pool size
+    while [[ $RHEAD -lt ${#READY[@]} ]]; do
+        k="${READY[RHEAD]}"
+        if [[ "${KIND[k]}" == task && -z "${STATE[k]}" && -n "${CMD[k]}" ]] && ! $STOPPED &&
+            [[ ${#RUNNING[@]} -ge $JOBS ]]; then
+            break
+        fi
+        RHEAD=$((RHEAD + 1))
+        if [[ "${KIND[k]}" == gate ]]; then
+            finish "$k" ok
+        elif [[ "${STATE[k]}" == checked ]]; then
+            emit skip "$k" done "" "☑️  ${ID[k]} already done"
+            finish "$k" done
+        elif $STOPPED; then
+            STATE[k]=cancelled
+            SKIPPED=$((SKIPPED + 1))
+            emit skip "$k" cancelled "" "⏭️  ${ID[k]} cancelled after an earlier failure"
+        elif [[ -z "${CMD[k]}" ]]; then
+            emit skip "$k" no-command "" "➖ ${ID[k]} has no command"
+            finish "$k" noop
+        else
+            launch "$k"
+        fi
+    done
+
+    [[ ${#RUNNING[@]} -eq 0 ]] && break
+
+    # Reap finished workers
+    still=()
+    reaped=0
+    for k in "${RUNNING[@]}"; do
+        if [[ -f "$RUN_DIR/$k.rc" ]]; then
+            rc=$(cat "$RUN_DIR/$k.rc")
+            ms=$(( $(now_ms) - STARTED[k] ))
+            reaped=1
+            if [[ "$rc" -eq 0 ]]; then
+                SUCCEEDED=$((SUCCEEDED + 1))
+                OK_LINES="$OK_LINES ${LINE[k]}"
+                emit finish "$k" ok ",\"exit\":0,\"ms\":$ms" "✅ ${ID[k]} (${ms}ms)"
+                finish "$k" ok
+            else
+                FAILED=$((FAILED + 1))
+                emit finish "$k" failed ",\"exit\":$rc,\"ms\":$ms,\"log\":\"$(json_escape "$LOG_DIR/${ID[k]}.log")\"" \
+                    "❌ ${ID[k]} exited $rc (${ms}ms) - log: $LOG_DIR/${ID[k]}.log"
+                $KEEP_GOING || STOPPED=true
+                finish "$k" failed
+            fi
+        else
+            still+=("$k")
+        fi
+    done
+    RUNNING=("${still[@]}")
+    [[ $reaped -eq 1 ]] || sleep 0.02
+done
+wait
+
+trace_phase report
+# Check off succeeded tasks by line: duplicate IDs are distinct tasks and one
+# copy may have failed. Written back in place to keep the file's mode and links.
+if $MARK_DONE && [[ -n "$OK_LINES" ]]; then
+    tmp="$TASKS_FILE.tmp.$$"
+    awk -v lines="$OK_LINES" '
+        BEGIN { n = split(lines, l, " "); for (i = 1; i <= n; i++) ok[l[i]] = 1 }
+        (NR in ok) && /^[ \t]*[-*] \[ \] +T[0-9A-Za-z]+/ { sub(/\[ \]/, "[X]") }
+        { print }' "$TASKS_FILE" > "$tmp" && cat "$tmp" > "$TASKS_FILE"
+    rm -f "$tmp"
+fi
+
+ELAPSED=$(( $(now_ms) - RUN_STARTED ))
+if $JSON_MODE; then
+    printf '{"event":"summary","ok":%d,"failed":%d,"skipped":%d,"ms":%d,"jobs":%d,"log_dir":"%s"}\n' \
+        "$SUCCEEDED" "$FAILED" "$SKIPPED" "$ELAPSED" "$JOBS" "$(json_escape "$LOG_DIR")"
+else
+    echo ""
+    echo "📊 $SUCCEEDED succeeded, $FAILED failed, $SKIPPED skipped in ${ELAPSED}ms (jobs: $JOBS)"
+fi
+
+[[ $FAILED -eq 0 ]]
@@ -26,14 +26,17 @@ done
 # Get script directory and load common functions
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/common.sh"
+trace_init setup-plan.sh
 
 # Get all paths and variables from common functions
+trace_phase resolve
 eval $(get_feature_paths)
 
 # Check if we're on a proper feature branch (only for git repos)
 check_feature_branch "$CURRENT_BRANCH" "$HAS_GIT" || exit 1
 
 # Ensure the feature directory exists
+trace_phase template
 mkdir -p "$FEATURE_DIR"
 
 # Copy plan template if it exists
@@ -48,6 +51,7 @@ else
 fi
 
 # Output results
+trace_phase report
 if $JSON_MODE; then
     printf '{"FEATURE_SPEC":"%s","IMPL_PLAN":"%s","SPECS_DIR":"%s","BRANCH":"%s","HAS_GIT":"%s"}\n' \
         "$FEATURE_SPEC" "$IMPL_PLAN" "$FEATURE_DIR" "$CURRENT_BRANCH" "$HAS_GIT"
@@ -0,0 +1,128 @@
+#!/usr/bin/env bash
+# Opt-in timing instrumentation shared by the workflow scripts
+#
+# SPECIFY_TRACE unset, empty or 0 turns every function here into a no-op.
+# SPECIFY_TRACE=1 writes JSON lines to stderr; any other value names a file the
+# events are appended to (one write per line, so concurrent scripts can share it):
+#
+#   {"ts":1700000000123,"script":"setup.sh","pid":4242,"phase":"clone","ms":812,"pids":31,"git":10}
+#   {"ts":1700000000935,"script":"setup.sh","pid":4242,"phase":"total","ms":840,"pids":35,"git":12,"exit":0}
+#
+# ms is wall-clock time. pids is the growth of /proc/sys/kernel/ns_last_pid while
+# the phase ran (null where unavailable): an approximate, system-wide count of
+# the processes created, unrelated ones included, so only compare it between
+# runs on a quiet machine. git counts the git invocations of the script itself,
+# its subshells included. Tracing itself does not fork, except for one date call
+# on bash 3.2 (no EPOCHREALTIME or printf %(%s)T) when the clock is first read.
+#
+# Usage in a script:
+#   trace_init "name.sh"     after sourcing; installs an EXIT trap (scripts with
+#                            their own EXIT trap call trace_finish first in it)
+#   trace_phase "resolve"    ends the running phase and starts the next one
+
+_TRACE_ON=false
+
+# Millisecond wall clock into _TRACE_T (second resolution before bash 5: SECONDS
+# on top of an epoch read once, with printf %(%s)T on bash 4.2+ or date on 3.2)
+_trace_now() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local t="${EPOCHREALTIME/,/.}" frac
+        frac="${t#*.}000"
+        _TRACE_T=$(( ${t%.*} * 1000 + 10#${frac:0:3} ))
+    else
+        if [[ -z "${_TRACE_EPOCH_MS:-}" ]]; then
+            local epoch=""
+            printf -v epoch '%(%s)T' -1 2>/dev/null || true
+            [[ "$epoch" =~ ^[0-9]+$ ]] || epoch=$(date +%s)
+            _TRACE_EPOCH_MS=$(( (epoch - SECONDS) * 1000 ))
+        fi
+        _TRACE_T=$(( SECONDS * 1000 + _TRACE_EPOCH_MS ))
+    fi
+}
+
+# Millisecond wall clock on stdout, for the scripts' own timings
+now_ms() {
+    _trace_now
+    echo "$_TRACE_T"
+}
+
+# Last PID handed out into _TRACE_PID (empty when unreadable)
+_trace_pid() {
+    _TRACE_PID=""
+    read -r _TRACE_PID < /proc/sys/kernel/ns_last_pid 2>/dev/null || _TRACE_PID=""
+}
+
+# Git invocations so far into _TRACE_GITS (one byte per call in the counter file)
+_trace_gits() {
+    local calls=""
+    IFS= read -r calls < "$_TRACE_GIT_FILE" 2>/dev/null || true
+    _TRACE_GITS=${#calls}
+}
+
+# Emit one event: phase, started-at ms, start pid, start git count, extra JSON fields
+_trace_emit() {
+    local phase="$1" started="$2" pid="$3" gits="$4" extra="${5:-}" pids=null line
+    _trace_now
+    _trace_pid
+    _trace_gits
+    if [[ -n "$pid" && -n "$_TRACE_PID" && $_TRACE_PID -ge $pid ]]; then
+        pids=$(( _TRACE_PID - pid ))
+    fi
+    printf -v line '{"ts":%d,"script":"%s","pid":%d,"phase":"%s","ms":%d,"pids":%s,"git":%d%s}' \
+        "$_TRACE_T" "$_TRACE_SCRIPT" "$$" "$phase" $(( _TRACE_T - started )) "$pids" \
+        $(( _TRACE_GITS - gits )) "$extra"
+    if [[ -z "$_TRACE_OUT" ]]; then
+        printf '%s\n' "$line" >&2
+    else
+        printf '%s\n' "$line" >> "$_TRACE_OUT"
+    fi
+}
+
+trace_init() {
+    case "${SPECIFY_TRACE:-0}" in
+        0|"") return 0 ;;
+        1|true|stderr) _TRACE_OUT="" ;;
+        *) _TRACE_OUT="$SPECIFY_TRACE" ;;
+    esac
+    _TRACE_ON=true
+    _TRACE_SCRIPT="$1"
+    _TRACE_PHASE=""
+    _TRACE_GIT_FILE="${TMPDIR:-/tmp}/specify-trace.$$.git"
+    : > "$_TRACE_GIT_FILE"
+    git() {
+        if $_TRACE_ON; then printf . >> "$_TRACE_GIT_FILE"; fi
+        command git "$@"
+    }
+
+    _trace_now
+    _trace_pid
+    _TRACE_START_T=$_TRACE_T
+    _TRACE_START_PID=$_TRACE_PID
+    trap trace_finish EXIT
+}
+
+trace_phase() {
+    $_TRACE_ON || return 0
+    [[ -n "$_TRACE_PHASE" ]] &&
+        _trace_emit "$_TRACE_PHASE" "$_TRACE_PHASE_T" "$_TRACE_PHASE_PID" "$_TRACE_PHASE_GITS"
+    _TRACE_PHASE="$1"
+    _trace_now
+    _trace_pid
+    _trace_gits
+    _TRACE_PHASE_T=$_TRACE_T
+    _TRACE_PHASE_PID=$_TRACE_PID
+    _TRACE_PHASE_GITS=$_TRACE_GITS
+}
+
+# Close the running phase and emit the total with exit status $1 (default: $?);
+# safe to call more than once
+trace_finish() {
+    local rc="${1:-$?}"
+    $_TRACE_ON || return 0
+    [[ -n "$_TRACE_PHASE" ]] &&
+        _trace_emit "$_TRACE_PHASE" "$_TRACE_PHASE_T" "$_TRACE_PHASE_PID" "$_TRACE_PHASE_GITS"
+    _trace_emit total "$_TRACE_START_T" "$_TRACE_START_PID" 0 ",\"exit\":$rc"
+    rm -f "$_TRACE_GIT_FILE"
+    _TRACE_ON=false
+    return 0
+}
@@ -51,8 +51,10 @@ set -o pipefail
 # Get script directory and load common functions
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "$SCRIPT_DIR/common.sh"
+trace_init update-agent-context.sh
 
 # Get all paths and variables from common functions
+trace_phase resolve
 eval $(get_feature_paths)
 
 NEW_PLAN="$IMPL_PLAN"  # Alias for compatibility with existing code
@@ -75,12 +77,19 @@ Q_FILE="$REPO_ROOT/AGENTS.md"
 # Template file
 TEMPLATE_FILE="$REPO_ROOT/.specify/templates/agent-file-template.md"
 
+# Resolved once per run and shared by every rendered agent file
+PROJECT_NAME="$(basename "$REPO_ROOT")"
+CURRENT_DATE="$(date +%Y-%m-%d)"
+
 # Global variables for parsed plan data
 NEW_LANG=""
 NEW_FRAMEWORK=""
 NEW_DB=""
 NEW_PROJECT_TYPE=""
 
+# Temporary files written next to their targets, removed on exit or interrupt
+declare -a TEMP_FILES=()
+
 #==============================================================================
 # Utility Functions
 #==============================================================================
@@ -101,11 +110,33 @@ log_warning() {
     echo "WARNING: $1" >&2
 }
 
+# Create an empty temporary file next to $1 and set NEW_TEMP_FILE to its path.
+# The name goes into TEMP_FILES before the file exists, so an interrupt at any
+# point leaves nothing behind (mktemp creates the file before we could record it).
+new_temp_file() {
+    local attempt
+    for attempt in 1 2 3 4 5 6 7 8 9 10; do
+        NEW_TEMP_FILE="$1.$$.$RANDOM"
+        TEMP_FILES+=("$NEW_TEMP_FILE")
+        set -C
+        if { : > "$NEW_TEMP_FILE"; } 2>/dev/null; then
+            set +C
+            return 0
+        fi
+        set +C
+        # Taken by someone else: forget the name so cleanup leaves it alone
+        TEMP_FILES=("${TEMP_FILES[@]:0:${#TEMP_FILES[@]}-1}")
+    done
+    return 1
+}
+
 # Cleanup function for temporary files
 cleanup() {
     local exit_code=$?
+    trace_finish "$exit_code"
     rm -f /tmp/agent_update_*_$$
     rm -f /tmp/manual_additions_$$
+    rm -f ${TEMP_FILES[@]+"${TEMP_FILES[@]}"}
     exit $exit_code
 }
 
@@ -149,16 +180,29 @@ validate_environment() {
 # Plan Parsing Functions
 #==============================================================================
 
-extract_plan_field() {
-    local field_pattern="$1"
-    local plan_file="$2"
-    
-    grep "^\*\*${field_pattern}\*\*: " "$plan_file" 2>/dev/null | \
-        head -1 | \
-        sed "s|^\*\*${field_pattern}\*\*: ||" | \
-        sed 's/^[ \t]*//;s/[ \t]*$//' | \
-        grep -v "NEEDS CLARIFICATION" | \
-        grep -v "^N/A$" || echo ""
+# Print Language/Version, Primary Dependencies, Storage and Project Type (one
+# per line) in a single pass over plan.md. First "**Field**: value" line wins;
+# values are trimmed and NEEDS CLARIFICATION / N/A become empty.
+read_plan_fields() {
+    awk '
+        function field(name,   prefix, value) {
+            prefix = "**" name "**: "
+            if ((name in found) || index($0, prefix) != 1) return
+            found[name] = 1
+            value = substr($0, length(prefix) + 1)
+            gsub(/^[ \t]+|[ \t]+$/, "", value)
+            if (index(value, "NEEDS CLARIFICATION") || value == "N/A") value = ""
+            values[name] = value
+        }
+        /^\*\*/ {
+            field("Language/Version"); field("Primary Dependencies")
+            field("Storage"); field("Project Type")
+        }
+        END {
+            print values["Language/Version"]; print values["Primary Dependencies"]
+            print values["Storage"]; print values["Project Type"]
+        }
+    ' "$1"
 }
 
 parse_plan_data() {
@@ -176,10 +220,12 @@ parse_plan_data() {
     
     log_info "Parsing plan data from $plan_file"
     
-    NEW_LANG=$(extract_plan_field "Language/Version" "$plan_file")
-    NEW_FRAMEWORK=$(extract_plan_field "Primary Dependencies" "$plan_file")
-    NEW_DB=$(extract_plan_field "Storage" "$plan_file")
-    NEW_PROJECT_TYPE=$(extract_plan_field "Project Type" "$plan_file")
+    {
+        IFS= read -r NEW_LANG
+        IFS= read -r NEW_FRAMEWORK
+        IFS= read -r NEW_DB
+        IFS= read -r NEW_PROJECT_TYPE
+    } < <(read_plan_fields "$plan_file")
     
     # Log what we found
     if [[ -n "$NEW_LANG" ]]; then
@@ -281,181 +327,123 @@ create_new_agent_file() {
     
     log_info "Creating new agent context file from template..."
     
-    if ! cp "$TEMPLATE_FILE" "$temp_file"; then
-        log_error "Failed to copy template file"
-        return 1
-    fi
-    
-    # Replace template placeholders
-    local project_structure
-    project_structure=$(get_project_structure "$NEW_PROJECT_TYPE")
-    
-    local commands
-    commands=$(get_commands_for_language "$NEW_LANG")
-    
-    local language_conventions
-    language_conventions=$(get_language_conventions "$NEW_LANG")
-    
-    # Perform substitutions with error checking using safer approach
-    # Escape special characters for sed by using a different delimiter or escaping
-    local escaped_lang=$(printf '%s\n' "$NEW_LANG" | sed 's/[\[\.*^$()+{}|]/\\&/g')
-    local escaped_framework=$(printf '%s\n' "$NEW_FRAMEWORK" | sed 's/[\[\.*^$()+{}|]/\\&/g')
-    local escaped_branch=$(printf '%s\n' "$CURRENT_BRANCH" | sed 's/[\[\.*^$()+{}|]/\\&/g')
-    
     # Build technology stack and recent change strings conditionally
-    local tech_stack
-    if [[ -n "$escaped_lang" && -n "$escaped_framework" ]]; then
-        tech_stack="- $escaped_lang + $escaped_framework ($escaped_branch)"
-    elif [[ -n "$escaped_lang" ]]; then
-        tech_stack="- $escaped_lang ($escaped_branch)"
-    elif [[ -n "$escaped_framework" ]]; then
-        tech_stack="- $escaped_framework ($escaped_branch)"
+    local tech_stack recent_change
+    if [[ -n "$NEW_LANG" && -n "$NEW_FRAMEWORK" ]]; then
+        tech_stack="- $NEW_LANG + $NEW_FRAMEWORK ($CURRENT_BRANCH)"
+        recent_change="- $CURRENT_BRANCH: Added $NEW_LANG + $NEW_FRAMEWORK"
+    elif [[ -n "$NEW_LANG" ]]; then
+        tech_stack="- $NEW_LANG ($CURRENT_BRANCH)"
+        recent_change="- $CURRENT_BRANCH: Added $NEW_LANG"
+    elif [[ -n "$NEW_FRAMEWORK" ]]; then
+        tech_stack="- $NEW_FRAMEWORK ($CURRENT_BRANCH)"
+        recent_change="- $CURRENT_BRANCH: Added $NEW_FRAMEWORK"
     else
-        tech_stack="- ($escaped_branch)"
-    fi
-
-    local recent_change
-    if [[ -n "$escaped_lang" && -n "$escaped_framework" ]]; then
-        recent_change="- $escaped_branch: Added $escaped_lang + $escaped_framework"
-    elif [[ -n "$escaped_lang" ]]; then
-        recent_change="- $escaped_branch: Added $escaped_lang"
-    elif [[ -n "$escaped_framework" ]]; then
-        recent_change="- $escaped_branch: Added $escaped_framework"
-    else
-        recent_change="- $escaped_branch: Added"
+        tech_stack="- ($CURRENT_BRANCH)"
+        recent_change="- $CURRENT_BRANCH: Added"
+    fi
+    
+    # Single pass over the template. Values travel through the environment and
+    # are inserted literally (no sed escaping, so "&" or "|" in plan values are
+    # safe); "\n" sequences become newlines as before.
+    if ! PROJECT_NAME="$project_name" CURRENT_DATE="$current_date" TECH_STACK="$tech_stack" \
+        PROJECT_STRUCTURE="$(get_project_structure "$NEW_PROJECT_TYPE")" \
+        COMMANDS="$(get_commands_for_language "$NEW_LANG")" \
+        LANGUAGE_CONVENTIONS="$(get_language_conventions "$NEW_LANG")" \
+        RECENT_CHANGE="$recent_change" awk '
+        function swap(line, placeholder, value, all,   at, out) {
+            out = ""
+            while ((at = index(line, placeholder)) > 0) {
+                out = out substr(line, 1, at - 1) value
+                line = substr(line, at + length(placeholder))
+                if (!all) break
+            }
+            return out line
+        }
+        {
+            line = $0
+            if (index(line, "[")) {
+                line = swap(line, "[PROJECT NAME]", ENVIRON["PROJECT_NAME"])
+                line = swap(line, "[DATE]", ENVIRON["CURRENT_DATE"])
+                line = swap(line, "[EXTRACTED FROM ALL PLAN.MD FILES]", ENVIRON["TECH_STACK"])
+                line = swap(line, "[ACTUAL STRUCTURE FROM PLANS]", ENVIRON["PROJECT_STRUCTURE"], 1)
+                line = swap(line, "[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES]", ENVIRON["COMMANDS"])
+                line = swap(line, "[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE]", ENVIRON["LANGUAGE_CONVENTIONS"])
+                line = swap(line, "[LAST 3 FEATURES AND WHAT THEY ADDED]", ENVIRON["RECENT_CHANGE"])
+            }
+            gsub(/\\n/, "\n", line)
+            print line
+        }
+    ' "$TEMPLATE_FILE" > "$temp_file"; then
+        log_error "Failed to render template $TEMPLATE_FILE"
+        return 1
     fi
-
-    local substitutions=(
-        "s|\[PROJECT NAME\]|$project_name|"
-        "s|\[DATE\]|$current_date|"
-        "s|\[EXTRACTED FROM ALL PLAN.MD FILES\]|$tech_stack|"
-        "s|\[ACTUAL STRUCTURE FROM PLANS\]|$project_structure|g"
-        "s|\[ONLY COMMANDS FOR ACTIVE TECHNOLOGIES\]|$commands|"
-        "s|\[LANGUAGE-SPECIFIC, ONLY FOR LANGUAGES IN USE\]|$language_conventions|"
-        "s|\[LAST 3 FEATURES AND WHAT THEY ADDED\]|$recent_change|"
-    )
-    
-    for substitution in "${substitutions[@]}"; do
-        if ! sed -i.bak -e "$substitution" "$temp_file"; then
-            log_error "Failed to perform substitution: $substitution"
-            rm -f "$temp_file" "$temp_file.bak"
-            return 1
-        fi
-    done
-    
-    # Convert \n sequences to actual newlines
-    newline=$(printf '\n')
-    sed -i.bak2 "s/\\\\n/${newline}/g" "$temp_file"
-    
-    # Clean up backup files
-    rm -f "$temp_file.bak" "$temp_file.bak2"
     
     return 0
 }
 
-
-
-
 update_existing_agent_file() {
     local target_file="$1"
     local current_date="$2"
     
     log_info "Updating existing agent context file..."
     
-    # Use a single temporary file for atomic update
-    local temp_file
-    temp_file=$(mktemp) || {
+    # Temporary file next to the target so the final mv is an atomic rename
+    new_temp_file "$target_file" || {
         log_error "Failed to create temporary file"
         return 1
     }
+    local temp_file="$NEW_TEMP_FILE"
     
-    # Process the file in one pass
-    local tech_stack=$(format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
-    local new_tech_entries=()
-    local new_change_entry=""
-    
-    # Prepare new technology entries
-    if [[ -n "$tech_stack" ]] && ! grep -q "$tech_stack" "$target_file"; then
-        new_tech_entries+=("- $tech_stack ($CURRENT_BRANCH)")
-    fi
-    
-    if [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]] && ! grep -q "$NEW_DB" "$target_file"; then
-        new_tech_entries+=("- $NEW_DB ($CURRENT_BRANCH)")
-    fi
-    
-    # Prepare new change entry
-    if [[ -n "$tech_stack" ]]; then
-        new_change_entry="- $CURRENT_BRANCH: Added $tech_stack"
-    elif [[ -n "$NEW_DB" ]] && [[ "$NEW_DB" != "N/A" ]] && [[ "$NEW_DB" != "NEEDS CLARIFICATION" ]]; then
-        new_change_entry="- $CURRENT_BRANCH: Added $NEW_DB"
-    fi
-    
-    # Process file line by line
-    local in_tech_section=false
-    local in_changes_section=false
-    local tech_entries_added=false
-    local changes_entries_added=false
-    local existing_changes_count=0
-    
-    while IFS= read -r line || [[ -n "$line" ]]; do
-        # Handle Active Technologies section
-        if [[ "$line" == "## Active Technologies" ]]; then
-            echo "$line" >> "$temp_file"
-            in_tech_section=true
-            continue
-        elif [[ $in_tech_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            # Add new tech entries before closing the section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
-            fi
-            echo "$line" >> "$temp_file"
-            in_tech_section=false
-            continue
-        elif [[ $in_tech_section == true ]] && [[ -z "$line" ]]; then
-            # Add new tech entries before empty line in tech section
-            if [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-                printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
-                tech_entries_added=true
-            fi
-            echo "$line" >> "$temp_file"
-            continue
-        fi
-        
-        # Handle Recent Changes section
-        if [[ "$line" == "## Recent Changes" ]]; then
-            echo "$line" >> "$temp_file"
-            # Add new change entry right after the heading
-            if [[ -n "$new_change_entry" ]]; then
-                echo "$new_change_entry" >> "$temp_file"
-            fi
-            in_changes_section=true
-            changes_entries_added=true
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" =~ ^##[[:space:]] ]]; then
-            echo "$line" >> "$temp_file"
-            in_changes_section=false
-            continue
-        elif [[ $in_changes_section == true ]] && [[ "$line" == "- "* ]]; then
-            # Keep only first 2 existing changes
-            if [[ $existing_changes_count -lt 2 ]]; then
-                echo "$line" >> "$temp_file"
-                ((existing_changes_count++))
-            fi
-            continue
-        fi
-        
-        # Update timestamp
-        if [[ "$line" =~ \*\*Last\ updated\*\*:.*[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] ]]; then
-            echo "$line" | sed "s/[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]/$current_date/" >> "$temp_file"
-        else
-            echo "$line" >> "$temp_file"
-        fi
-    done < "$target_file"
-    
-    # Post-loop check: if we're still in the Active Technologies section and haven't added new entries
-    if [[ $in_tech_section == true ]] && [[ $tech_entries_added == false ]] && [[ ${#new_tech_entries[@]} -gt 0 ]]; then
-        printf '%s\n' "${new_tech_entries[@]}" >> "$temp_file"
+    local tech_stack
+    tech_stack=$(format_technology_stack "$NEW_LANG" "$NEW_FRAMEWORK")
+    local db="$NEW_DB"
+    [[ "$db" == "N/A" || "$db" == "NEEDS CLARIFICATION" ]] && db=""
+    
+    # Pass 1 only looks for the tech stack / database strings (and stops as
+    # soon as both are known to be present); pass 2 streams the rewrite:
+    #   - new "- <tech> (<branch>)" entries go before the first blank line or
+    #     next "## " heading of Active Technologies (or at EOF if still open)
+    #   - Recent Changes gets the new entry first, then at most 2 existing ones
+    #   - the first date on a **Last updated** line becomes today
+    #   - everything else, including manual additions, is copied verbatim
+    if ! TECH_STACK="$tech_stack" NEW_DB="$db" BRANCH="$CURRENT_BRANCH" awk -v today="$current_date" '
+        BEGIN {
+            tech = ENVIRON["TECH_STACK"]; db = ENVIRON["NEW_DB"]; branch = ENVIRON["BRANCH"]
+            want_tech = tech != ""; want_db = db != ""
+            date_re = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+        }
+        NR == FNR {
+            if (want_tech && !has_tech && index($0, tech)) has_tech = 1
+            if (want_db && !has_db && index($0, db)) has_db = 1
+            if ((!want_tech || has_tech) && (!want_db || has_db)) nextfile
+            next
+        }
+        !started {
+            started = 1
+            if (want_tech && !has_tech) entries[++entry_count] = "- " tech " (" branch ")"
+            if (want_db && !has_db) entries[++entry_count] = "- " db " (" branch ")"
+            if (want_tech) change = "- " branch ": Added " tech
+            else if (want_db) change = "- " branch ": Added " db
+        }
+        function add_entries(   i) {
+            if (added) return
+            for (i = 1; i <= entry_count; i++) print entries[i]
+            added = 1
+        }
+        $0 == "## Active Technologies" { print; in_tech = 1; next }
+        in_tech && /^##[[:space:]]/ { add_entries(); print; in_tech = 0; next }
+        in_tech && $0 == "" { add_entries(); print; next }
+        $0 == "## Recent Changes" { print; if (change != "") print change; in_changes = 1; next }
+        in_changes && /^##[[:space:]]/ { print; in_changes = 0; next }
+        in_changes && /^- / { if (kept_changes < 2) { print; kept_changes++ } next }
+        /\*\*Last updated\*\*:.*[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]/ { sub(date_re, today) }
+        { print }
+        END { if (in_tech) add_entries() }
+    ' "$target_file" "$target_file" > "$temp_file"; then
+        log_error "Failed to render $target_file"
+        rm -f "$temp_file"
+        return 1
     fi
     
     # Move temp file to target atomically
@@ -482,10 +470,8 @@ update_agent_file() {
     
     log_info "Updating $agent_name context file: $target_file"
     
-    local project_name
-    project_name=$(basename "$REPO_ROOT")
-    local current_date
-    current_date=$(date +%Y-%m-%d)
+    local project_name="$PROJECT_NAME"
+    local current_date="$CURRENT_DATE"
     
     # Create directory if it doesn't exist
     local target_dir
@@ -498,12 +484,12 @@ update_agent_file() {
     fi
     
     if [[ ! -f "$target_file" ]]; then
-        # Create new file from template
-        local temp_file
-        temp_file=$(mktemp) || {
+        # Create new file from template (rendered next to the target, like updates)
+        new_temp_file "$target_file" || {
             log_error "Failed to create temporary file"
             return 1
         }
+        local temp_file="$NEW_TEMP_FILE"
         
         if create_new_agent_file "$target_file" "$temp_file" "$project_name" "$current_date"; then
             if mv "$temp_file" "$target_file"; then
@@ -598,67 +584,32 @@ update_specific_agent() {
 
 update_all_existing_agents() {
     local found_agent=false
-    
-    # Check each possible agent file and update if it exists
-    if [[ -f "$CLAUDE_FILE" ]]; then
-        update_agent_file "$CLAUDE_FILE" "Claude Code"
-        found_agent=true
-    fi
-    
-    if [[ -f "$GEMINI_FILE" ]]; then
-        update_agent_file "$GEMINI_FILE" "Gemini CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$COPILOT_FILE" ]]; then
-        update_agent_file "$COPILOT_FILE" "GitHub Copilot"
-        found_agent=true
-    fi
-    
-    if [[ -f "$CURSOR_FILE" ]]; then
-        update_agent_file "$CURSOR_FILE" "Cursor IDE"
-        found_agent=true
-    fi
-    
-    if [[ -f "$QWEN_FILE" ]]; then
-        update_agent_file "$QWEN_FILE" "Qwen Code"
+    local entry target_file agent_name rendered="|"
+    
+    # Check each possible agent file and update if it exists. Several agents
+    # share a path (Codex/opencode and Amazon Q both use AGENTS.md), so each
+    # path is rendered once.
+    for entry in \
+        "$CLAUDE_FILE|Claude Code" \
+        "$GEMINI_FILE|Gemini CLI" \
+        "$COPILOT_FILE|GitHub Copilot" \
+        "$CURSOR_FILE|Cursor IDE" \
+        "$QWEN_FILE|Qwen Code" \
+        "$AGENTS_FILE|Codex/opencode" \
+        "$WINDSURF_FILE|Windsurf" \
+        "$KILOCODE_FILE|Kilo Code" \
+        "$AUGGIE_FILE|Auggie CLI" \
+        "$ROO_FILE|Roo Code" \
+        "$CODEBUDDY_FILE|CodeBuddy" \
+        "$Q_FILE|Amazon Q Developer CLI"; do
+        target_file="${entry%|*}"
+        agent_name="${entry##*|}"
+        [[ -f "$target_file" ]] || continue
+        [[ "$rendered" == *"|$target_file|"* ]] && continue
+        rendered="$rendered$target_file|"
+        update_agent_file "$target_file" "$agent_name"
         found_agent=true
-    fi
-    
-    if [[ -f "$AGENTS_FILE" ]]; then
-        update_agent_file "$AGENTS_FILE" "Codex/opencode"
-        found_agent=true
-    fi
-    
-    if [[ -f "$WINDSURF_FILE" ]]; then
-        update_agent_file "$WINDSURF_FILE" "Windsurf"
-        found_agent=true
-    fi
-    
-    if [[ -f "$KILOCODE_FILE" ]]; then
-        update_agent_file "$KILOCODE_FILE" "Kilo Code"
-        found_agent=true
-    fi
-
-    if [[ -f "$AUGGIE_FILE" ]]; then
-        update_agent_file "$AUGGIE_FILE" "Auggie CLI"
-        found_agent=true
-    fi
-    
-    if [[ -f "$ROO_FILE" ]]; then
-        update_agent_file "$ROO_FILE" "Roo Code"
-        found_agent=true
-    fi
-
-    if [[ -f "$CODEBUDDY_FILE" ]]; then
-        update_agent_file "$CODEBUDDY_FILE" "CodeBuddy"
-        found_agent=true
-    fi
-
-    if [[ -f "$Q_FILE" ]]; then
-        update_agent_file "$Q_FILE" "Amazon Q Developer CLI"
-        found_agent=true
-    fi
+    done
     
     # If no agent files exist, create a default Claude file
     if [[ "$found_agent" == false ]]; then
@@ -693,17 +644,20 @@ print_summary() {
 
 main() {
     # Validate environment before proceeding
+    trace_phase validate
     validate_environment
     
     log_info "=== Updating agent context files for feature $CURRENT_BRANCH ==="
     
     # Parse the plan file to extract project information
+    trace_phase parse-plan
     if ! parse_plan_data "$NEW_PLAN"; then
         log_error "Failed to parse plan data"
         exit 1
     fi
     
     # Process based on agent type argument
+    trace_phase update-agents
     local success=true
     
     if [[ -z "$AGENT_TYPE" ]]; then
@@ -721,6 +675,7 @@ main() {
     fi
     
     # Print summary
+    trace_phase summary
     print_summary
     
     if [[ "$success" == true ]]; then
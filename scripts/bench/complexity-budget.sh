@@ -0,0 +1,148 @@
+#!/bin/bash
+
+# Trivance Platform - Complexity Budget Benchmark
+# Build a repository with a long history, then analyze a feature branch through
+# its pushes with complexity-budget.sh: cold, cached, incremental after a push and
+# after merging a moved base, checking every cached result against a fresh diff
+#
+# Usage: ./scripts/bench/complexity-budget.sh [COMMITS] [FILES]
+#   COMMITS   Commits on main before the feature branch (default: 20000)
+#   FILES     Files in the tree (default: 5000)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+ANALYZER="$REPO_ROOT/.specify/scripts/bash/complexity-budget.sh"
+COMMITS="${1:-20000}"
+FILES="${2:-5000}"
+
+[[ "$COMMITS" =~ ^[1-9][0-9]*$ && "$FILES" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [COMMITS] [FILES]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/complexity-budget-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+REPO="$BENCH_DIR/repo"
+FAILED=0
+
+export GIT_AUTHOR_NAME=bench GIT_AUTHOR_EMAIL=bench@localhost
+export GIT_COMMITTER_NAME=bench GIT_COMMITTER_EMAIL=bench@localhost
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Run the analyzer on main...feature with extra arguments, saving the JSON report
+# to $BENCH_DIR/$1.json; prints the milliseconds taken
+analyze() {
+    local name="$1" started
+    shift
+    started=$(now_ms)
+    (cd "$REPO" && "$ANALYZER" --base main --head feature --json "$@") > "$BENCH_DIR/$name.json"
+    echo $(( $(now_ms) - started ))
+}
+
+expect() {
+    local label="$1" file="$2" pattern="$3"
+    if grep -q -- "$pattern" "$BENCH_DIR/$file.json"; then
+        echo "✅ $label"
+    else
+        echo "❌ $label (expected $pattern)"
+        FAILED=1
+    fi
+}
+
+# Cached and incremental reports must match a fresh full diff exactly
+expect_same() {
+    local label="$1" cached="$2" fresh="$3"
+    if cmp -s "$BENCH_DIR/$cached.json" "$BENCH_DIR/$fresh.json"; then
+        echo "✅ $label"
+    else
+        echo "❌ $label ($cached.json differs from $fresh.json)"
+        FAILED=1
+    fi
+}
+
+# fast-import stream: FILES files of 20 lines, then COMMITS-1 commits each
+# rewriting one file, then the first feature push (40 new files of 5 lines, a
+# 60k-entry lockfile update and bundles in dist/)
+generate_history() {
+    awk -v commits="$COMMITS" -v files="$FILES" '
+    function blob(path, text) { printf "M 644 inline %s\ndata %d\n%s", path, length(text), text }
+    function commit(ref, msg, parent) {
+        printf "commit %s\nmark :%d\ncommitter bench <bench@localhost> %d +0000\ndata %d\n%s\n", \
+            ref, ++mark, 1700000000 + mark, length(msg) + 1, msg
+        if (parent) printf "from :%d\n", parent
+    }
+    function lines(n, tag,    i, s) { s = ""; for (i = 1; i <= n; i++) s = s tag " line " i "\n"; return s }
+    # Lockfile-style churn: every seventh entry bumped, so the diff has many hunks
+    function lockfile(n, v,    i, s) {
+        s = ""
+        for (i = 1; i <= n; i++) s = s "\"pkg-" i "\": \"1." (i % 7 == 0 ? v : 0) "." i "\",\n"
+        return s
+    }
+    function path(f) { return sprintf("src/mod%02d/file%05d.txt", f % 50, f) }
+    BEGIN {
+        commit("refs/heads/main", "initial", 0)
+        for (f = 0; f < files; f++) blob(path(f), lines(20, "file " f))
+        blob("package-lock.json", lockfile(60000, 0))
+        for (k = 1; k < commits; k++) {
+            commit("refs/heads/main", "change " k, mark)
+            f = k % files
+            blob(path(f), lines(20, "file " f " rev " k))
+        }
+        main = mark
+        commit("refs/heads/feature", "feature push 1", main)
+        for (f = 0; f < 40; f++) blob(sprintf("feature/part%02d.txt", f), lines(5, "feature " f))
+        blob("package-lock.json", lockfile(60000, 1))
+        blob("dist/app.min.js", lines(30000, "bundle"))
+        blob("dist/app.js", lines(30000, "bundle"))
+    }'
+}
+
+echo "🏗️  Building history: $COMMITS commits, $FILES files"
+started=$(now_ms)
+git init -q -b main "$REPO"
+generate_history | git -C "$REPO" fast-import --quiet
+git -C "$REPO" checkout -q feature
+echo "   built in $(( $(now_ms) - started )) ms"
+
+printf '\n%-44s %8s\n' "Scenario" "ms"
+printf '%-44s %8s\n' "push 1: full diff (--no-cache)" "$(analyze fresh1 --no-cache)"
+printf '%-44s %8s\n' "push 1: first run (fills cache)" "$(analyze push1)"
+printf '%-44s %8s\n' "push 1: repeat (cached report)" "$(analyze push1-again)"
+
+# Second push: two more files
+for f in 40 41; do
+    awk -v f="$f" 'BEGIN { for (i = 1; i <= 5; i++) print "feature " f " line " i }' \
+        > "$REPO/feature/part$f.txt"
+done
+git -C "$REPO" add feature && git -C "$REPO" commit -q -m "feature push 2"
+printf '%-44s %8s\n' "push 2: incremental" "$(analyze push2)"
+printf '%-44s %8s\n' "push 2: full diff (--no-cache)" "$(analyze fresh2 --no-cache)"
+
+# Base moves on: 100 more commits on main, merged into the feature branch
+git -C "$REPO" checkout -q main
+for k in $(seq 1 100); do
+    echo "main after fork $k" >> "$REPO/src/mod00/file00000.txt"
+    git -C "$REPO" commit -q -am "main $k"
+done
+git -C "$REPO" checkout -q feature
+git -C "$REPO" merge -q --no-edit main
+printf '%-44s %8s\n' "push 3 (main merged): incremental" "$(analyze push3)"
+printf '%-44s %8s\n' "push 3 (main merged): full diff (--no-cache)" "$(analyze fresh3 --no-cache)"
+
+echo ""
+expect "push 1 Δ LOC (exclusions applied)"  push1 '"additions":200,"deletions":0,"delta_loc":200,"files":40,'
+expect "push 1 size M, within budget"       push1 '"size":"M","budget":"L","limit":600,"verdict":"within"'
+expect "lockfile excluded"                   push1 '{"path":"package-lock.json","reason":"package-lock.json"}'
+expect "bundle excluded"                     push1 '{"path":"dist/app.min.js","reason":"\*.min.js"}'
+expect "dist/ excluded"                      push1 '{"path":"dist/app.js","reason":"dist/"}'
+expect "push 3 Δ LOC after base moved"       push3 '"additions":210,"deletions":0,"delta_loc":210,"files":42,'
+expect_same "push 1 cached report matches"   push1-again fresh1
+expect_same "push 1 report matches"          push1 fresh1
+expect_same "push 2 incremental matches"     push2 fresh2
+expect_same "push 3 incremental matches"     push3 fresh3
+
+exit "$FAILED"
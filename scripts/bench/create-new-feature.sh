@@ -0,0 +1,118 @@
+#!/bin/bash
+
+# Trivance Platform - Feature Number Allocation Benchmark
+# Stress parallel create-new-feature.sh runs for duplicates and time allocation
+# on a repo with many spec directories
+#
+# Usage: ./scripts/bench/create-new-feature.sh [SPECS] [PARALLEL] [BASELINE_REF]
+#   SPECS          Number of specs/NNN-* directories for the timing runs (default: 10000)
+#   PARALLEL       Concurrent allocations per stress scenario (default: 40)
+#   BASELINE_REF   Also time the script as of this git ref (e.g. HEAD~1)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+SPECS="${1:-10000}"
+PARALLEL="${2:-40}"
+BASELINE_REF="${3:-}"
+
+[[ "$SPECS" =~ ^[1-9][0-9]*$ && "$PARALLEL" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [SPECS] [PARALLEL] [BASELINE_REF]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/create-feature-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+FAILED=0
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Fixture $1 with .specify/ from $2; git repo unless $3 is "nogit"
+make_fixture() {
+    local dir="$1" specify="$2" kind="${3:-git}"
+    mkdir -p "$dir/specs"
+    cp -R "$specify" "$dir/.specify"
+    if [[ "$kind" == git ]]; then
+        git -C "$dir" init -q
+        git -C "$dir" -c user.name=bench -c user.email=bench@localhost commit -q --allow-empty -m init
+    fi
+}
+
+# Create $SPECS numbered spec directories in fixture $1
+add_specs() {
+    (cd "$1/specs" && awk -v n="$SPECS" 'BEGIN {
+        for (i = 1; i <= n; i++) printf "%03d-bench-%d\n", i, i
+    }' | xargs mkdir -p)
+}
+
+# Launch $2 allocations in fixture $1 in the background, outputs under $BENCH_DIR/out/$3
+spawn_allocations() {
+    local dir="$1" count="$2" tag="$3" prefix="${4:-run}" i
+    mkdir -p "$BENCH_DIR/out/$tag"
+    for ((i = 0; i < count; i++)); do
+        (cd "$dir" && bash .specify/scripts/bash/create-new-feature.sh --json "stress $tag $prefix $i" \
+            > "$BENCH_DIR/out/$tag/$prefix-$i.json" 2> "$BENCH_DIR/out/$tag/$prefix-$i.err") &
+    done
+}
+
+# Check that every allocation under $BENCH_DIR/out/$2 succeeded with a unique number
+check_unique() {
+    local label="$1" tag="$2" expected="$3" got dupes
+    got=$(cat "$BENCH_DIR/out/$tag"/*.json | grep -c '"FEATURE_NUM"' || true)
+    dupes=$(cat "$BENCH_DIR/out/$tag"/*.json | sed -n 's/.*"FEATURE_NUM":"\([0-9]*\)".*/\1/p' | sort | uniq -d)
+    if [[ "$got" -eq "$expected" && -z "$dupes" ]]; then
+        echo "✅ $label: $got allocations, no duplicate numbers"
+    else
+        echo "❌ $label: $got/$expected allocations, duplicates: ${dupes:-none}"
+        FAILED=1
+    fi
+}
+
+# Milliseconds for one allocation in fixture $1
+time_allocation() {
+    local started
+    started=$(now_ms)
+    (cd "$1" && bash .specify/scripts/bash/create-new-feature.sh --json "timing run" >/dev/null 2>&1)
+    echo $(( $(now_ms) - started ))
+}
+
+echo "🔒 Stress: $PARALLEL parallel allocations per scenario"
+make_fixture "$BENCH_DIR/stress-git" "$REPO_ROOT/.specify"
+spawn_allocations "$BENCH_DIR/stress-git" "$PARALLEL" git
+wait
+check_unique git git "$PARALLEL"
+
+make_fixture "$BENCH_DIR/stress-nogit" "$REPO_ROOT/.specify" nogit
+spawn_allocations "$BENCH_DIR/stress-nogit" "$PARALLEL" nogit
+wait
+check_unique "no git" nogit "$PARALLEL"
+
+# Two worktrees of one repository: separate specs/, shared branch namespace
+make_fixture "$BENCH_DIR/stress-wt" "$REPO_ROOT/.specify"
+git -C "$BENCH_DIR/stress-wt" worktree add -q "$BENCH_DIR/stress-wt2" -b bench-wt2
+cp -R "$REPO_ROOT/.specify" "$BENCH_DIR/stress-wt2/.specify"
+spawn_allocations "$BENCH_DIR/stress-wt" $(( (PARALLEL + 1) / 2 )) worktrees a
+spawn_allocations "$BENCH_DIR/stress-wt2" $(( PARALLEL / 2 )) worktrees b
+wait
+check_unique "two worktrees" worktrees "$PARALLEL"
+
+echo ""
+echo "⏱️  Timing: one allocation with $SPECS spec directories"
+make_fixture "$BENCH_DIR/time-current" "$REPO_ROOT/.specify"
+add_specs "$BENCH_DIR/time-current"
+printf '%-40s %8s\n' "Scenario" "ms"
+printf '%-40s %8s\n' "current: cold (no index)" "$(time_allocation "$BENCH_DIR/time-current")"
+printf '%-40s %8s\n' "current: warm index" "$(time_allocation "$BENCH_DIR/time-current")"
+printf '%-40s %8s\n' "current: warm index (repeat)" "$(time_allocation "$BENCH_DIR/time-current")"
+
+if [[ -n "$BASELINE_REF" ]]; then
+    mkdir -p "$BENCH_DIR/baseline-src"
+    git -C "$REPO_ROOT" archive "$BASELINE_REF" .specify | tar -x -C "$BENCH_DIR/baseline-src"
+    make_fixture "$BENCH_DIR/time-baseline" "$BENCH_DIR/baseline-src/.specify"
+    add_specs "$BENCH_DIR/time-baseline"
+    printf '%-40s %8s\n' "$BASELINE_REF: allocation" "$(time_allocation "$BENCH_DIR/time-baseline")"
+fi
+
+exit "$FAILED"
@@ -0,0 +1,80 @@
+#!/bin/bash
+
+# Trivance Platform - Feature Path Resolution Benchmark
+# Startup latency of the .specify scripts on a repo with many spec directories
+#
+# Usage: ./scripts/bench/feature-paths.sh [SPECS] [RUNS] [BASELINE_REF]
+#   SPECS          Number of specs/NNN-* directories (default: 3000)
+#   RUNS           Invocations per scenario (default: 20)
+#   BASELINE_REF   Also time the scripts as of this git ref (e.g. HEAD~1)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+SPECS="${1:-3000}"
+RUNS="${2:-20}"
+BASELINE_REF="${3:-}"
+
+[[ "$SPECS" =~ ^[1-9][0-9]*$ && "$RUNS" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [SPECS] [RUNS] [BASELINE_REF]" >&2
+    exit 1
+}
+
+FEATURE=$(printf '%03d-bench-%d' $(( (SPECS - 1) % 999 + 1 )) "$SPECS")
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/feature-paths-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Build git and non-git fixtures with $SPECS spec directories, scripts from $2
+make_fixtures() {
+    local name="$1" specify="$2" dir
+    for dir in "$BENCH_DIR/$name-git" "$BENCH_DIR/$name-nogit"; do
+        mkdir -p "$dir/specs"
+        cp -R "$specify" "$dir/.specify"
+        # NNN wraps at 999 so every directory matches the NNN-* convention
+        (cd "$dir/specs" && awk -v n="$SPECS" 'BEGIN {
+            for (i = 1; i <= n; i++) printf "%03d-bench-%d\n", (i - 1) % 999 + 1, i
+        }' | xargs mkdir -p)
+        touch "$dir/specs/$FEATURE/plan.md"
+    done
+    dir="$BENCH_DIR/$name-git"
+    git -C "$dir" init -q
+    git -C "$dir" -c user.name=bench -c user.email=bench@localhost commit -q --allow-empty -m init
+    git -C "$dir" checkout -q -b "$FEATURE"
+}
+
+# Average milliseconds per invocation of a .specify script in fixture $1
+time_script() {
+    local fixture="$1" started i
+    shift
+    started=$(now_ms)
+    for ((i = 0; i < RUNS; i++)); do
+        (cd "$fixture" && bash "$@" >/dev/null 2>&1) || true
+    done
+    echo $(( ($(now_ms) - started) / RUNS ))
+}
+
+report() {
+    local name="$1"
+    printf '%-44s %8s\n' "$name: check-prerequisites --paths-only (git)" \
+        "$(time_script "$BENCH_DIR/$name-git" .specify/scripts/bash/check-prerequisites.sh --paths-only --json)"
+    printf '%-44s %8s\n' "$name: check-prerequisites --json (git)" \
+        "$(time_script "$BENCH_DIR/$name-git" .specify/scripts/bash/check-prerequisites.sh --json)"
+    printf '%-44s %8s\n' "$name: check-prerequisites --paths-only (no git)" \
+        "$(time_script "$BENCH_DIR/$name-nogit" .specify/scripts/bash/check-prerequisites.sh --paths-only --json)"
+}
+
+make_fixtures current "$REPO_ROOT/.specify"
+printf '%-44s %8s\n' "Scenario ($SPECS specs, $RUNS runs)" "ms/run"
+report current
+
+if [[ -n "$BASELINE_REF" ]]; then
+    mkdir -p "$BENCH_DIR/baseline-src"
+    git -C "$REPO_ROOT" archive "$BASELINE_REF" .specify | tar -x -C "$BENCH_DIR/baseline-src"
+    make_fixtures baseline "$BENCH_DIR/baseline-src/.specify"
+    report baseline
+fi
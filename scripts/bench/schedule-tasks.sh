@@ -0,0 +1,89 @@
+#!/bin/bash
+
+# Trivance Platform - tasks.md Scheduler Benchmark
+# Plan and run a synthetic tasks.md through schedule-tasks.sh, checking that the
+# worker pool never overlaps same-file tasks or crosses a phase barrier
+#
+# Usage: ./scripts/bench/schedule-tasks.sh [TASKS] [JOBS]
+#   TASKS   Tasks in the synthetic plan (default: 1000)
+#   JOBS    Worker pool size for the parallel run (default: 8)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+SCHEDULER="$REPO_ROOT/.specify/scripts/bash/schedule-tasks.sh"
+TASKS="${1:-1000}"
+JOBS="${2:-8}"
+
+[[ "$TASKS" =~ ^[1-9][0-9]*$ && "$JOBS" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [TASKS] [JOBS]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/schedule-tasks-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+FAILED=0
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Synthetic plan: setup (5%) and foundational (10%) barrier phases, 8 user stories,
+# polish (5%). Two of every three tasks are [P]; every fifth task reuses a shared
+# file. Each command asserts that everything before its barrier has finished and
+# holds a mkdir lock on its file, failing if another task holds it.
+generate_plan() {
+    awk -v n="$TASKS" 'BEGIN {
+        setup = int(n * 0.05) + 1; found = int(n * 0.10) + 1; polish = int(n * 0.05) + 1
+        stories = 8; per = int((n - setup - found - polish) / stories); if (per < 1) per = 1
+        t = 0; before = 0
+        phase("Phase 1: Setup", setup, "", 0)
+        phase("Phase 2: Foundational", found, "", 0)
+        barrier = t
+        for (s = 1; s <= stories; s++) phase("Phase " (s + 2) ": User Story " s, per, "US" s, barrier)
+        phase("Phase " (stories + 3) ": Polish", n - t, "", t)
+    }
+    function phase(title, count, story, need,    i, par, file, id) {
+        print "## " title "\n"
+        if (story == "") need = t
+        for (i = 0; i < count; i++) {
+            id = sprintf("T%04d", ++t)
+            par = (t % 3 != 0) ? "[P] " : ""
+            file = (t % 5 == 0) ? "src/shared/" (t % 4) ".py" : "src/" tolower(story == "" ? "core" : story) "/f" t ".py"
+            printf "- [ ] %s %s%s%s in %s\n", id, par, (story == "" ? "" : "[" story "] "), "Synthetic task", file
+            lock = "locks/" file; gsub(/\//, "_", lock)
+            printf "  - run: `test $(ls done | wc -l) -ge %d && mkdir %s && sleep 0.01 && rmdir %s && touch done/%s`\n", need, lock, lock, id
+            if (i == int(count / 2)) print "\n**Checkpoint**: halfway\n"
+        }
+        print ""
+    }' > "$1"
+}
+
+PLAN="$BENCH_DIR/tasks.md"
+generate_plan "$PLAN"
+mkdir -p "$BENCH_DIR/done" "$BENCH_DIR/locks"
+git -C "$BENCH_DIR" init -q
+
+echo "🧮 Planning $TASKS synthetic tasks"
+started=$(now_ms)
+bash "$SCHEDULER" --tasks "$PLAN" --json > "$BENCH_DIR/plan.json"
+plan_ms=$(( $(now_ms) - started ))
+summary=$(sed -n 's/.*"waves":\[\(.*\)\],"critical_path":\[\([^]]*\)\],"max_parallelism":\([0-9]*\).*/\1|\2|\3/p' "$BENCH_DIR/plan.json")
+waves=$(printf '%s' "${summary%%|*}" | grep -o '\]' | wc -l | tr -d ' ')
+critical=$(printf '%s' "$summary" | cut -d'|' -f2 | tr ',' '\n' | grep -c . || true)
+echo "   plan: ${plan_ms}ms, $waves waves, critical path $critical tasks, widest wave ${summary##*|}"
+
+echo "🏃 Running with --jobs $JOBS"
+started=$(now_ms)
+if (cd "$BENCH_DIR" && bash "$SCHEDULER" --tasks "$PLAN" --run --jobs "$JOBS" --json --log-dir "$BENCH_DIR/logs") > "$BENCH_DIR/run.jsonl"; then
+    echo "✅ all $TASKS tasks succeeded (no barrier or same-file violations)"
+else
+    echo "❌ $(grep -c '"status":"failed"' "$BENCH_DIR/run.jsonl") tasks failed; first failure:"
+    grep -m1 '"status":"failed"' "$BENCH_DIR/run.jsonl"
+    FAILED=1
+fi
+run_ms=$(( $(now_ms) - started ))
+serial_ms=$(sed -n 's/.*"status":"ok","exit":0,"ms":\([0-9]*\).*/\1/p' "$BENCH_DIR/run.jsonl" | awk '{ s += $1 } END { print s + 0 }')
+echo "   wall: ${run_ms}ms, summed task time: ${serial_ms}ms"
+
+exit "$FAILED"
@@ -0,0 +1,372 @@
+#!/bin/bash
+
+# Trivance Platform - Workflow Script Benchmark Suite
+# Build synthetic fixtures (thousands of specs/NNN-* directories, large plan.md,
+# CLAUDE.md and tasks.md, a workspace synced from local bare repositories), run
+# every workflow script repeatedly with SPECIFY_TRACE on, and record the median
+# and p95 of wall-clock time plus per-phase timings, PID growth and git calls to a
+# results file that can be compared between commits.
+#
+# Usage: ./scripts/bench/suite.sh [OPTIONS]
+#   --runs N            Timed runs per scenario after one warm-up run (default: 10)
+#   --specs N           specs/NNN-* directories in the project fixture (default: 2000)
+#   --lines N           Lines in the synthetic plan.md and CLAUDE.md (default: 20000)
+#   --only LIST         Comma-separated scenarios to run (default: all)
+#   --ref REF           Benchmark the scripts as of git REF instead of the working tree
+#   --out FILE          Results file (default: .bench-results/<commit>[-dirty].tsv)
+#   --baseline FILE     Compare the new results against FILE; exit 1 on regressions
+#   --compare OLD NEW   Only compare two existing results files
+#   --threshold PCT     Regression threshold for medians (default: 20, with a 5 ms floor)
+#
+# Scenarios: init setup sync-claude workspace-status check-prerequisites setup-plan
+#            create-new-feature update-agent-context schedule-tasks complexity-budget
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+SCENARIOS=(init setup sync-claude workspace-status check-prerequisites setup-plan
+    create-new-feature update-agent-context schedule-tasks complexity-budget)
+
+RUNS=10
+SPECS=2000
+LINES=20000
+ONLY=""
+REF=""
+OUT=""
+BASELINE=""
+COMPARE_OLD=""
+COMPARE_NEW=""
+THRESHOLD=20
+
+usage() {
+    sed -n '3,23p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+}
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --runs) RUNS="${2:-}"; shift 2 ;;
+        --specs) SPECS="${2:-}"; shift 2 ;;
+        --lines) LINES="${2:-}"; shift 2 ;;
+        --only) ONLY="${2:-}"; shift 2 ;;
+        --ref) REF="${2:-}"; shift 2 ;;
+        --out) OUT="${2:-}"; shift 2 ;;
+        --baseline) BASELINE="${2:-}"; shift 2 ;;
+        --compare) COMPARE_OLD="${2:-}"; COMPARE_NEW="${3:-}"; shift 3 ;;
+        --threshold) THRESHOLD="${2:-}"; shift 2 ;;
+        --help|-h) usage; exit 0 ;;
+        *) echo "❌ Unknown option '$1'. Use --help for usage information." >&2; exit 1 ;;
+    esac
+done
+
+for value in "$RUNS" "$SPECS" "$LINES" "$THRESHOLD"; do
+    [[ "$value" =~ ^[1-9][0-9]*$ ]] || {
+        echo "❌ --runs, --specs, --lines and --threshold take positive integers" >&2
+        exit 1
+    }
+done
+
+# Print old vs new medians for every step present in both files; returns 1 when
+# a median grew by more than THRESHOLD percent and at least 5 ms
+compare_results() {
+    local old="$1" new="$2"
+    [[ -f "$old" && -f "$new" ]] || {
+        echo "❌ Results file not found: $([[ -f "$old" ]] && echo "$new" || echo "$old")" >&2
+        return 2
+    }
+    awk -F'\t' -v threshold="$THRESHOLD" '
+        /^#/ || $1 == "scenario" { next }
+        FILENAME == ARGV[1] { old[$1 FS $2] = $4; next }
+        ($1 FS $2) in old {
+            o = old[$1 FS $2]; n = $4
+            pct = o > 0 ? (n - o) * 100 / o : 0
+            flag = ""
+            if (n - o >= 5 && pct > threshold) { flag = "⚠️  regression"; bad++ }
+            else if (o - n >= 5 && -pct > threshold) flag = "🚀 faster"
+            printf "%-22s %-36s %9d %9d %+8.1f%%  %s\n", $1, $2, o, n, pct, flag
+        }
+        END { exit bad > 0 }' "$old" "$new"
+}
+
+print_compare_header() {
+    echo ""
+    echo "📊 Median ms: $1 → $2"
+    printf '%-22s %-36s %9s %9s %9s\n' "Scenario" "Step" "old" "new" "change"
+}
+
+if [[ -n "$COMPARE_OLD" ]]; then
+    print_compare_header "$COMPARE_OLD" "$COMPARE_NEW"
+    compare_results "$COMPARE_OLD" "$COMPARE_NEW"
+    exit $?
+fi
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/specify-suite.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+SRC="$BENCH_DIR/src"
+PROJECT="$BENCH_DIR/project"
+WS="$BENCH_DIR/ws"
+ORCH="$WS/trivance-ai-orchestrator"
+REPOS=(trivance-mobile trivance_auth trivance_management trivance_backoffice)
+
+export GIT_AUTHOR_NAME=bench GIT_AUTHOR_EMAIL=bench@localhost
+export GIT_COMMITTER_NAME=bench GIT_COMMITTER_EMAIL=bench@localhost
+unset SPECIFY_TRACE SPECIFY_FEATURE
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# --- Sources under test --------------------------------------------------------
+
+mkdir -p "$SRC"
+if [[ -n "$REF" ]]; then
+    COMMIT=$(git -C "$REPO_ROOT" rev-parse --verify --quiet "$REF^{commit}") || {
+        echo "❌ Unknown ref: $REF" >&2
+        exit 1
+    }
+    git -C "$REPO_ROOT" archive "$COMMIT" scripts .specify .gitignore | tar -x -C "$SRC"
+    LABEL="${COMMIT:0:12}"
+else
+    cp -R "$REPO_ROOT/scripts" "$REPO_ROOT/.specify" "$REPO_ROOT/.gitignore" "$SRC/"
+    COMMIT=$(git -C "$REPO_ROOT" rev-parse --verify --quiet HEAD 2>/dev/null || echo unknown)
+    LABEL="${COMMIT:0:12}"
+    [[ -n "$(git -C "$REPO_ROOT" status --porcelain -- scripts .specify 2>/dev/null)" ]] && LABEL="$LABEL-dirty"
+fi
+OUT="${OUT:-$REPO_ROOT/.bench-results/$LABEL.tsv}"
+
+# --- Fixtures ------------------------------------------------------------------
+
+# Project: SPECS feature directories, the newest checked out with a large plan.md,
+# tasks.md and CLAUDE.md, and 100 changed source files on the feature branch
+make_project() {
+    local dir="$1" feature
+    mkdir -p "$dir/specs"
+    cp -R "$SRC/.specify" "$dir/.specify"
+    git -C "$dir" init -q -b main
+    git -C "$dir" add .specify
+    git -C "$dir" commit -q -m init
+    awk -v n="$SPECS" -v dir="$dir/specs" 'BEGIN {
+        for (i = 1; i <= n; i++) printf "%s/%03d-bench-%d\n", dir, (i - 1) % 999 + 1, i
+    }' | xargs mkdir -p
+    feature=$(printf '%03d-bench-%d' $(( (SPECS - 1) % 999 + 1 )) "$SPECS")
+    git -C "$dir" checkout -q -b "$feature"
+
+    awk -v n="$LINES" 'BEGIN {
+        print "# Implementation Plan: bench\n"
+        print "**Language/Version**: Python 3.12"
+        print "**Primary Dependencies**: FastAPI & SQLAlchemy"
+        print "**Storage**: PostgreSQL 16"
+        print "**Project Type**: web\n"
+        for (i = 0; i < n; i++) print "Plan line " i ": design notes that the scripts have to read past"
+    }' > "$dir/specs/$feature/plan.md"
+    : > "$dir/specs/$feature/research.md"
+    awk 'BEGIN {
+        print "# Tasks\n\n## Phase 1: Setup\n"
+        for (t = 1; t <= 50; t++) printf "- [ ] T%03d [P] Setup task in src/setup/f%d.py\n", t, t
+        for (s = 1; s <= 8; s++) {
+            printf "\n## Phase %d: User Story %d\n\n", s + 1, s
+            for (i = 0; i < 110; i++) { t++; printf "- [ ] T%03d %s[US%d] Story task in src/us%d/f%d.py\n", t, (t % 3 ? "[P] " : ""), s, s, t }
+        }
+    }' > "$dir/specs/$feature/tasks.md"
+    awk -v n="$LINES" 'BEGIN {
+        print "# bench Development Guidelines\n"
+        print "Auto-generated from all feature plans. **Last updated**: 2024-01-01\n"
+        print "## Active Technologies"
+        for (i = 0; i < n / 4; i++) print "- Tech " i " (000-old-" i ")"
+        print "\n## Recent Changes\n- 003-c: Added C\n- 002-b: Added B\n- 001-a: Added A\n"
+        print "<!-- MANUAL ADDITIONS START -->"
+        for (i = 0; i < n * 3 / 4; i++) print "Manual note " i ": keep this line exactly as written"
+        print "<!-- MANUAL ADDITIONS END -->"
+    }' > "$dir/CLAUDE.md"
+
+    mkdir -p "$dir/src"
+    awk -v dir="$dir/src" 'BEGIN {
+        for (f = 0; f < 100; f++) for (i = 0; i < 20; i++) print "line " i > (dir "/module" f ".py")
+    }'
+    git -C "$dir" add src "specs/$feature" CLAUDE.md
+    git -C "$dir" commit -q -m "bench feature"
+}
+
+# Workspace: an orchestrator checkout with a synthetic .claude/ and bare remotes
+# for the other repositories, reached through git's URL rewriting
+make_workspace() {
+    local name i
+    mkdir -p "$ORCH" "$BENCH_DIR/remotes"
+    cp -R "$SRC/scripts" "$SRC/.specify" "$SRC/.gitignore" "$ORCH/"
+    awk -v dir="$ORCH/.claude" 'BEGIN {
+        for (f = 0; f < 300; f++) {
+            path = dir "/" (f % 3 ? "commands" : "agents") "/group" (f % 10) "/item" f ".md"
+            system("mkdir -p \"" substr(path, 1, length(path) - length("/item" f ".md")) "\"")
+            for (i = 0; i < 40; i++) print "Instruction " i " of item " f > path
+            close(path)
+        }
+    }'
+    : > "$BENCH_DIR/repos.md"
+    for name in "${REPOS[@]}"; do
+        echo "https://github.com/Trivance-io/$name" >> "$BENCH_DIR/repos.md"
+        git init -q --bare -b main "$BENCH_DIR/remotes/$name"
+        git init -q -b main "$BENCH_DIR/seed-$name"
+        for i in $(seq 1 300); do echo "line $i of $name" > "$BENCH_DIR/seed-$name/file-$i.txt"; done
+        git -C "$BENCH_DIR/seed-$name" add -A
+        git -C "$BENCH_DIR/seed-$name" commit -q -m init
+        git -C "$BENCH_DIR/seed-$name" push -q "$BENCH_DIR/remotes/$name" main
+    done
+}
+
+add_worktrees() {
+    local name i
+    for name in "${REPOS[@]}"; do
+        [[ -d "$WS/$name/.git" ]] || continue
+        for i in 1 2; do
+            git -C "$WS/$name" worktree add -q -b "bench-$i" "$WS/$name-wt-$i" 2>/dev/null || true
+        done
+    done
+}
+
+# --- Scenarios -------------------------------------------------------------------
+# Each prints nothing and fails when the script under test failed
+
+run_init() {
+    local rc=0
+    "$ORCH/scripts/init.sh" --json > /dev/null 2>&1 || rc=$?
+    [[ $rc -le 2 ]] # 1 and 2 only report missing dependencies
+}
+run_setup() {
+    GIT_CONFIG_COUNT=1 GIT_CONFIG_KEY_0="url.$BENCH_DIR/remotes/.insteadOf" \
+        GIT_CONFIG_VALUE_0="https://github.com/Trivance-io/" \
+        "$ORCH/scripts/core/setup.sh" --repos-file "$BENCH_DIR/repos.md" > /dev/null 2>&1
+}
+run_sync-claude() { "$ORCH/scripts/core/sync-claude.sh" --quiet "$ORCH/.claude" "$WS/.claude" > /dev/null 2>&1; }
+run_workspace-status() {
+    "$ORCH/scripts/core/workspace-status.sh" --workspace "$WS" --repos-file "$BENCH_DIR/repos.md" \
+        --json --no-cache > /dev/null 2>&1
+}
+run_check-prerequisites() {
+    (cd "$PROJECT" && .specify/scripts/bash/check-prerequisites.sh --json --include-tasks) > /dev/null 2>&1
+}
+run_setup-plan() { (cd "$BENCH_DIR/project-plan" && .specify/scripts/bash/setup-plan.sh --json) > /dev/null 2>&1; }
+run_create-new-feature() {
+    (cd "$BENCH_DIR/project-new" && .specify/scripts/bash/create-new-feature.sh --json "bench feature") > /dev/null 2>&1
+}
+run_update-agent-context() {
+    (cd "$PROJECT" && .specify/scripts/bash/update-agent-context.sh claude) > /dev/null 2>&1
+}
+run_schedule-tasks() { (cd "$PROJECT" && .specify/scripts/bash/schedule-tasks.sh --json) > /dev/null 2>&1; }
+run_complexity-budget() {
+    (cd "$PROJECT" && .specify/scripts/bash/complexity-budget.sh --base main --no-cache --json) > /dev/null 2>&1
+}
+
+# Script each scenario exercises (skipped when the sources under test lack it)
+scenario_script() {
+    case "$1" in
+        init) echo scripts/init.sh ;;
+        setup|sync-claude|workspace-status) echo "scripts/core/$1.sh" ;;
+        *) echo ".specify/scripts/bash/$1.sh" ;;
+    esac
+}
+
+echo "🏗️  Building fixtures: $SPECS specs, $LINES-line plan.md/CLAUDE.md, ${#REPOS[@]} bare repos"
+started=$(now_ms)
+make_project "$PROJECT"
+cp -R "$PROJECT" "$BENCH_DIR/project-plan"
+cp -R "$PROJECT" "$BENCH_DIR/project-new"
+make_workspace
+echo "   built in $(( $(now_ms) - started )) ms"
+
+export INIT_PROBE_CACHE_DIR="$BENCH_DIR/init-cache" INIT_PROBE_TIMEOUT=2
+export WORKSPACE_STATUS_CACHE_DIR="$BENCH_DIR/status-cache"
+
+INPUTS=()
+echo "⏱️  $RUNS runs per scenario (plus one warm-up)"
+for scenario in "${SCENARIOS[@]}"; do
+    [[ -z "$ONLY" || ",$ONLY," == *",$scenario,"* ]] || continue
+    if [[ ! -f "$SRC/$(scenario_script "$scenario")" ]]; then
+        echo "   ⏭️  $scenario: not in the sources under test"
+        continue
+    fi
+    # Warm-up fills caches (probe results, clones, indexes) like a repeat session
+    if ! "run_$scenario"; then
+        echo "   ❌ $scenario: warm-up run failed"
+        continue
+    fi
+    [[ "$scenario" == setup ]] && add_worktrees
+
+    : > "$BENCH_DIR/wall.$scenario"
+    : > "$BENCH_DIR/trace.$scenario"
+    failed=false
+    for ((i = 1; i <= RUNS; i++)); do
+        run_started=$(now_ms)
+        if ! SPECIFY_TRACE="$BENCH_DIR/trace.$scenario" "run_$scenario"; then
+            failed=true
+            break
+        fi
+        printf '%s\twall\t%d\n' "$scenario" $(( $(now_ms) - run_started )) >> "$BENCH_DIR/wall.$scenario"
+    done
+    if $failed; then
+        echo "   ❌ $scenario: run $i failed"
+        continue
+    fi
+    echo "   ✅ $scenario"
+    INPUTS+=("$BENCH_DIR/wall.$scenario" "$BENCH_DIR/trace.$scenario")
+done
+
+# --- Results -------------------------------------------------------------------
+# One row per scenario step: "wall" is the harness clock around each run, the
+# other steps are "<script>:<phase>" events from SPECIFY_TRACE (child scripts too)
+
+mkdir -p "$(dirname "$OUT")"
+{
+    printf '# specify bench v1\tcommit=%s\tlabel=%s\truns=%d\tspecs=%d\tlines=%d\thost=%s\n' \
+        "$COMMIT" "$LABEL" "$RUNS" "$SPECS" "$LINES" "$(uname -sm)"
+    printf 'scenario\tstep\truns\tmedian_ms\tp95_ms\tmedian_pids\tmedian_git\n'
+    [[ ${#INPUTS[@]} -gt 0 ]] && awk -F'\t' '
+        function add(key, ms, pids, git) {
+            if (!(key in n)) order[++keys] = key
+            n[key]++; msv[key, n[key]] = ms
+            if (pids != "" && pids != "null") { np[key]++; pv[key, np[key]] = pids }
+            if (git != "") { ng[key]++; gv[key, ng[key]] = git }
+        }
+        # Sorts vals[1..cnt] in place (insertion sort: a few dozen values)
+        function sortv(cnt,    i, j, v) {
+            for (i = 2; i <= cnt; i++) {
+                v = vals[i]
+                for (j = i - 1; j > 0 && vals[j] > v; j--) vals[j + 1] = vals[j]
+                vals[j + 1] = v
+            }
+        }
+        function median(cnt) { sortv(cnt); return cnt % 2 ? vals[(cnt + 1) / 2] : int((vals[cnt / 2] + vals[cnt / 2 + 1]) / 2) }
+        function p95(cnt,    r) { sortv(cnt); r = int(cnt * 0.95); if (r < cnt * 0.95) r++; return vals[r] }
+        function stat(arr, key, cnt, which,    i) {
+            if (!cnt) return "-"
+            split("", vals)
+            for (i = 1; i <= cnt; i++) vals[i] = arr[key, i] + 0
+            return which == "p95" ? p95(cnt) : median(cnt)
+        }
+        FILENAME ~ /\/wall\.[^\/]*$/ { add($1 FS "wall", $3, "", ""); next }
+        {
+            # {"ts":..,"script":"setup.sh","pid":..,"phase":"clone","ms":..,"pids":..,"git":..}
+            scenario = FILENAME; sub(/.*\/trace\./, "", scenario)
+            line = $0; gsub(/[{}"]/, "", line)
+            split(line, kv, ","); delete f
+            for (i in kv) { p = index(kv[i], ":"); f[substr(kv[i], 1, p - 1)] = substr(kv[i], p + 1) }
+            add(scenario FS f["script"] ":" f["phase"], f["ms"], f["pids"], f["git"])
+        }
+        END {
+            for (k = 1; k <= keys; k++) {
+                key = order[k]
+                printf "%s\t%d\t%s\t%s\t%s\t%s\n", key, n[key], stat(msv, key, n[key], "median"), \
+                    stat(msv, key, n[key], "p95"), stat(pv, key, np[key], "median"), stat(gv, key, ng[key], "median")
+            }
+        }' "${INPUTS[@]}"
+} > "$OUT"
+
+echo ""
+printf '%-22s %-36s %9s %9s %7s %5s\n' "Scenario" "Step" "median" "p95" "pids" "git"
+awk -F'\t' '/^#/ || $1 == "scenario" { next }
+    { printf "%-22s %-36s %9s %9s %7s %5s\n", $1, $2, $4, $5, $6, $7 }' "$OUT"
+echo ""
+echo "📄 Results: $OUT"
+
+if [[ -n "$BASELINE" ]]; then
+    print_compare_header "$BASELINE" "$OUT"
+    compare_results "$BASELINE" "$OUT"
+fi
@@ -0,0 +1,75 @@
+#!/bin/bash
+
+# Trivance Platform - .claude/ Deployment Benchmark
+# Compare the legacy full copy with incremental sync on a synthetic .claude/ tree
+#
+# Usage: ./scripts/bench/sync-claude.sh [FILES] [TARGETS]
+#   FILES     Files in the synthetic tree (default: 5000)
+#   TARGETS   Deployment targets per run (default: 5)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SYNC="$SCRIPT_DIR/../core/sync-claude.sh"
+FILES="${1:-5000}"
+TARGETS="${2:-5}"
+
+[[ "$FILES" =~ ^[1-9][0-9]*$ && "$TARGETS" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [FILES] [TARGETS]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/claude-sync-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Run "$@" and print its wall-clock time in milliseconds
+time_ms() {
+    local started
+    started=$(now_ms)
+    "$@" >/dev/null
+    echo $(( $(now_ms) - started ))
+}
+
+legacy_copy() {
+    local target temp_target
+    for target in "${TARGET_DIRS[@]}"; do
+        temp_target=$(mktemp -d "${target}.XXXXXX")
+        cp -r "$BENCH_DIR/src/." "$temp_target/"
+        rm -rf "$target"
+        mv "$temp_target" "$target"
+    done
+}
+
+echo "🏗️  Building synthetic .claude/ tree ($FILES files)..."
+awk -v n="$FILES" -v root="$BENCH_DIR/src" 'BEGIN {
+    split("agents commands hooks scripts", kinds, " ")
+    for (i = 0; i < n; i++) {
+        dir = root "/" kinds[i % 4 + 1] "/group-" int(i / 100)
+        if (!(dir in made)) { system("mkdir -p \"" dir "\""); made[dir] = 1 }
+        file = dir "/item-" i ".md"
+        for (l = 0; l < 40; l++) print "# item " i " line " l " lorem ipsum dolor sit amet" > file
+        close(file)
+    }
+}'
+
+declare -a TARGET_DIRS=()
+for i in $(seq 1 "$TARGETS"); do
+    mkdir -p "$BENCH_DIR/ws/repo-$i"
+    TARGET_DIRS+=("$BENCH_DIR/ws/repo-$i/.claude")
+done
+
+printf '\n%-34s %10s\n' "Scenario ($TARGETS targets)" "ms"
+printf '%-34s %10s\n' "legacy cp -r + mv" "$(time_ms legacy_copy)"
+rm -rf "${TARGET_DIRS[@]}"
+printf '%-34s %10s\n' "sync: first deploy" "$(time_ms "$SYNC" "$BENCH_DIR/src" "${TARGET_DIRS[@]}")"
+printf '%-34s %10s\n' "sync: no-op" "$(time_ms "$SYNC" "$BENCH_DIR/src" "${TARGET_DIRS[@]}")"
+
+# Small delta: touch 10 files, add 5, remove 5
+for i in $(seq 0 9); do echo "edit" >> "$BENCH_DIR/src/agents/group-0/item-$((i * 4)).md"; done
+for i in 1 2 3 4 5; do echo "new $i" > "$BENCH_DIR/src/hooks/new-$i.md"; done
+for i in $(seq 1 5); do rm -f "$BENCH_DIR/src/commands/group-0/item-$((i * 4 + 1)).md"; done
+printf '%-34s %10s\n' "sync: small delta (+5 ~10 -5)" "$(time_ms "$SYNC" "$BENCH_DIR/src" "${TARGET_DIRS[@]}")"
+printf '%-34s %10s\n' "sync: no-op after delta" "$(time_ms "$SYNC" "$BENCH_DIR/src" "${TARGET_DIRS[@]}")"
@@ -0,0 +1,83 @@
+#!/bin/bash
+
+# Trivance Platform - Agent Context Render Benchmark
+# Time update-agent-context.sh on large synthetic CLAUDE.md/AGENTS.md files
+#
+# Usage: ./scripts/bench/update-agent-context.sh [LINES] [BASELINE_REF]
+#   LINES          Lines per synthetic agent file (default: 20000)
+#   BASELINE_REF   Also time the script as of this git ref and diff outputs (e.g. HEAD~1)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+LINES="${1:-20000}"
+BASELINE_REF="${2:-}"
+
+[[ "$LINES" =~ ^[1-9][0-9]*$ ]] || {
+    echo "Usage: $0 [LINES] [BASELINE_REF]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/agent-context-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Build a git fixture whose .specify/ comes from $2 (a directory)
+make_fixture() {
+    local dir="$1" specify="$2"
+    mkdir -p "$dir/specs/001-bench-feature"
+    cp -R "$specify" "$dir/.specify"
+    git -C "$dir" init -q
+    git -C "$dir" checkout -q -b 001-bench-feature
+    cat > "$dir/specs/001-bench-feature/plan.md" <<'EOF'
+**Language/Version**: Python 3.12
+**Primary Dependencies**: FastAPI & SQLAlchemy
+**Storage**: PostgreSQL 16
+**Project Type**: web
+EOF
+    local file
+    for file in CLAUDE.md AGENTS.md GEMINI.md; do
+        awk -v n="$LINES" 'BEGIN {
+            print "# bench Development Guidelines\n"
+            print "Auto-generated from all feature plans. **Last updated**: 2024-01-01\n"
+            print "## Active Technologies"
+            for (i = 0; i < n / 4; i++) print "- Tech " i " (000-old-" i ")"
+            print "\n## Recent Changes\n- 003-c: Added C\n- 002-b: Added B\n- 001-a: Added A\n"
+            print "<!-- MANUAL ADDITIONS START -->"
+            for (i = 0; i < n * 3 / 4; i++) print "Manual note " i ": keep this line exactly as written"
+            print "<!-- MANUAL ADDITIONS END -->"
+        }' > "$dir/$file"
+    done
+}
+
+# Time one run of the fixture's update-agent-context.sh (all existing agents)
+time_run() {
+    local started
+    started=$(now_ms)
+    (cd "$1" && bash .specify/scripts/bash/update-agent-context.sh >/dev/null 2>&1)
+    echo $(( $(now_ms) - started ))
+}
+
+make_fixture "$BENCH_DIR/current" "$REPO_ROOT/.specify"
+printf '%-40s %10s\n' "Scenario ($LINES lines x 3 files)" "ms"
+printf '%-40s %10s\n' "current: first update" "$(time_run "$BENCH_DIR/current")"
+printf '%-40s %10s\n' "current: repeat update" "$(time_run "$BENCH_DIR/current")"
+
+if [[ -n "$BASELINE_REF" ]]; then
+    mkdir -p "$BENCH_DIR/baseline-specify"
+    git -C "$REPO_ROOT" archive "$BASELINE_REF" .specify | tar -x -C "$BENCH_DIR/baseline-specify"
+    make_fixture "$BENCH_DIR/baseline" "$BENCH_DIR/baseline-specify/.specify"
+    printf '%-40s %10s\n' "$BASELINE_REF: first update" "$(time_run "$BENCH_DIR/baseline")"
+    printf '%-40s %10s\n' "$BASELINE_REF: repeat update" "$(time_run "$BENCH_DIR/baseline")"
+
+    for file in CLAUDE.md AGENTS.md GEMINI.md; do
+        if cmp -s "$BENCH_DIR/current/$file" "$BENCH_DIR/baseline/$file"; then
+            echo "✅ $file identical to $BASELINE_REF output"
+        else
+            echo "❌ $file differs from $BASELINE_REF output"
+        fi
+    done
+fi
@@ -0,0 +1,113 @@
+#!/bin/bash
+
+# Trivance Platform - Workspace Status Benchmark
+# Build a local workspace (bare remotes, clones, sibling worktrees in known states),
+# check what workspace-status.sh reports and time cold, cached and serial runs
+#
+# Usage: ./scripts/bench/workspace-status.sh [WORKTREES]
+#   WORKTREES   Extra sibling worktrees spread over the repositories (default: 40, minimum: 4)
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+STATUS="$SCRIPT_DIR/../core/workspace-status.sh"
+WORKTREES="${1:-40}"
+
+[[ "$WORKTREES" =~ ^[1-9][0-9]*$ && "$WORKTREES" -ge 4 ]] || {
+    echo "Usage: $0 [WORKTREES]" >&2
+    exit 1
+}
+
+BENCH_DIR=$(mktemp -d "${TMPDIR:-/tmp}/workspace-status-bench.XXXXXX")
+trap 'rm -rf "$BENCH_DIR" 2>/dev/null' EXIT
+WS="$BENCH_DIR/ws"
+FAILED=0
+REPOS=(trivance-ai-orchestrator trivance-mobile trivance_auth trivance_management trivance_backoffice)
+
+export GIT_AUTHOR_NAME=bench GIT_AUTHOR_EMAIL=bench@localhost
+export GIT_COMMITTER_NAME=bench GIT_COMMITTER_EMAIL=bench@localhost
+export WORKSPACE_STATUS_CACHE_DIR="$BENCH_DIR/cache"
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+
+# Milliseconds for one workspace-status.sh run with extra arguments "$@"
+time_status() {
+    local started
+    started=$(now_ms)
+    "$STATUS" --workspace "$WS" --repos-file "$BENCH_DIR/repos.md" "$@" > /dev/null
+    echo $(( $(now_ms) - started ))
+}
+
+expect() {
+    local label="$1" pattern="$2"
+    if grep -q -- "$pattern" "$BENCH_DIR/report.json"; then
+        echo "✅ $label"
+    else
+        echo "❌ $label (expected $pattern)"
+        FAILED=1
+    fi
+}
+
+echo "🏗️  Building workspace: ${#REPOS[@]} repos, $WORKTREES worktrees"
+mkdir -p "$WS" "$BENCH_DIR/remotes"
+: > "$BENCH_DIR/repos.md"
+for name in "${REPOS[@]}"; do
+    echo "https://github.com/Trivance-io/$name" >> "$BENCH_DIR/repos.md"
+    git init -q --bare -b main "$BENCH_DIR/remotes/$name.git"
+    git clone -q "$BENCH_DIR/remotes/$name.git" "$WS/$name" 2>/dev/null
+    for i in $(seq 1 200); do echo "line $i" > "$WS/$name/file-$i.txt"; done
+    git -C "$WS/$name" add -A
+    git -C "$WS/$name" commit -q -m init
+    git -C "$WS/$name" push -q origin main
+    git -C "$WS/$name" remote set-head origin main
+done
+
+# Sibling worktrees: the first three on the first repo (states below), the rest
+# round-robin over the repos
+for ((i = 0; i < WORKTREES; i++)); do
+    name="${REPOS[0]}"
+    [[ $i -lt 3 ]] || name="${REPOS[i % ${#REPOS[@]}]}"
+    git -C "$WS/$name" worktree add -q -b "feature-$i" "$WS/$name-wt-$i" 2>/dev/null
+done
+DIRTY_WT="$WS/${REPOS[0]}-wt-0"
+MERGED_WT="$WS/${REPOS[0]}-wt-1"
+PRUNABLE_WT="$WS/${REPOS[0]}-wt-2"
+FRESH_BRANCH="feature-3"
+
+# Known states on the first repo
+R="$WS/${REPOS[0]}"
+echo dirty >> "$DIRTY_WT/file-1.txt"                                   # dirty
+git -C "$MERGED_WT" commit -q --allow-empty -m merged-work             # feature-1: merged worktree
+git -C "$R" merge -q --ff-only feature-1
+git -C "$R" branch -q old-merged                                       # old-merged: merged, not checked out
+git -C "$R" checkout -q old-merged && git -C "$R" commit -q --allow-empty -m old
+git -C "$R" checkout -q main && git -C "$R" merge -q --ff-only old-merged
+git -C "$R" push -q origin main
+git -C "$R" reset -q --hard HEAD~1                                     # main behind origin/main by 1
+rm -rf "$PRUNABLE_WT"                                                  # prunable worktree
+mkdir -p "$WS/ghost-checkout" && echo "gitdir: $BENCH_DIR/nowhere/.git/worktrees/ghost" > "$WS/ghost-checkout/.git"
+rm -rf "$WS/${REPOS[4]}"                                               # missing repo
+
+"$STATUS" --workspace "$WS" --repos-file "$BENCH_DIR/repos.md" --json --no-cache > "$BENCH_DIR/report.json"
+"$STATUS" --workspace "$WS" --repos-file "$BENCH_DIR/repos.md" --no-cache > "$BENCH_DIR/report.txt"
+sed -n '1,10p;/🌿\|🍂\|👻/p;$p' "$BENCH_DIR/report.txt"
+
+echo ""
+expect "dirty worktree"          "\"path\":\"$DIRTY_WT\",\"branch\":\"feature-0\"[^}]*\"unstaged\":1,[^}]*\"state\":\"dirty\""
+expect "main behind origin"      "\"path\":\"$R\",\"branch\":\"main\",\"upstream\":\"origin/main\",\"ahead\":0,\"behind\":1"
+expect "merged worktree flagged" "{\"path\":\"$MERGED_WT\",\"repo\":\"${REPOS[0]}\",\"branch\":\"feature-1\",\"reason\":\"merged\"}"
+expect "fresh worktree kept"     "\"branch\":\"$FRESH_BRANCH\",[^}]*\"state\":\"clean\""
+expect "prunable worktree"       "\"path\":\"$PRUNABLE_WT\",\"repo\":\"${REPOS[0]}\",\"reason\":\"worktree directory missing"
+expect "ghost sibling checkout"  "\"path\":\"$WS/ghost-checkout\",\"repo\":\"\",\"reason\":\"gitdir"
+expect "merged branch listed"    "{\"name\":\"old-merged\",\"upstream\":\"\",\"merged\":true"
+expect "missing repo"            "\"name\":\"${REPOS[4]}\",\"path\":\"$WS/${REPOS[4]}\",\"status\":\"missing\""
+
+echo ""
+printf '%-34s %8s\n' "Scenario ($WORKTREES worktrees)" "ms"
+printf '%-34s %8s\n' "serial (--jobs 1, no cache)" "$(time_status --jobs 1 --no-cache)"
+printf '%-34s %8s\n' "parallel (no cache)" "$(time_status --no-cache)"
+time_status --json > /dev/null
+printf '%-34s %8s\n' "parallel (cached)" "$(time_status --json)"
+
+exit "$FAILED"
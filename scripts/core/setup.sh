@@ -3,11 +3,70 @@
 # Trivance Platform - Workspace Setup
 # Clone repositories and copy Claude workspace configuration
 
+# Usage: ./scripts/core/setup.sh [OPTIONS]
+#
+# OPTIONS:
+#   --jobs N              Sync up to N repositories concurrently (default: 4, env SETUP_JOBS)
+#   --filter MODE         Partial clone: blob (blob:none), tree (tree:0) or none (default: none, env SETUP_FILTER)
+#   --reference-dir DIR   Keep bare mirrors in DIR for new clones; not with --filter (env SETUP_REFERENCE_DIR)
+#   --workspace DIR       Override the workspace directory (default: parent of this repo)
+#   --repos-file FILE     Override the repository list (default: .specify/memory/trivance-repos.md)
+#   --deploy-repos        Also sync .claude/ into every repo and sibling worktree in the workspace
+#   --help, -h            Show this help message
+#
+# Repository URLs are always validated against https://github.com/Trivance-io/.
+# To sync against local bare repositories (tests, offline mirrors) redirect the
+# host with git's own URL rewriting instead of weakening the validation:
+#   GIT_CONFIG_COUNT=1 GIT_CONFIG_KEY_0=url./tmp/bare/.insteadOf \
+#   GIT_CONFIG_VALUE_0=https://github.com/Trivance-io/ ./scripts/core/setup.sh
+
 set -euo pipefail
 
-# Calculate correct workspace (parent of orchestrator repo)
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-WORKSPACE_DIR="$(realpath "$SCRIPT_DIR/../../..")"
+source "$SCRIPT_DIR/workspace-common.sh"
+# Opt-in timing instrumentation (SPECIFY_TRACE)
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+trace_init setup.sh
+
+JOBS="${SETUP_JOBS:-4}"
+FILTER="${SETUP_FILTER:-none}"
+REFERENCE_DIR="${SETUP_REFERENCE_DIR:-}"
+WORKSPACE_OVERRIDE=""
+DEPLOY_REPOS=false
+REPOS_FILE="$SCRIPT_DIR/../../.specify/memory/trivance-repos.md"
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --jobs) JOBS="${2:-}"; shift 2 ;;
+        --filter) FILTER="${2:-}"; shift 2 ;;
+        --reference-dir) REFERENCE_DIR="${2:-}"; shift 2 ;;
+        --workspace) WORKSPACE_OVERRIDE="${2:-}"; shift 2 ;;
+        --repos-file) REPOS_FILE="${2:-}"; shift 2 ;;
+        --deploy-repos) DEPLOY_REPOS=true; shift ;;
+        --help|-h) sed -n '6,21p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'; exit 0 ;;
+        *) echo "❌ Unknown option '$1'. Use --help for usage information." >&2; exit 1 ;;
+    esac
+done
+
+[[ "$JOBS" =~ ^[1-9][0-9]*$ ]] || { echo "❌ --jobs must be a positive integer: $JOBS" >&2; exit 1; }
+
+case "$FILTER" in
+    none) CLONE_FILTER_ARGS=() ;;
+    blob) CLONE_FILTER_ARGS=(--filter=blob:none) ;;
+    tree) CLONE_FILTER_ARGS=(--filter=tree:0) ;;
+    *) echo "❌ --filter must be one of: none, blob, tree" >&2; exit 1 ;;
+esac
+
+# --dissociate copies every object of the mirror into the clone, which would
+# turn a partial clone back into a full one
+if [[ "$FILTER" != none && -n "$REFERENCE_DIR" ]]; then
+    echo "❌ --filter cannot be combined with --reference-dir (the clone would copy every mirror object)" >&2
+    exit 1
+fi
+
+# Calculate correct workspace (parent of orchestrator repo)
+trace_phase resolve
+WORKSPACE_DIR="$(resolve_workspace_dir "$SCRIPT_DIR" "$WORKSPACE_OVERRIDE")"
 
 # Validate workspace calculation
 if [[ -z "$WORKSPACE_DIR" || ! -d "$WORKSPACE_DIR" ]]; then
@@ -15,7 +74,6 @@ if [[ -z "$WORKSPACE_DIR" || ! -d "$WORKSPACE_DIR" ]]; then
     exit 1
 fi
 
-REPOS_FILE="$SCRIPT_DIR/../../.specify/memory/trivance-repos.md"
 CLAUDE_SOURCE="$SCRIPT_DIR/../../.claude"  
 CLAUDE_TARGET="$WORKSPACE_DIR/.claude"
 GITIGNORE_SOURCE="$SCRIPT_DIR/../../.gitignore"
@@ -47,28 +105,36 @@ if [[ ! -w "$WORKSPACE_DIR" ]]; then
     exit 1
 fi
 
-echo "🚀 Starting workspace setup..."
-echo "📁 Workspace: $WORKSPACE_DIR"
+if [[ -n "$REFERENCE_DIR" ]]; then
+    mkdir -p "$REFERENCE_DIR" 2>/dev/null && REFERENCE_DIR="$(realpath "$REFERENCE_DIR")" || {
+        echo "❌ Reference directory not writable: $REFERENCE_DIR" >&2
+        exit 1
+    }
+fi
 
-# Process repositories with error tolerance  
-echo "📥 Processing repositories..."
-success_count=0
-total_count=0
+RESULTS_DIR=$(mktemp -d "${TMPDIR:-/tmp}/trivance-setup.XXXXXX")
+trap 'trace_finish; rm -rf "$RESULTS_DIR" 2>/dev/null' EXIT
+
+# Refresh (or create) the bare mirror used as --reference for $1 from $2
+refresh_mirror() {
+    local mirror="$REFERENCE_DIR/$1.git"
+    if [[ -d "$mirror" ]]; then
+        git -C "$mirror" fetch --quiet --prune 2>/dev/null
+    else
+        git clone --quiet --mirror "$2" "$mirror.tmp" 2>/dev/null && mv "$mirror.tmp" "$mirror" || {
+            rm -rf "$mirror.tmp" 2>/dev/null
+            return 1
+        }
+    fi
+}
+
+# Clone or fast-forward one repository; records "name|status|ms|detail" in RESULTS_DIR
+sync_repo() {
+    local repo_name="$1" repo_url="$2"
+    local repo_path="$WORKSPACE_DIR/$repo_name"
+    local started status detail reference_args=()
+    started=$(now_ms)
 
-while IFS= read -r url || [[ -n "$url" ]]; do
-    # Skip empty lines and comments
-    [[ -z "$url" || "$url" =~ ^[[:space:]]*# ]] && continue
-    
-    total_count=$((total_count + 1))
-    repo_url="${url%/}"
-    repo_name=$(basename "$repo_url" .git)
-    
-    # Security validation: prevent command injection and path traversal
-    [[ "$repo_url" =~ ^https://github\.com/Trivance-io/[a-zA-Z0-9_-]+(\.git)?$ ]] || { echo "⚠️  Skipping invalid URL: $repo_url"; continue; }
-    [[ "$repo_name" =~ ^[a-zA-Z0-9_-]+$ && ${#repo_name} -le 50 ]] || { echo "⚠️  Skipping invalid repo name: $repo_name"; continue; }
-    
-    repo_path="$WORKSPACE_DIR/$repo_name"
-    
     if [[ -d "$repo_path/.git" ]]; then
         echo "⚡ Updating $repo_name..."
         if (cd "$repo_path" && 
@@ -76,35 +142,113 @@ while IFS= read -r url || [[ -n "$url" ]]; do
             git fetch --quiet && 
             git pull --ff-only --quiet 2>/dev/null); then
             echo "✅ Updated $repo_name"
-            success_count=$((success_count + 1))
+            status="updated"; detail="fast-forward"
         else
             echo "⚠️  $repo_name: Manual merge needed, detached HEAD, or update failed"
+            status="failed"; detail="manual merge needed, detached HEAD, or update failed"
         fi
     else
+        # Mirrors only speed up clones; existing repos fetch from their remote
+        if [[ -n "$REFERENCE_DIR" ]]; then
+            if refresh_mirror "$repo_name" "$repo_url"; then
+                reference_args=(--reference-if-able "$REFERENCE_DIR/$repo_name.git" --dissociate)
+            else
+                echo "⚠️  $repo_name: Reference mirror unavailable, using remote directly"
+            fi
+        fi
+
         echo "📥 Cloning $repo_name..."
-        if git clone --quiet "$repo_url" "$repo_path" 2>/dev/null; then
+        if git clone --quiet ${CLONE_FILTER_ARGS[@]+"${CLONE_FILTER_ARGS[@]}"} \
+            ${reference_args[@]+"${reference_args[@]}"} "$repo_url" "$repo_path" 2>/dev/null; then
             echo "✅ Cloned $repo_name"
-            success_count=$((success_count + 1))
+            status="cloned"; detail="filter=$FILTER${REFERENCE_DIR:+, reference}"
         else
             rm -rf "$repo_path" 2>/dev/null  # Cleanup partial clone
             echo "❌ Failed to clone $repo_name from $repo_url"
+            status="failed"; detail="clone failed"
         fi
     fi
-done < "$REPOS_FILE"
 
-echo "📊 Repository summary: $success_count/$total_count successful"
+    printf '%s|%s|%s|%s\n' "$repo_name" "$status" "$(( $(now_ms) - started ))" "$detail" \
+        > "$RESULTS_DIR/$repo_name.result"
+}
+
+echo "🚀 Starting workspace setup..."
+echo "📁 Workspace: $WORKSPACE_DIR"
+
+# Process repositories with error tolerance, up to $JOBS at a time
+trace_phase sync-repos
+echo "📥 Processing repositories (jobs: $JOBS)..."
+sync_started=$(now_ms)
+declare -a REPO_ORDER=()
+declare -a SKIPPED=()
+
+# Validated entries from the repository list (see workspace-common.sh)
+while IFS='|' read -r kind repo_name detail; do
+    if [[ "$kind" == skip ]]; then
+        echo "⚠️  Skipping $detail: $repo_name"
+        SKIPPED+=("$repo_name|$detail")
+        continue
+    fi
+
+    repo_url="$detail"
+    REPO_ORDER+=("$repo_name")
+
+    # Bounded worker pool (jobs -rp keeps this portable to bash 3.2 on macOS)
+    while [[ $(jobs -rp | wc -l) -ge $JOBS ]]; do
+        sleep 0.05
+    done
+    sync_repo "$repo_name" "$repo_url" &
+done < <(read_repo_list "$REPOS_FILE")
+wait
+
+trace_phase summary
+sync_elapsed=$(( $(now_ms) - sync_started ))
+success_count=0
+total_count=$(( ${#REPO_ORDER[@]} + ${#SKIPPED[@]} ))
+
+echo "📊 Repository summary:"
+for repo_name in ${REPO_ORDER[@]+"${REPO_ORDER[@]}"}; do
+    result_file="$RESULTS_DIR/$repo_name.result"
+    if [[ -f "$result_file" ]]; then
+        IFS='|' read -r _ status elapsed detail < "$result_file"
+    else
+        status="failed"; elapsed=0; detail="worker exited unexpectedly"
+    fi
+    case "$status" in
+        cloned|updated) icon="✅"; success_count=$((success_count + 1)) ;;
+        *) icon="❌" ;;
+    esac
+    printf '   %s %-28s %-8s %6d.%02ds  %s\n' "$icon" "$repo_name" "$status" \
+        $((elapsed / 1000)) $((elapsed % 1000 / 10)) "$detail"
+done
+for item in ${SKIPPED[@]+"${SKIPPED[@]}"}; do
+    IFS='|' read -r name reason <<<"$item"
+    printf '   %s %-28s %-8s %9s  %s\n' "⚠️ " "$name" "skipped" "-" "$reason"
+done
+printf '   %d/%d successful in %d.%02ds\n' "$success_count" "$total_count" \
+    $((sync_elapsed / 1000)) $((sync_elapsed % 1000 / 10))
 
 # Setup workspace configuration (avoid NOP if source == target)
+trace_phase deploy-claude
 if [[ "$CLAUDE_SOURCE" != "$CLAUDE_TARGET" ]]; then
     echo "🤖 Setting up workspace configuration..."
-    temp_target=$(mktemp -d "${CLAUDE_TARGET}.XXXXXX")
-    trap 'rm -rf "$temp_target" 2>/dev/null' EXIT
-    
-    # Atomic operation: copy .claude to temp, then move
-    if cp -r "$CLAUDE_SOURCE/." "$temp_target/" 2>/dev/null && mv "$temp_target" "$CLAUDE_TARGET" 2>/dev/null; then
+    claude_targets=("$CLAUDE_TARGET")
+    if $DEPLOY_REPOS; then
+        # Each synced repo plus sibling worktrees (a .git file instead of a directory)
+        for repo_name in ${REPO_ORDER[@]+"${REPO_ORDER[@]}"}; do
+            [[ -d "$WORKSPACE_DIR/$repo_name/.git" ]] && claude_targets+=("$WORKSPACE_DIR/$repo_name/.claude")
+        done
+        for worktree in "$WORKSPACE_DIR"/*/; do
+            [[ -f "${worktree}.git" ]] && claude_targets+=("${worktree}.claude")
+        done
+    fi
+
+    # Incremental sync: only added/changed files are rewritten (see sync-claude.sh)
+    if "$SCRIPT_DIR/sync-claude.sh" "$CLAUDE_SOURCE" "${claude_targets[@]}" | sed 's/^/   /'; then
         echo "✅ Claude workspace configured"
     else
-        echo "❌ Failed to copy .claude from $CLAUDE_SOURCE to $CLAUDE_TARGET" >&2
+        echo "❌ Failed to sync .claude from $CLAUDE_SOURCE to $CLAUDE_TARGET" >&2
         exit 1
     fi
     
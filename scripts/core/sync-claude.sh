@@ -0,0 +1,359 @@
+#!/bin/bash
+
+# Trivance Platform - Incremental .claude/ Deployment
+# Deploy a .claude/ tree to one or more targets, touching only what changed
+#
+# Usage: ./scripts/core/sync-claude.sh [OPTIONS] SOURCE TARGET [TARGET...]
+#
+# OPTIONS:
+#   --link        Hardlink files from the first synced target instead of copying them.
+#                 Targets then share inodes: an in-place edit in one target shows up
+#                 in every target until the next sync restores the source content
+#   --copy        Copy every file (default)
+#   --dry-run     Report the delta per target without modifying anything
+#   --quiet       Only print errors
+#   --help, -h    Show this help message
+#
+# Each target keeps a manifest (.sync-manifest) with one line per deployed file:
+#   sha256 <TAB> src_size <TAB> src_mtime <TAB> mode <TAB> dst_size <TAB> dst_mtime <TAB> path
+# mode is "f:644:" for a file and "l:777:TARGET" for a symlink, which is
+# recreated rather than followed. A file whose permissions differ from the
+# source's is rewritten. Source hashes are reused while size and mtime
+# (sub-second where the platform has it) are unchanged, so a no-op run only
+# stats both trees. Added/changed
+# files are written next to their destination and renamed into place, removed
+# files are deleted along with the directories they leave empty, files and
+# directories unknown to the manifest are left alone, and the manifest is
+# committed last. A target that does not exist yet is built in a temp
+# directory and renamed in one step.
+
+set -euo pipefail
+
+MANIFEST_NAME=".sync-manifest"
+LINK=false
+DRY_RUN=false
+QUIET=false
+declare -a POSITIONAL=()
+
+for arg in "$@"; do
+    case "$arg" in
+        --link) LINK=true ;;
+        --copy) LINK=false ;;
+        --dry-run) DRY_RUN=true ;;
+        --quiet) QUIET=true ;;
+        --help|-h) sed -n '6,28p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'; exit 0 ;;
+        -*) echo "❌ Unknown option '$arg'. Use --help for usage information." >&2; exit 1 ;;
+        *) POSITIONAL+=("$arg") ;;
+    esac
+done
+
+if [[ ${#POSITIONAL[@]} -lt 2 ]]; then
+    echo "Usage: $0 [--link|--copy] [--dry-run] [--quiet] SOURCE TARGET [TARGET...]" >&2
+    exit 1
+fi
+
+# Opt-in timing instrumentation (SPECIFY_TRACE)
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../../.specify/scripts/bash/trace.sh"
+trace_init sync-claude.sh
+trace_phase resolve
+
+SOURCE="${POSITIONAL[0]%/}"
+declare -a TARGETS=("${POSITIONAL[@]:1}")
+
+if [[ ! -d "$SOURCE" ]]; then
+    echo "❌ Source directory not found: $SOURCE" >&2
+    exit 1
+fi
+SOURCE="$(cd "$SOURCE" && pwd)"
+
+if command -v sha256sum &>/dev/null; then
+    HASH_CMD=(sha256sum)
+elif command -v shasum &>/dev/null; then
+    HASH_CMD=(shasum -a 256)
+else
+    echo "❌ sha256sum or shasum required" >&2
+    exit 1
+fi
+
+# GNU find can emit size/mtime/mode itself; BSD/macOS falls back to stat -f (%Fm:
+# fractional mtime, so a same-size edit within the same second is still seen)
+if find "$SOURCE" -maxdepth 0 -printf '' 2>/dev/null; then
+    GNU_FIND=true
+else
+    GNU_FIND=false
+fi
+
+# GNU cp can hardlink whole path lists in one process (--parents)
+if cp --version 2>/dev/null | grep -q GNU; then
+    GNU_CP=true
+else
+    GNU_CP=false
+fi
+
+WORK_DIR=$(mktemp -d "${TMPDIR:-/tmp}/claude-sync.XXXXXX")
+declare -a CLEANUP_DIRS=("$WORK_DIR")
+cleanup() {
+    trace_finish
+    local dir
+    for dir in "${CLEANUP_DIRS[@]}"; do
+        rm -rf "$dir" 2>/dev/null
+    done
+    return 0
+}
+trap cleanup EXIT
+
+log() {
+    $QUIET || echo "$@"
+}
+
+# List files and symlinks under $1 as "size<TAB>mtime<TAB>mode<TAB>relative/path",
+# sorted by path; mtime has nanoseconds where the filesystem records them, mode
+# is "TYPE:PERMISSIONS:LINK_TARGET" (f or l; the target is empty for files)
+scan_tree() {
+    local root="$1"
+    [[ -d "$root" ]] || return 0
+    if $GNU_FIND; then
+        (cd "$root" && find . \( -type f -o -type l \) ! -path "./$MANIFEST_NAME" ! -name "*.sync-tmp.*" \
+            -printf '%s\t%T@\t%y:%m:%l\t%P\n')
+    else
+        # %Sp starts with "-" for a file and "l" for a symlink
+        (cd "$root" && find . \( -type f -o -type l \) ! -path "./$MANIFEST_NAME" ! -name "*.sync-tmp.*" -print0 |
+            xargs -0 stat -f '%z%t%Fm%t%Sp:%Lp:%Y%t%N' |
+            sed -e $'s|\t-[^:]*:|\tf:|' -e $'s|\tl[^:]*:|\tl:|' -e $'s|\t\\./|\t|')
+    fi | LC_ALL=C sort -t $'\t' -k4
+}
+
+# Hash the NUL-separated relative paths on stdin under $1 as "hash<TAB>path"
+hash_paths() {
+    (cd "$1" && xargs -0 "${HASH_CMD[@]}" 2>/dev/null) | sed 's/^\([0-9a-f]*\) [ *]/\1\t/'
+}
+
+# Build the source manifest (hash, src_size, src_mtime, mode, path), reusing hashes
+# from $1 (an existing target manifest) wherever size and mtime still match.
+# Symlinks are not hashed ("-"): their target is part of the mode.
+build_source_manifest() {
+    local previous="$1"
+    scan_tree "$SOURCE" > "$WORK_DIR/src.stat"
+
+    : > "$WORK_DIR/src.reuse"
+    : > "$WORK_DIR/src.stale"
+    awk -F'\t' -v OFS='\t' -v reuse="$WORK_DIR/src.reuse" -v stale="$WORK_DIR/src.stale" '
+        FILENAME == ARGV[1] { known[$NF] = $1 "\t" $2 "\t" $3; next }
+        $3 ~ /^l:/ { print "-", $1, $2, $3, $4 > reuse; next }
+        {
+            if ($4 in known) {
+                split(known[$4], k, "\t")
+                # Compare as strings: nanosecond mtimes exceed double precision
+                if (k[2] "" == $1 "" && k[3] "" == $2 "") { print k[1], $1, $2, $3, $4 > reuse; next }
+            }
+            print $4 > stale
+        }
+    ' "$previous" "$WORK_DIR/src.stat"
+
+    : > "$WORK_DIR/src.hashed"
+    if [[ -s "$WORK_DIR/src.stale" ]]; then
+        tr '\n' '\0' < "$WORK_DIR/src.stale" | hash_paths "$SOURCE" > "$WORK_DIR/src.hashed"
+    fi
+    awk -F'\t' -v OFS='\t' '
+        FILENAME == ARGV[1] { hash[$2] = $1; next }
+        ($4 in hash) { print hash[$4], $1, $2, $3, $4 }
+    ' "$WORK_DIR/src.hashed" "$WORK_DIR/src.stat" |
+        cat - "$WORK_DIR/src.reuse" | LC_ALL=C sort -t $'\t' -k5 > "$WORK_DIR/src.manifest"
+
+    SOURCE_HASHED=$(wc -l < "$WORK_DIR/src.stale" | tr -d ' ')
+}
+
+# Install the NUL-separated relative paths on stdin into $2, linking from $1
+# when possible and copying from $SOURCE otherwise (symlinks are recreated);
+# each file is renamed into place
+install_paths() {
+    local link_from="$1" dest="$2"
+    xargs -0 sh -c '
+        src=$1; link_from=$2; dest=$3; shift 3
+        for p in "$@"; do
+            tmp="$dest/$p.sync-tmp.$$"
+            if [ -L "$src/$p" ]; then
+                ln -s "$(readlink "$src/$p")" "$tmp" || exit 1
+            elif [ -n "$link_from" ] && ln "$link_from/$p" "$tmp" 2>/dev/null; then :
+            else cp -p "$src/$p" "$tmp" || exit 1
+            fi
+            mv -f "$tmp" "$dest/$p" || exit 1
+        done
+    ' _ "$SOURCE" "$link_from" "$dest"
+}
+
+# Write the target manifest from the source manifest plus current target stats
+write_manifest() {
+    local target="$1"
+    scan_tree "$target" > "$WORK_DIR/dst.stat"
+    awk -F'\t' -v OFS='\t' '
+        FILENAME == ARGV[1] { dst[$4] = $1 "\t" $2; next }
+        ($5 in dst) { print $1, $2, $3, $4, dst[$5], $5 }
+    ' "$WORK_DIR/dst.stat" "$WORK_DIR/src.manifest" > "$target/$MANIFEST_NAME.sync-tmp.$$" &&
+        mv -f "$target/$MANIFEST_NAME.sync-tmp.$$" "$target/$MANIFEST_NAME"
+}
+
+# Create a target that does not exist yet: build it aside, then rename
+deploy_fresh() {
+    local target="$1" link_from="$2"
+    local parent stage
+    parent="$(dirname "$target")"
+    mkdir -p "$parent"
+    # Absolute, so the hardlink copy below can run from inside $link_from
+    parent="$(cd "$parent" && pwd)"
+    stage=$(mktemp -d "$parent/${target##*/}.XXXXXX")
+    CLEANUP_DIRS+=("$stage")
+
+    # The stage is private, so bulk-copy instead of renaming file by file
+    if [[ -n "$link_from" ]] && $GNU_CP; then
+        cut -f5 "$WORK_DIR/src.manifest" | tr '\n' '\0' |
+            (cd "$link_from" && xargs -0 cp -P -l --parents -t "$stage") || return 1
+    else
+        cp -pR "$SOURCE/." "$stage/" || return 1
+    fi
+    write_manifest "$stage" || return 1
+    chmod 755 "$stage"  # mktemp -d creates 0700
+    mv "$stage" "$target"
+}
+
+# Bring an existing target up to date; prints "added changed removed unchanged"
+deploy_incremental() {
+    local target="$1" link_from="$2"
+    local old="$target/$MANIFEST_NAME"
+
+    scan_tree "$target" > "$WORK_DIR/dst.stat"
+    if [[ ! -f "$old" ]]; then
+        # First incremental run over a legacy full copy: hash what is there once
+        old="$WORK_DIR/dst.adopted"
+        : > "$WORK_DIR/dst.hashed"
+        if [[ -s "$WORK_DIR/dst.stat" ]]; then
+            awk -F'\t' '$3 !~ /^l:/ { print $4 }' "$WORK_DIR/dst.stat" | tr '\n' '\0' |
+                hash_paths "$target" > "$WORK_DIR/dst.hashed"
+        fi
+        awk -F'\t' -v OFS='\t' '
+            FILENAME == ARGV[1] { hash[$2] = $1; next }
+            $3 ~ /^l:/ { print "-", "-", "-", $3, $1, $2, $4; next }
+            ($4 in hash) { print hash[$4], "-", "-", $3, $1, $2, $4 }
+        ' "$WORK_DIR/dst.hashed" "$WORK_DIR/dst.stat" > "$old"
+    fi
+
+    # C = add/change (also repairs files edited, chmod-ed or deleted in the target),
+    # D = remove
+    awk -F'\t' '
+        # Manifests written before sub-second mtimes hold whole seconds
+        function same_stat(old, cur,    o, c) {
+            if (old == cur) return 1
+            split(old, o, "\t"); split(cur, c, "\t")
+            return o[2] !~ /\./ && o[1] == c[1] && o[2] == int(c[2])
+        }
+        # Symlink permissions are not portable (and never used): compare targets
+        function same_mode(a, b) {
+            if (a ~ /^l:/ && b ~ /^l:/) { sub(/^l:[0-7]*:/, "", a); sub(/^l:[0-7]*:/, "", b) }
+            return a == b
+        }
+        FILENAME == ARGV[1] { dst[$4] = $1 "\t" $2; mode[$4] = $3; next }
+        # Manifests written before modes were tracked have one field less
+        FILENAME == ARGV[2] { old[$NF] = $1; olddst[$NF] = $(NF - 2) "\t" $(NF - 1); next }
+        {
+            seen[$5] = 1
+            if (!($5 in old)) { print "A\t" $5; next }
+            if (old[$5] != $1 || !($5 in dst) || !same_mode($4, mode[$5]) || !same_stat(olddst[$5], dst[$5])) {
+                print "C\t" $5; next
+            }
+            print "U\t" $5
+        }
+        END { for (p in old) if (!(p in seen) && (p in dst)) print "D\t" p }
+    ' "$WORK_DIR/dst.stat" "$old" "$WORK_DIR/src.manifest" > "$WORK_DIR/delta"
+
+    local added changed removed unchanged
+    added=$(grep -c '^A' "$WORK_DIR/delta" || true)
+    changed=$(grep -c '^C' "$WORK_DIR/delta" || true)
+    removed=$(grep -c '^D' "$WORK_DIR/delta" || true)
+    unchanged=$(grep -c '^U' "$WORK_DIR/delta" || true)
+
+    if ! $DRY_RUN; then
+        if [[ $((added + changed)) -gt 0 ]]; then
+            awk -F'\t' '$1 == "A" || $1 == "C" { print $2 }' "$WORK_DIR/delta" |
+                sed -n 's|/[^/]*$||p' | LC_ALL=C sort -u |
+                (cd "$target" && tr '\n' '\0' | xargs -0 mkdir -p .) || return 1
+            awk -F'\t' '$1 == "A" || $1 == "C" { print $2 }' "$WORK_DIR/delta" |
+                tr '\n' '\0' | install_paths "$link_from" "$target" || return 1
+        fi
+        if [[ $removed -gt 0 ]]; then
+            awk -F'\t' '$1 == "D" { print $2 }' "$WORK_DIR/delta" |
+                (cd "$target" && tr '\n' '\0' | xargs -0 rm -f) || return 1
+            # Drop directories emptied by the removals, deepest first; rmdir leaves
+            # non-empty ones alone, and directories the manifest never held are
+            # not considered (never the target itself)
+            awk -F'\t' '$1 == "D" {
+                    p = $2
+                    while (sub(/\/[^\/]*$/, "", p)) print p
+                }' "$WORK_DIR/delta" | LC_ALL=C sort -ru |
+                (cd "$target" && tr '\n' '\0' | xargs -0 rmdir 2>/dev/null) || true
+        fi
+        if [[ $((added + changed + removed)) -gt 0 || ! -f "$target/$MANIFEST_NAME" ]]; then
+            write_manifest "$target" || return 1
+        fi
+    fi
+
+    echo "$added $changed $removed $unchanged"
+}
+
+started=$(now_ms)
+
+# Reuse source hashes from the first target that already has a manifest
+trace_phase manifest
+previous_manifest="/dev/null"
+for target in "${TARGETS[@]}"; do
+    if [[ -f "${target%/}/$MANIFEST_NAME" ]]; then
+        previous_manifest="${target%/}/$MANIFEST_NAME"
+        break
+    fi
+done
+build_source_manifest "$previous_manifest"
+log "🔎 Source: $(wc -l < "$WORK_DIR/src.manifest" | tr -d ' ') files ($SOURCE_HASHED hashed)"
+
+trace_phase deploy
+link_from=""
+failures=0
+for target in "${TARGETS[@]}"; do
+    target="${target%/}"
+    target_started=$(now_ms)
+
+    if [[ "$(cd "$target" 2>/dev/null && pwd)" == "$SOURCE" ]]; then
+        log "⏭️  $target is the source, skipping"
+        continue
+    fi
+
+    if [[ ! -d "$target" ]]; then
+        total=$(wc -l < "$WORK_DIR/src.manifest" | tr -d ' ')
+        if $DRY_RUN; then
+            log "🆕 $target: would create ($total files)"
+            continue
+        fi
+        if deploy_fresh "$target" "$link_from"; then
+            log "🆕 $target: created ($total files) in $(( $(now_ms) - target_started ))ms"
+        else
+            echo "❌ Failed to deploy $SOURCE to $target" >&2
+            failures=$((failures + 1))
+            continue
+        fi
+    else
+        if counts=$(deploy_incremental "$target" "$link_from"); then
+            read -r added changed removed unchanged <<<"$counts"
+            log "✅ $target: +$added ~$changed -$removed =$unchanged in $(( $(now_ms) - target_started ))ms"
+        else
+            echo "❌ Failed to sync $SOURCE to $target" >&2
+            failures=$((failures + 1))
+            continue
+        fi
+    fi
+
+    # With --link, later targets hardlink from the first fully synced one
+    if $LINK && ! $DRY_RUN && [[ -z "$link_from" ]]; then
+        link_from="$target"
+    fi
+done
+
+log "📊 Synced ${#TARGETS[@]} target(s) in $(( $(now_ms) - started ))ms"
+[[ $failures -eq 0 ]]
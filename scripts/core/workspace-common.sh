@@ -0,0 +1,42 @@
+#!/bin/bash
+
+# Trivance Platform - Workspace Layout Helpers
+# Shared by setup.sh and workspace-status.sh: where the workspace lives and
+# which repositories it holds. Source this file; it defines functions only.
+
+# Workspace directory: $2 when given, otherwise the parent of the orchestrator
+# repository that contains script directory $1. Empty output on failure.
+resolve_workspace_dir() {
+    local script_dir="$1" override="${2:-}"
+    if [[ -n "$override" ]]; then
+        realpath "$override" 2>/dev/null || true
+    else
+        realpath "$script_dir/../../.." 2>/dev/null || true
+    fi
+}
+
+# Read repository URLs from $1 (one per line, # comments) and print one record per entry:
+#   ok|<name>|<url>           valid, first occurrence
+#   skip|<name or url>|<why>  invalid URL, invalid repo name or duplicate repo
+read_repo_list() {
+    local url repo_url repo_name seen=" "
+    while IFS= read -r url || [[ -n "$url" ]]; do
+        # Skip empty lines and comments
+        [[ -z "$url" || "$url" =~ ^[[:space:]]*# ]] && continue
+
+        repo_url="${url%/}"
+        repo_name=$(basename "$repo_url" .git)
+
+        # Security validation: prevent command injection and path traversal
+        if ! [[ "$repo_url" =~ ^https://github\.com/Trivance-io/[a-zA-Z0-9_-]+(\.git)?$ ]]; then
+            echo "skip|$repo_url|invalid URL"
+        elif ! [[ "$repo_name" =~ ^[a-zA-Z0-9_-]+$ && ${#repo_name} -le 50 ]]; then
+            echo "skip|$repo_name|invalid repo name"
+        elif [[ "$seen" == *" $repo_name "* ]]; then
+            echo "skip|$repo_name|duplicate repo"
+        else
+            seen="$seen$repo_name "
+            echo "ok|$repo_name|$repo_url"
+        fi
+    done < "$1"
+}
@@ -0,0 +1,486 @@
+#!/bin/bash
+
+# Trivance Platform - Workspace Status
+# Query every workspace repository and worktree concurrently
+
+# Usage: ./scripts/core/workspace-status.sh [OPTIONS]
+#
+# OPTIONS:
+#   --json                One JSON report (repos, worktrees, branches, orphans, cleanup candidates)
+#   --jobs N              Query up to N repositories/worktrees concurrently (default: 8, env WORKSPACE_STATUS_JOBS)
+#   --fetch               Fetch and prune every repository first (otherwise ahead/behind uses the last fetch)
+#   --no-cache            Ignore cached worktree status
+#   --stale-days N        Unmerged branches without commits for N days are stale (default: 30)
+#   --workspace DIR       Override the workspace directory (default: parent of this repo)
+#   --repos-file FILE     Override the repository list (default: .specify/memory/trivance-repos.md)
+#   --help, -h            Show this help message
+#
+# Worktree status is cached in WORKSPACE_STATUS_CACHE_DIR for WORKSPACE_STATUS_TTL
+# seconds (default: 15) and invalidated as soon as HEAD, the index or the upstream
+# commit change. git status runs with core.untrackedCache enabled and honours a
+# configured core.fsmonitor, so large worktrees stay cheap even on a cache miss.
+#
+# The JSON "cleanup_candidates" array lists clean worktrees whose branch is merged
+# into the default branch and orphaned worktrees; worktree cleanup can read it
+# instead of walking the repositories again. Worktrees on merged branches always
+# get a fresh git status, so edits made within the TTL are never missed.
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+source "$SCRIPT_DIR/workspace-common.sh"
+# Opt-in timing instrumentation (SPECIFY_TRACE)
+source "$SCRIPT_DIR/../../.specify/scripts/bash/trace.sh"
+trace_init workspace-status.sh
+
+JSON_MODE=false
+JOBS="${WORKSPACE_STATUS_JOBS:-8}"
+FETCH=false
+USE_CACHE=true
+STALE_DAYS="${WORKSPACE_STATUS_STALE_DAYS:-30}"
+WORKSPACE_OVERRIDE=""
+REPOS_FILE="$SCRIPT_DIR/../../.specify/memory/trivance-repos.md"
+CACHE_TTL="${WORKSPACE_STATUS_TTL:-15}"
+CACHE_DIR="${WORKSPACE_STATUS_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/trivance/workspace-status}"
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --json) JSON_MODE=true; shift ;;
+        --jobs) JOBS="${2:-}"; shift 2 ;;
+        --fetch) FETCH=true; shift ;;
+        --no-cache) USE_CACHE=false; shift ;;
+        --stale-days) STALE_DAYS="${2:-}"; shift 2 ;;
+        --workspace) WORKSPACE_OVERRIDE="${2:-}"; shift 2 ;;
+        --repos-file) REPOS_FILE="${2:-}"; shift 2 ;;
+        --help|-h) sed -n '6,26p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'; exit 0 ;;
+        *) echo "❌ Unknown option '$1'. Use --help for usage information." >&2; exit 1 ;;
+    esac
+done
+
+[[ "$JOBS" =~ ^[1-9][0-9]*$ ]] || { echo "❌ --jobs must be a positive integer: $JOBS" >&2; exit 1; }
+[[ "$STALE_DAYS" =~ ^[0-9]+$ ]] || { echo "❌ --stale-days must be a non-negative integer: $STALE_DAYS" >&2; exit 1; }
+
+WORKSPACE_DIR="$(resolve_workspace_dir "$SCRIPT_DIR" "$WORKSPACE_OVERRIDE")"
+if [[ -z "$WORKSPACE_DIR" || ! -d "$WORKSPACE_DIR" ]]; then
+    echo "❌ Failed to calculate workspace directory" >&2
+    exit 1
+fi
+
+if [[ ! -f "$REPOS_FILE" ]]; then
+    echo "❌ .specify/memory/trivance-repos.md not found" >&2
+    exit 1
+fi
+
+RESULTS_DIR=$(mktemp -d "${TMPDIR:-/tmp}/trivance-status.XXXXXX")
+trap 'trace_finish; rm -rf "$RESULTS_DIR" 2>/dev/null' EXIT
+
+# GNU and BSD stat spell "mtime:size" differently
+if stat -c '%Y' / >/dev/null 2>&1; then
+    STAT_MTIME_SIZE=(-c '%Y:%s')
+else
+    STAT_MTIME_SIZE=(-f '%m:%z')
+fi
+
+# Field separator for result records: branch names and paths may contain "|"
+FS=$'\037'
+
+json_escape() {
+    local s="${1//\\/\\\\}"
+    printf '%s' "${s//\"/\\\"}"
+}
+
+# Run "$1 ITEM" for every remaining argument on $JOBS workers. Items are dealt
+# round-robin up front, so the pool costs $JOBS forks rather than one per item
+# plus polling (bash 3.2 has no wait -n).
+run_partitioned() {
+    local fn="$1" worker i
+    shift
+    local items=("$@")
+    for ((worker = 0; worker < JOBS && worker < ${#items[@]}; worker++)); do
+        (
+            for ((i = worker; i < ${#items[@]}; i += JOBS)); do
+                "$fn" "${items[i]}"
+            done
+        ) &
+    done
+    wait
+}
+
+# Set GIT_DIR_OF to the git dir of the checkout at $1 (.git directory or "gitdir:" file)
+worktree_git_dir() {
+    local line=""
+    GIT_DIR_OF=""
+    if [[ -d "$1/.git" ]]; then
+        GIT_DIR_OF="$1/.git"
+    elif [[ -f "$1/.git" ]]; then
+        IFS= read -r line < "$1/.git" || true
+        line="${line#gitdir: }"
+        [[ "$line" == /* ]] || line="$1/$line"
+        GIT_DIR_OF="$line"
+    fi
+}
+
+# Repository-level facts for $1: worktrees, default branch, merged and stale branches,
+# in three git calls (refs, --merged, worktree list). Writes RESULTS_DIR/repo.<name>:
+# one "repo", then "branch", "upstream" (branch, upstream commit) and "worktree" records.
+query_repo() {
+    local name="$1" path="$WORKSPACE_DIR/$1" out="$RESULTS_DIR/repo.$1"
+    local started default="" ref short date upstream track symref merged_base now
+    started=$(now_ms)
+
+    if [[ ! -d "$path/.git" ]]; then
+        printf 'repo%s%s%s%s%smissing%s%s%s\n' "$FS" "$name" "$FS" "$path" "$FS" "$FS" "$FS" "$(( $(now_ms) - started ))" > "$out"
+        return 0
+    fi
+
+    if $FETCH; then
+        git -C "$path" fetch --quiet --prune 2>/dev/null || true
+    fi
+
+    # Branches and origin's refs in one call; %1f separates the fields
+    git -C "$path" for-each-ref \
+        --format='%(refname)%1f%(refname:short)%1f%(committerdate:unix)%1f%(upstream:short)%1f%(upstream:track)%1f%(symref:short)%1f%(objectname)' \
+        refs/heads refs/remotes/origin > "$out.refs" 2>/dev/null || true
+
+    default=$(awk -F "$FS" '$1 == "refs/remotes/origin/HEAD" && $6 != "" { sub(/^origin\//, "", $6); print $6 }' "$out.refs")
+    if [[ -z "$default" ]]; then
+        if grep -q "^refs/heads/main$FS" "$out.refs"; then
+            default=main
+        elif grep -q "^refs/heads/master$FS" "$out.refs"; then
+            default=master
+        fi
+    fi
+
+    # Merged relative to the remote default branch when we have it
+    merged_base=""
+    if [[ -n "$default" ]]; then
+        if grep -q "^refs/remotes/origin/$default$FS" "$out.refs"; then
+            merged_base="origin/$default"
+        else
+            merged_base="$default"
+        fi
+        git -C "$path" for-each-ref --merged="$merged_base" --format='%(refname:short)' refs/heads \
+            > "$out.merged" 2>/dev/null || : > "$out.merged"
+    else
+        : > "$out.merged"
+    fi
+
+    now=$(date +%s)
+    # A branch whose reflog only records its creation never had work of its own:
+    # it is "merged" only because it still sits on an old base commit (fresh worktree)
+    # The refs are read twice: first for the commit of every upstream
+    awk -F "$FS" -v OFS="$FS" -v def="$default" -v logs="$path/.git/logs/" -v now="$now" -v days="$STALE_DAYS" '
+        FILENAME == ARGV[1] { merged[$0] = 1; next }
+        FNR == 1 { pass++ }
+        pass == 1 { oid[$2] = $7; next }
+        $1 !~ /^refs\/heads\// { next }
+        $4 != "" { print "upstream", $2, oid[$4] }
+        $2 == def { next }
+        {
+            if ($2 in merged) {
+                entries = 0
+                while ((getline entry < (logs $1)) > 0) entries++
+                close(logs $1)
+                if (entries == 1) delete merged[$2]
+            }
+            stale = ""
+            if ($5 == "[gone]") stale = "upstream gone"
+            else if (!($2 in merged) && $3 != "" && now - $3 > days * 86400) stale = "no commits in " int((now - $3) / 86400) " days"
+            print "branch", $2, (($2 in merged) ? 1 : 0), stale, $4
+        }' "$out.merged" "$out.refs" "$out.refs" > "$out.branches"
+
+    # Worktrees, main checkout first: path, HEAD, branch, flags
+    git -C "$path" worktree list --porcelain 2>/dev/null | awk -v OFS="$FS" '
+        function flush() { if (wt != "") print "worktree", wt, head, branch, flags; wt = ""; head = ""; branch = ""; flags = "" }
+        /^worktree / { flush(); wt = substr($0, 10); flags = (n++ == 0) ? "main" : ""; next }
+        /^HEAD / { head = substr($0, 6); next }
+        /^branch / { branch = substr($0, 8); sub(/^refs\/heads\//, "", branch); next }
+        /^(bare|detached)$/ { flags = flags (flags == "" ? "" : ",") $0; next }
+        /^(locked|prunable)/ {
+            word = $1; reason = $0; sub(/^[a-z]+ ?/, "", reason)
+            flags = flags (flags == "" ? "" : ",") word (reason == "" ? "" : ":" reason)
+            next
+        }
+        END { flush() }' > "$out.worktrees"
+
+    {
+        printf 'repo%s%s%s%s%sok%s%s%s%s\n' "$FS" "$name" "$FS" "$path" "$FS" "$FS" "$default" "$FS" "$(( $(now_ms) - started ))"
+        cat "$out.branches" "$out.worktrees"
+    } > "$out"
+    rm -f "$out.refs" "$out.merged" "$out.branches" "$out.worktrees"
+}
+
+# Cache key for worktree status: anything that changes what git status reports
+# short of editing the working tree (covered by the TTL). $2 holds the HEAD and
+# upstream commits from the repository stage, so commits and fetches (loose refs
+# included) show up without another git call.
+status_cache_key() {
+    local gitdir="$1" commits="$2" head="" stats
+    IFS= read -r head < "$gitdir/HEAD" 2>/dev/null || true
+    stats=$(stat "${STAT_MTIME_SIZE[@]}" "$gitdir/index" 2>/dev/null || true)
+    CACHE_KEY="$head|$commits|$stats"
+}
+
+# Working-tree status for worktree number $1 (see WT_PATH/WT_COMMITS/WT_FRESH); writes
+# RESULTS_DIR/wt.<n>: branch upstream ahead behind staged unstaged untracked conflicts cached ms
+query_worktree() {
+    local idx="$1" path="${WT_PATH[$1]}" out="$RESULTS_DIR/wt.$1"
+    local started="${EPOCHREALTIME/[.,]/}" now="${EPOCHSECONDS:-}" cache_file stamp cached_key record
+    [[ -n "$now" ]] || now=$(date +%s)
+    worktree_git_dir "$path"
+    status_cache_key "$GIT_DIR_OF" "${WT_COMMITS[idx]}"
+    # One file per path: "_" is escaped first so a/b_c and a_b/c never share one
+    cache_file="${path//_/__}"
+    cache_file="$CACHE_DIR/${cache_file//\//_-}.status"
+
+    if $USE_CACHE && [[ "${WT_FRESH[idx]}" != 1 && -f "$cache_file" ]]; then
+        { IFS= read -r cached_key; IFS= read -r stamp; IFS= read -r record; } < "$cache_file" || true
+        if [[ "$cached_key" == "$CACHE_KEY" && "$stamp" =~ ^[0-9]+$ && $((now - stamp)) -lt $CACHE_TTL ]]; then
+            printf '%s%s1%s%s\n' "$record" "$FS" "$FS" "$(elapsed_since "$started")" > "$out"
+            return 0
+        fi
+    fi
+
+    record=$(git -C "$path" -c core.untrackedCache=true status --porcelain=v2 --branch 2>/dev/null | awk -v OFS="$FS" '
+        /^# branch.head / { branch = $3 }
+        /^# branch.upstream / { upstream = $3 }
+        /^# branch.ab / { ahead = substr($3, 2) + 0; behind = substr($4, 2) + 0 }
+        /^[12] / { if (substr($2, 1, 1) != ".") staged++; if (substr($2, 2, 1) != ".") unstaged++ }
+        /^u / { conflicts++ }
+        /^\? / { untracked++ }
+        END { print branch, upstream, ahead + 0, behind + 0, staged + 0, unstaged + 0, untracked + 0, conflicts + 0 }') || record=""
+
+    if [[ -z "$record" ]]; then
+        printf 'error%s%s0%s0%s0%s0%s0%s0%s0%s%s\n' "$FS" "$FS" "$FS" "$FS" "$FS" "$FS" "$FS" "$FS" "$FS" "$(elapsed_since "$started")" > "$out"
+        return 0
+    fi
+
+    if $USE_CACHE && mkdir -p "$CACHE_DIR" 2>/dev/null; then
+        # git status may have refreshed the index: key the entry on the state it saw
+        status_cache_key "$GIT_DIR_OF" "${WT_COMMITS[idx]}"
+        printf '%s\n%s\n%s\n' "$CACHE_KEY" "$now" "$record" > "$cache_file.$$" && mv -f "$cache_file.$$" "$cache_file"
+    fi
+    printf '%s%s0%s%s\n' "$record" "$FS" "$FS" "$(elapsed_since "$started")" > "$out"
+}
+
+# Milliseconds since microsecond stamp $1 (0 without EPOCHREALTIME)
+elapsed_since() {
+    local now="${EPOCHREALTIME/[.,]/}"
+    if [[ -n "$1" && -n "$now" ]]; then
+        echo $(( (10#$now - 10#$1) / 1000 ))
+    else
+        echo 0
+    fi
+}
+
+started_ms=$(now_ms)
+
+# Stage 1: repository-level queries
+trace_phase repos
+declare -a REPOS=()
+while IFS='|' read -r kind repo_name detail; do
+    [[ "$kind" == ok ]] && REPOS+=("$repo_name")
+done < <(read_repo_list "$REPOS_FILE")
+[[ ${#REPOS[@]} -gt 0 ]] && run_partitioned query_repo "${REPOS[@]}"
+
+# Stage 2: every live worktree, across all repositories at once
+trace_phase worktrees
+declare -a WT_PATH=() WT_COMMITS=() WT_FRESH=()
+: > "$RESULTS_DIR/worktrees"
+: > "$RESULTS_DIR/orphans"
+KNOWN_WORKTREES=$'\n'
+for repo_name in ${REPOS[@]+"${REPOS[@]}"}; do
+    # Newline-delimited lookups (bash 3.2): merged branches, "branch<FS>upstream commit"
+    MERGED=$'\n'
+    UPSTREAMS=$'\n'
+    while IFS="$FS" read -r kind path head branch flags; do
+        case "$kind" in
+            branch) [[ "$head" == 1 ]] && MERGED+="$path"$'\n'; continue ;;  # name merged
+            upstream) UPSTREAMS+="$path$FS$head"$'\n'; continue ;;         # branch commit
+            worktree) ;;
+            *) continue ;;
+        esac
+        KNOWN_WORKTREES+="$path"$'\n'
+        if [[ "$flags" == *prunable* || ! -e "$path" ]]; then
+            printf '%s%s%s%s%s\n' "$path" "$FS" "$repo_name" "$FS" "worktree directory missing (git worktree prune)" \
+                >> "$RESULTS_DIR/orphans"
+            continue
+        fi
+        [[ "$flags" == *bare* ]] && continue
+        printf '%s%s%s%s%s%s%s%s%s%s%s\n' "${#WT_PATH[@]}" "$FS" "$repo_name" "$FS" "$path" "$FS" "$head" "$FS" \
+            "$branch" "$FS" "$flags" >> "$RESULTS_DIR/worktrees"
+        upstream=""
+        if [[ -n "$branch" && "$UPSTREAMS" == *$'\n'"$branch$FS"* ]]; then
+            upstream="${UPSTREAMS#*$'\n'"$branch$FS"}"
+            upstream="${upstream%%$'\n'*}"
+        fi
+        WT_PATH+=("$path")
+        WT_COMMITS+=("$head $upstream")
+        # A possible cleanup candidate: never trust a cached "clean"
+        if [[ -n "$branch" && "$MERGED" == *$'\n'"$branch"$'\n'* && "$flags" != *main* && "$flags" != *locked* ]]; then
+            WT_FRESH+=(1)
+        else
+            WT_FRESH+=(0)
+        fi
+    done < "$RESULTS_DIR/repo.$repo_name"
+done
+
+# Sibling checkouts whose git metadata is gone
+for dir in "$WORKSPACE_DIR"/*/; do
+    dir="${dir%/}"
+    [[ -f "$dir/.git" ]] || continue
+    [[ "$KNOWN_WORKTREES" == *$'\n'"$dir"$'\n'* ]] && continue
+    worktree_git_dir "$dir"
+    if [[ ! -d "$GIT_DIR_OF" ]]; then
+        printf '%s%s%s%s\n' "$dir" "$FS" "$FS" "gitdir $GIT_DIR_OF no longer exists" >> "$RESULTS_DIR/orphans"
+    fi
+done
+
+if [[ ${#WT_PATH[@]} -gt 0 ]]; then
+    wt_indexes=()
+    for ((i = 0; i < ${#WT_PATH[@]}; i++)); do wt_indexes+=("$i"); done
+    run_partitioned query_worktree "${wt_indexes[@]}"
+fi
+
+elapsed_ms=$(( $(now_ms) - started_ms ))
+
+# Classify and render everything in one pass over the result files
+trace_phase render
+if $JSON_MODE; then mode=json; else mode=table; fi
+awk -v mode="$mode" -v dir="$RESULTS_DIR" -v ws="$WORKSPACE_DIR" -v elapsed="$elapsed_ms" \
+    -v repos="$(IFS="$FS"; echo "${REPOS[*]-}")" '
+function jesc(s,    out, i, c) {
+    # Character loop: gsub replacement escapes differ between awks
+    if (s !~ /[\\"]/) return s
+    out = ""
+    for (i = 1; i <= length(s); i++) {
+        c = substr(s, i, 1)
+        out = out ((c == "\\" || c == "\"") ? "\\" c : c)
+    }
+    return out
+}
+function jbool(b) { return b ? "true" : "false" }
+function has(list, word) { return index("," list ",", "," word ",") > 0 }
+function rel(p) { return index(p, ws "/") == 1 ? substr(p, length(ws) + 2) : p }
+function row(icon, name, branch, ahead, behind, dirty, state) {
+    printf "   %-2s %-36s %-26s %4s %4s %5s  %s\n", icon, name, branch, ahead, behind, dirty, state
+}
+BEGIN {
+    FS = "\037"
+    nrepo = (repos == "") ? 0 : split(repos, rl, FS)
+    for (r = 1; r <= nrepo; r++) {
+        file = dir "/repo." rl[r]
+        while ((getline line < file) > 0) {
+            n = split(line, f, FS)
+            if (f[1] == "repo") { rpath[r] = f[3]; rstatus[r] = f[4]; rdefault[r] = f[5]; rms[r] = f[6] + 0 }
+            else if (f[1] == "branch") {
+                b = ++nb[r]; bname[r, b] = f[2]; bmerged[r, b] = f[3]; bstale[r, b] = f[4]; bup[r, b] = f[5]
+                merged[rl[r], f[2]] = f[3]; stale[rl[r], f[2]] = f[4]
+            }
+        }
+        close(file)
+    }
+    nw = 0
+    while ((getline line < (dir "/worktrees")) > 0) {
+        split(line, f, FS)
+        w = ++nw; wrepo[w] = f[2]; wpath[w] = f[3]; wbranch[w] = f[5]; wflags[w] = f[6]
+        checked_out[f[2], f[5]] = 1
+        file = dir "/wt." f[1]
+        rec = ""; getline rec < file; close(file)
+        split(rec, s, FS)
+        if (wbranch[w] == "") wbranch[w] = s[1]
+        wup[w] = s[2]; wahead[w] = s[3] + 0; wbehind[w] = s[4] + 0
+        wstaged[w] = s[5] + 0; wunstaged[w] = s[6] + 0; wuntracked[w] = s[7] + 0; wconflicts[w] = s[8] + 0
+        wcached[w] = s[9] + 0; wms[w] = s[10] + 0
+        wmerged[w] = merged[f[2], wbranch[w]] + 0; wstale[w] = stale[f[2], wbranch[w]]
+
+        st = ""
+        if (s[1] == "error" || rec == "") st = st ",git status failed"
+        if (wconflicts[w]) st = st ",conflicts"
+        if (wstaged[w] + wunstaged[w] + wuntracked[w]) st = st ",dirty"
+        if (wahead[w] && wbehind[w]) st = st ",diverged"
+        else if (wahead[w]) st = st ",ahead"
+        else if (wbehind[w]) st = st ",behind"
+        if (s[1] == "(detached)") st = st ",detached"
+        if (wmerged[w]) st = st ",merged"
+        if (wstale[w] != "") st = st ",stale"
+        wstate[w] = (st == "") ? "clean" : substr(st, 2)
+        # Safe to remove: a linked, unlocked worktree with nothing unmerged or uncommitted
+        wclean[w] = wmerged[w] && !has(wflags[w], "main") && wflags[w] !~ /locked/ && \
+            !has(wstate[w], "dirty") && !has(wstate[w], "conflicts") && !has(wstate[w], "ahead") && !has(wstate[w], "diverged")
+    }
+    no = 0
+    while ((getline line < (dir "/orphans")) > 0) {
+        split(line, f, FS); o = ++no; opath[o] = f[1]; orepo[o] = f[2]; oreason[o] = f[3]
+    }
+
+    if (mode == "json") {
+        printf "{\"workspace\":\"%s\",\"elapsed_ms\":%d,\"repos\":[", jesc(ws), elapsed
+        for (r = 1; r <= nrepo; r++) {
+            printf "%s{\"name\":\"%s\",\"path\":\"%s\",\"status\":\"%s\",\"default_branch\":\"%s\",\"ms\":%d,\"branches\":[", \
+                (r > 1 ? "," : ""), jesc(rl[r]), jesc(rpath[r]), rstatus[r], jesc(rdefault[r]), rms[r]
+            for (b = 1; b <= nb[r]; b++) {
+                printf "%s{\"name\":\"%s\",\"upstream\":\"%s\",\"merged\":%s,\"stale\":%s,\"checked_out\":%s}", \
+                    (b > 1 ? "," : ""), jesc(bname[r, b]), jesc(bup[r, b]), jbool(bmerged[r, b]), \
+                    (bstale[r, b] == "" ? "null" : "\"" jesc(bstale[r, b]) "\""), jbool((rl[r], bname[r, b]) in checked_out)
+            }
+            printf "],\"worktrees\":["
+            sep = ""
+            for (w = 1; w <= nw; w++) {
+                if (wrepo[w] != rl[r]) continue
+                printf "%s{\"path\":\"%s\",\"branch\":\"%s\",\"upstream\":\"%s\",\"ahead\":%d,\"behind\":%d,", \
+                    sep, jesc(wpath[w]), jesc(wbranch[w]), jesc(wup[w]), wahead[w], wbehind[w]
+                printf "\"staged\":%d,\"unstaged\":%d,\"untracked\":%d,\"conflicts\":%d,\"main\":%s,\"locked\":%s,\"state\":\"%s\",\"cached\":%s,\"ms\":%d}", \
+                    wstaged[w], wunstaged[w], wuntracked[w], wconflicts[w], jbool(has(wflags[w], "main")), \
+                    jbool(wflags[w] ~ /locked/), wstate[w], jbool(wcached[w]), wms[w]
+                sep = ","
+            }
+            printf "]}"
+        }
+        printf "],\"orphans\":["
+        for (o = 1; o <= no; o++)
+            printf "%s{\"path\":\"%s\",\"repo\":\"%s\",\"reason\":\"%s\"}", (o > 1 ? "," : ""), jesc(opath[o]), jesc(orepo[o]), jesc(oreason[o])
+        printf "],\"cleanup_candidates\":["
+        sep = ""
+        for (w = 1; w <= nw; w++) {
+            if (!wclean[w]) continue
+            printf "%s{\"path\":\"%s\",\"repo\":\"%s\",\"branch\":\"%s\",\"reason\":\"merged\"}", sep, jesc(wpath[w]), jesc(wrepo[w]), jesc(wbranch[w])
+            sep = ","
+        }
+        for (o = 1; o <= no; o++) {
+            printf "%s{\"path\":\"%s\",\"repo\":\"%s\",\"branch\":\"\",\"reason\":\"orphaned\"}", sep, jesc(opath[o]), jesc(orepo[o])
+            sep = ","
+        }
+        printf "]}\n"
+        exit
+    }
+
+    printf "📊 Workspace status: %s\n", ws
+    row("", "WORKTREE", "BRANCH", "↑", "↓", "DIRTY", "STATE")
+    for (r = 1; r <= nrepo; r++) {
+        if (rstatus[r] == "missing") { row("❌", rl[r], "-", "-", "-", "-", "missing (run setup.sh)"); continue }
+        for (w = 1; w <= nw; w++) {
+            if (wrepo[w] != rl[r]) continue
+            icon = "⚠️ "
+            if (wstate[w] == "clean") icon = "✅"
+            if (has(wstate[w], "conflicts") || has(wstate[w], "git status failed")) icon = "❌"
+            if (wclean[w]) icon = "🧹"
+            dirty = wstaged[w] + wunstaged[w] + wuntracked[w]
+            row(icon, rel(wpath[w]), wbranch[w], wahead[w], wbehind[w], (dirty ? dirty : "-"), wstate[w])
+        }
+    }
+    for (o = 1; o <= no; o++) row("👻", rel(opath[o]), "-", "-", "-", "-", "orphaned: " oreason[o])
+
+    # Branches not checked out anywhere that are merged or stale
+    for (r = 1; r <= nrepo; r++) {
+        ml = ""; sl = ""
+        for (b = 1; b <= nb[r]; b++) {
+            if ((rl[r], bname[r, b]) in checked_out) continue
+            if (bmerged[r, b]) ml = ml " " bname[r, b]
+            else if (bstale[r, b] != "") sl = sl (sl == "" ? " " : ", ") bname[r, b] " (" bstale[r, b] ")"
+        }
+        if (ml != "") printf "   🌿 %s merged branches:%s\n", rl[r], ml
+        if (sl != "") printf "   🍂 %s stale branches:%s\n", rl[r], sl
+    }
+    printf "   %d repos, %d worktrees, %d orphaned in %d.%02ds\n", nrepo, nw, no, int(elapsed / 1000), int(elapsed % 1000 / 10)
+}'
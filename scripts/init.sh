@@ -3,6 +3,21 @@
 # Claude Code Ecosystem - Initialization and Validation Script
 # Validates all dependencies required for the .claude/ configuration system
 # Does NOT install anything - only validates and guides user
+#
+# Usage: ./scripts/init.sh [--json] [--no-cache]
+#   --json       Machine-readable report with per-probe status and latency
+#   --no-cache   Ignore and do not update the probe cache
+#
+# Probes run concurrently, each in its own process group that is killed as a
+# whole after INIT_PROBE_TIMEOUT seconds (default 10). Results of process-spawning
+# probes are cached in INIT_PROBE_CACHE_DIR for INIT_PROBE_TTL seconds (default
+# 600), keyed on PATH plus the path, mtime and size of the binaries involved:
+#   python, node            successes only
+#   gh                      successes only, keyed on gh's hosts.yml as well
+#   prettier, eslint, ruff, autopep8
+#                           every result (informational: failures and timeouts
+#                           too), keyed on the tool's own executable as well
+# Installing or removing a tool changes the key, so it shows up immediately.
 
 set -euo pipefail
 
@@ -10,10 +25,24 @@ set -euo pipefail
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
 
-SCRIPT_VERSION="1.0.0"
+SCRIPT_VERSION="1.1.0"
 MIN_PYTHON_VERSION="3.8"
 MIN_NODE_VERSION="18"
 
+PROBE_TIMEOUT="${INIT_PROBE_TIMEOUT:-10}"
+PROBE_TTL="${INIT_PROBE_TTL:-600}"
+PROBE_CACHE_DIR="${INIT_PROBE_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/trivance/init-probes}"
+
+# Probe order is report order; tiers mirror the validation phases below
+# (info = reported but never counted as missing)
+PROBE_IDS=(claude git python gh node npx notifier prettier black ruff autopep8 eslint mcp shfmt jq)
+
+JSON_MODE=false
+USE_CACHE=true
+
+# Opt-in timing instrumentation (SPECIFY_TRACE)
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/../.specify/scripts/bash/trace.sh"
+
 # Colors for output
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -49,64 +78,327 @@ print_section() {
 	echo "────────────────────────────────────────────────────────────────"
 }
 
-check_command() {
-	if command -v "$1" &>/dev/null; then
-		echo -e "${GREEN}✓${NC} $2"
+# ═══════════════════════════════════════════════════════════════════════════
+# PROBES
+# ═══════════════════════════════════════════════════════════════════════════
+# Each probe prints "status|detail" where status is one of:
+#   ok       dependency present and usable
+#   fail     present but unusable (too old, not authenticated, invalid)
+#   missing  not installed (or its prerequisite is not installed)
+#   skipped  not applicable on this platform
+
+# Executables only: shell functions (the SPECIFY_TRACE git wrapper) do not count
+probe_command() {
+	local path
+	if path=$(type -P "$1" 2>/dev/null); then
+		echo "ok|$path"
+	else
+		echo "missing|"
+	fi
+}
+
+probe_claude() { probe_command claude; }
+probe_git() { probe_command git; }
+probe_npx() { probe_command npx; }
+probe_black() { probe_command black; }
+probe_shfmt() { probe_command shfmt; }
+probe_jq() { probe_command jq; }
+
+probe_python() {
+	command -v python3 &>/dev/null || {
+		echo "missing|"
 		return 0
+	}
+	# Single interpreter start: version string and native tuple comparison together
+	python3 -c "import sys; v = sys.version_info[:2]; req = tuple(map(int, '$MIN_PYTHON_VERSION'.split('.'))); print(('ok' if v >= req else 'fail') + '|' + '.'.join(map(str, v)))" 2>/dev/null ||
+		echo "fail|unknown"
+}
+
+probe_node() {
+	command -v node &>/dev/null || {
+		echo "missing|"
+		return 0
+	}
+	local version
+	version=$(node -v 2>/dev/null | cut -d 'v' -f 2 | cut -d '.' -f 1)
+	if [[ "$version" =~ ^[0-9]+$ ]] && [ "$version" -ge "$MIN_NODE_VERSION" ]; then
+		echo "ok|$version"
 	else
-		echo -e "${RED}✗${NC} $2"
-		return 1
+		echo "fail|$version"
 	fi
 }
 
-check_python_version() {
-	if ! command -v python3 &>/dev/null; then
-		return 1
+probe_gh() {
+	command -v gh &>/dev/null || {
+		echo "missing|"
+		return 0
+	}
+	if gh auth status &>/dev/null </dev/null; then
+		echo "ok|authenticated"
+	else
+		echo "fail|not authenticated"
 	fi
+}
 
-	local version=$(python3 -c 'import sys; print(".".join(map(str, sys.version_info[:2])))')
-	local required="$MIN_PYTHON_VERSION"
+probe_notifier() {
+	if [[ "$OSTYPE" == "darwin"* ]]; then
+		probe_command terminal-notifier
+	elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
+		probe_command notify-send
+	else
+		echo "skipped|$OSTYPE"
+	fi
+}
 
-	# Use Python's native tuple comparison (more robust than bash string parsing)
-	if python3 -c "import sys; req_ver = tuple(map(int, '$required'.split('.'))); sys.exit(0 if sys.version_info[:2] >= req_ver else 1)"; then
-		echo -e "${GREEN}✓${NC} Python $version (>= $required required)"
+probe_npx_tool() {
+	command -v npx &>/dev/null || {
+		echo "missing|npx"
 		return 0
+	}
+	local version
+	if version=$(npx "$1" --version 2>/dev/null </dev/null); then
+		echo "ok|$(echo "$version" | head -1)"
 	else
-		echo -e "${RED}✗${NC} Python $version (>= $required required)"
-		return 1
+		echo "fail|"
 	fi
 }
 
-check_node_version() {
-	if ! command -v node &>/dev/null; then
-		return 1
+probe_prettier() { probe_npx_tool prettier; }
+probe_eslint() { probe_npx_tool eslint; }
+
+probe_python_module() {
+	command -v python3 &>/dev/null || {
+		echo "missing|python3"
+		return 0
+	}
+	local version
+	if version=$(python3 -m "$1" --version 2>/dev/null </dev/null); then
+		echo "ok|$(echo "$version" | head -1)"
+	else
+		echo "fail|"
 	fi
+}
 
-	local version=$(node -v | cut -d 'v' -f 2 | cut -d '.' -f 1)
+probe_ruff() { probe_python_module ruff; }
+probe_autopep8() { probe_python_module autopep8; }
 
-	if [ "$version" -ge "$MIN_NODE_VERSION" ]; then
-		echo -e "${GREEN}✓${NC} Node.js v$version (>= v$MIN_NODE_VERSION required)"
-		return 0
+probe_mcp() {
+	if [ ! -f ".mcp.json" ]; then
+		echo "missing|"
+	elif ! command -v jq &>/dev/null; then
+		echo "ok|unvalidated"
+	elif jq empty .mcp.json &>/dev/null; then
+		echo "ok|valid"
 	else
-		echo -e "${RED}✗${NC} Node.js v$version (>= v$MIN_NODE_VERSION required)"
-		return 1
+		echo "fail|invalid JSON"
 	fi
 }
 
-check_gh_auth() {
-	if ! command -v gh &>/dev/null; then
-		return 1
+probe_tier() {
+	case "$1" in
+	claude | git | python) echo "critical" ;;
+	gh | node | npx | notifier | black | mcp) echo "essential" ;;
+	shfmt | jq) echo "recommended" ;;
+	*) echo "info" ;;
+	esac
+}
+
+# "path:mtime:size" of file $1, or "-" when it does not exist
+file_stamp() {
+	local stamp
+	if [[ -n "$1" ]] && stamp=$(stat -L -c '%Y:%s' "$1" 2>/dev/null || stat -L -f '%m:%z' "$1" 2>/dev/null); then
+		echo "$1:$stamp"
+	else
+		echo "-"
 	fi
+}
 
-	if gh auth status &>/dev/null; then
-		echo -e "${GREEN}✓${NC} GitHub CLI (authenticated)"
+# Cache key for probes that spawn processes; empty means "do not cache"
+probe_cache_key() {
+	local id="$1" bin extra="" path
+	$USE_CACHE || return 0
+	case "$id" in
+	python) bin=python3 ;;
+	node) bin=node ;;
+	gh)
+		# Login and logout rewrite hosts.yml; tokens from the environment bypass it
+		bin=gh
+		extra="$(file_stamp "${GH_CONFIG_DIR:-${XDG_CONFIG_HOME:-$HOME/.config}/gh}/hosts.yml")"
+		extra="$extra|${GH_TOKEN:+GH_TOKEN}${GITHUB_TOKEN:+GITHUB_TOKEN}"
+		;;
+	ruff | autopep8) bin=python3 extra="$(file_stamp "$(type -P "$id")")" ;;
+	prettier | eslint) # npx resolves project-local installs first
+		bin=npx
+		extra="$PWD|$(file_stamp "$PWD/node_modules/.bin/$id")|$(file_stamp "$(type -P "$id")")"
+		;;
+	*) return 0 ;;
+	esac
+	path=$(type -P "$bin" 2>/dev/null) || return 0
+	echo "$id|$PATH|$(file_stamp "$path")|$extra"
+}
+
+# Which results may be cached: every result of informational probes (a missing
+# optional tool would otherwise be re-probed, or time out, on every run), only
+# successes of the others
+probe_cacheable() {
+	[[ "$2" == ok\|* || "$(probe_tier "$1")" == info ]]
+}
+
+cache_read() {
+	local file="$PROBE_CACHE_DIR/$1" key stamp result
+	[[ -f "$file" ]] || return 1
+	{
+		IFS= read -r key
+		IFS= read -r stamp
+		IFS= read -r result
+	} <"$file" || return 1
+	[[ "$key" == "$2" && "$stamp" =~ ^[0-9]+$ ]] || return 1
+	[ $(($(now_ms) / 1000 - stamp)) -lt "$PROBE_TTL" ] || return 1
+	echo "$result"
+}
+
+cache_write() {
+	local file="$PROBE_CACHE_DIR/$1"
+	mkdir -p "$PROBE_CACHE_DIR" 2>/dev/null || return 0
+	printf '%s\n%s\n%s\n' "$2" "$(($(now_ms) / 1000))" "$3" >"$file.$$" 2>/dev/null &&
+		mv -f "$file.$$" "$file" 2>/dev/null || rm -f "$file.$$" 2>/dev/null
+	return 0
+}
+
+# Run a probe function with output to $2 in its own process group, killing the
+# whole group after $1 seconds: grandchildren such as the npm exec started by
+# npx would otherwise outlive the probe, reparented to init
+run_with_timeout() {
+	local seconds="$1" output="$2" pid watcher rc=0
+	shift 2
+	set -m # job control: each background job leads a new process group
+	(
+		set +m # ...whose own children stay in it
+		"$@"
+	) >"$output" 2>/dev/null </dev/null &
+	pid=$!
+	(
+		set +m
+		sleep "$seconds"
+		kill -TERM -- -"$pid" 2>/dev/null
+		sleep 1
+		kill -KILL -- -"$pid" 2>/dev/null
+	) >/dev/null 2>&1 &
+	watcher=$!
+	set +m
+	wait "$pid" || rc=$?
+	# Stragglers the probe left behind, and the watcher with its sleep
+	kill -TERM -- -"$pid" 2>/dev/null || true
+	kill -TERM -- -"$watcher" 2>/dev/null || true
+	return $rc
+}
+
+# Background worker: writes "status|detail|latency_ms|cached" to $PROBE_DIR/<id>
+run_probe() {
+	local id="$1" started key result cached=false
+	started=$(now_ms)
+	key=$(probe_cache_key "$id")
+	if [[ -n "$key" ]] && result=$(cache_read "$id" "$key"); then
+		cached=true
+	else
+		if run_with_timeout "$PROBE_TIMEOUT" "$PROBE_DIR/$id.out" "probe_$id"; then
+			result=$(head -1 "$PROBE_DIR/$id.out")
+		else
+			result="timeout|${PROBE_TIMEOUT}s"
+		fi
+		[[ -n "$key" ]] && probe_cacheable "$id" "$result" && cache_write "$id" "$key" "$result"
+	fi
+	printf '%s|%s|%s\n' "$result" "$(($(now_ms) - started))" "$cached" >"$PROBE_DIR/$id.result"
+}
+
+run_all_probes() {
+	local id
+	PROBE_DIR=$(mktemp -d "${TMPDIR:-/tmp}/init-probes.XXXXXX")
+	trap 'trace_finish; rm -rf "$PROBE_DIR" 2>/dev/null' EXIT
+	for id in "${PROBE_IDS[@]}"; do
+		run_probe "$id" &
+	done
+	wait
+}
+
+# Load a probe result into PROBE_STATUS / PROBE_DETAIL
+probe_result() {
+	PROBE_STATUS="missing"
+	PROBE_DETAIL=""
+	[[ -f "$PROBE_DIR/$1.result" ]] || return 0
+	IFS='|' read -r PROBE_STATUS PROBE_DETAIL _ _ <"$PROBE_DIR/$1.result"
+}
+
+# Print ✓/✗ for a plain command probe; returns 1 unless it is present
+report_command() {
+	probe_result "$1"
+	if [[ "$PROBE_STATUS" == "ok" ]]; then
+		echo -e "${GREEN}✓${NC} $2"
 		return 0
 	else
-		echo -e "${YELLOW}⚠${NC} GitHub CLI (not authenticated - run: gh auth login)"
+		echo -e "${RED}✗${NC} $2"
 		return 1
 	fi
 }
 
+check_python_version() {
+	probe_result python
+	case "$PROBE_STATUS" in
+	ok)
+		echo -e "${GREEN}✓${NC} Python $PROBE_DETAIL (>= $MIN_PYTHON_VERSION required)"
+		return 0
+		;;
+	fail)
+		echo -e "${RED}✗${NC} Python $PROBE_DETAIL (>= $MIN_PYTHON_VERSION required)"
+		;;
+	timeout)
+		echo -e "${RED}✗${NC} Python (probe timed out after $PROBE_DETAIL)"
+		;;
+	esac
+	return 1
+}
+
+check_node_version() {
+	probe_result node
+	case "$PROBE_STATUS" in
+	ok)
+		echo -e "${GREEN}✓${NC} Node.js v$PROBE_DETAIL (>= v$MIN_NODE_VERSION required)"
+		return 0
+		;;
+	fail)
+		echo -e "${RED}✗${NC} Node.js v$PROBE_DETAIL (>= v$MIN_NODE_VERSION required)"
+		;;
+	timeout)
+		echo -e "${RED}✗${NC} Node.js (probe timed out after $PROBE_DETAIL)"
+		;;
+	esac
+	return 1
+}
+
+check_gh_auth() {
+	probe_result gh
+	case "$PROBE_STATUS" in
+	ok)
+		echo -e "${GREEN}✓${NC} GitHub CLI (authenticated)"
+		return 0
+		;;
+	fail | timeout)
+		echo -e "${YELLOW}⚠${NC} GitHub CLI (not authenticated - run: gh auth login)"
+		;;
+	esac
+	return 1
+}
+
+# Informational probe: ✓ when ok, ⚠ with the hint otherwise, silent when the prerequisite is missing
+report_optional() {
+	probe_result "$1"
+	case "$PROBE_STATUS" in
+	ok) echo -e "${GREEN}✓${NC} $2" ;;
+	fail | timeout) echo -e "${YELLOW}⚠${NC} $3" ;;
+	esac
+	return 0
+}
+
 # ═══════════════════════════════════════════════════════════════════════════
 # VALIDATION PHASES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -114,12 +406,12 @@ check_gh_auth() {
 validate_critical_dependencies() {
 	print_section "CRITICAL Dependencies (Blockers)"
 
-	if ! check_command claude "Claude Code CLI"; then
+	if ! report_command claude "Claude Code CLI"; then
 		CRITICAL_MISSING=$((CRITICAL_MISSING + 1))
 		CRITICAL_ITEMS+=("Claude Code CLI|https://docs.anthropic.com/en/docs/claude-code/installation")
 	fi
 
-	if ! check_command git "Git"; then
+	if ! report_command git "Git"; then
 		CRITICAL_MISSING=$((CRITICAL_MISSING + 1))
 		CRITICAL_ITEMS+=("Git|https://git-scm.com/downloads")
 	fi
@@ -142,7 +434,8 @@ validate_essential_dependencies() {
 		ESSENTIAL_MISSING=$((ESSENTIAL_MISSING + 1))
 		ESSENTIAL_ITEMS+=("Node.js 18+|https://nodejs.org/")
 	else
-		if ! command -v npx &>/dev/null; then
+		probe_result npx
+		if [[ "$PROBE_STATUS" != "ok" ]]; then
 			echo -e "${RED}✗${NC} npx (should come with Node.js)"
 			ESSENTIAL_MISSING=$((ESSENTIAL_MISSING + 1))
 			ESSENTIAL_ITEMS+=("npx|https://nodejs.org/")
@@ -153,66 +446,46 @@ validate_essential_dependencies() {
 
 	# Notification system (platform-specific)
 	if [[ "$OSTYPE" == "darwin"* ]]; then
-		if ! check_command terminal-notifier "terminal-notifier (macOS notifications)"; then
+		if ! report_command notifier "terminal-notifier (macOS notifications)"; then
 			ESSENTIAL_MISSING=$((ESSENTIAL_MISSING + 1))
 			ESSENTIAL_ITEMS+=("terminal-notifier|https://github.com/julienXX/terminal-notifier#install")
 		fi
 	elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
-		if ! check_command notify-send "notify-send (Linux notifications)"; then
+		if ! report_command notifier "notify-send (Linux notifications)"; then
 			ESSENTIAL_MISSING=$((ESSENTIAL_MISSING + 1))
 			ESSENTIAL_ITEMS+=("notify-send|https://wiki.archlinux.org/title/Desktop_notifications")
 		fi
 	fi
 
 	# Code formatters
-	if command -v npx &>/dev/null; then
-		if npx prettier --version &>/dev/null; then
-			echo -e "${GREEN}✓${NC} Prettier (JS/TS/JSON/YAML formatter)"
-		else
-			echo -e "${YELLOW}⚠${NC} Prettier (will auto-install on first use via npx)"
-		fi
-	fi
+	report_optional prettier "Prettier (JS/TS/JSON/YAML formatter)" \
+		"Prettier (will auto-install on first use via npx)"
 
-	if ! check_command black "Black (Python formatter)"; then
+	if ! report_command black "Black (Python formatter)"; then
 		ESSENTIAL_MISSING=$((ESSENTIAL_MISSING + 1))
 		ESSENTIAL_ITEMS+=("Black|https://black.readthedocs.io/en/stable/getting_started.html")
 	fi
 
 	# Additional Python formatters (optional but recommended)
-	if command -v python3 &>/dev/null; then
-		if python3 -m ruff --version &>/dev/null 2>&1; then
-			echo -e "${GREEN}✓${NC} Ruff (Python linter/formatter)"
-		else
-			echo -e "${YELLOW}⚠${NC} Ruff (Python linter/formatter - recommended)"
-		fi
-
-		if python3 -m autopep8 --version &>/dev/null 2>&1; then
-			echo -e "${GREEN}✓${NC} autopep8 (Python formatter)"
-		else
-			echo -e "${YELLOW}⚠${NC} autopep8 (Python formatter - optional)"
-		fi
-	fi
+	report_optional ruff "Ruff (Python linter/formatter)" \
+		"Ruff (Python linter/formatter - recommended)"
+	report_optional autopep8 "autopep8 (Python formatter)" \
+		"autopep8 (Python formatter - optional)"
 
 	# ESLint check (optional for JS/TS projects)
-	if command -v npx &>/dev/null; then
-		if npx eslint --version &>/dev/null 2>&1; then
-			echo -e "${GREEN}✓${NC} ESLint (JS/TS linter - optional)"
-		else
-			echo -e "${YELLOW}⚠${NC} ESLint (JS/TS linter - optional, install if needed)"
-		fi
-	fi
+	report_optional eslint "ESLint (JS/TS linter - optional)" \
+		"ESLint (JS/TS linter - optional, install if needed)"
 
 	# MCP Servers configuration
-	if [ -f ".mcp.json" ]; then
+	probe_result mcp
+	if [[ "$PROBE_STATUS" != "missing" ]]; then
 		echo -e "${GREEN}✓${NC} MCP Servers configured (.mcp.json exists)"
 
-		# Validate JSON syntax if jq is available
-		if command -v jq &>/dev/null; then
-			if jq empty .mcp.json 2>/dev/null; then
-				echo "  → Valid JSON syntax"
-			else
-				echo -e "  ${YELLOW}⚠${NC} Invalid JSON syntax - check .mcp.json"
-			fi
+		# JSON syntax is validated by the probe when jq is available
+		if [[ "$PROBE_DETAIL" == "valid" ]]; then
+			echo "  → Valid JSON syntax"
+		elif [[ "$PROBE_STATUS" == "fail" ]]; then
+			echo -e "  ${YELLOW}⚠${NC} Invalid JSON syntax - check .mcp.json"
 		fi
 	else
 		echo -e "${RED}✗${NC} MCP Servers (.mcp.json not found)"
@@ -225,12 +498,12 @@ validate_essential_dependencies() {
 validate_recommended_dependencies() {
 	print_section "RECOMMENDED Dependencies (Enhanced Experience)"
 
-	if ! check_command shfmt "shfmt (Bash formatter)"; then
+	if ! report_command shfmt "shfmt (Bash formatter)"; then
 		RECOMMENDED_MISSING=$((RECOMMENDED_MISSING + 1))
 		RECOMMENDED_ITEMS+=("shfmt|https://github.com/mvdan/sh#shfmt")
 	fi
 
-	if ! check_command jq "jq (JSON processor)"; then
+	if ! report_command jq "jq (JSON processor)"; then
 		RECOMMENDED_MISSING=$((RECOMMENDED_MISSING + 1))
 		RECOMMENDED_ITEMS+=("jq|https://jqlang.github.io/jq/download/")
 	fi
@@ -351,32 +624,90 @@ offer_assistance() {
 	fi
 }
 
+# ═══════════════════════════════════════════════════════════════════════════
+# JSON REPORT
+# ═══════════════════════════════════════════════════════════════════════════
+
+json_escape() {
+	local s="${1//\\/\\\\}"
+	printf '%s' "${s//\"/\\\"}"
+}
+
+print_json_report() {
+	local id status detail latency cached sep="" exit_code="$1" total_ms="$2"
+	printf '{"version":"%s","exit_code":%d,"total_ms":%d,' "$SCRIPT_VERSION" "$exit_code" "$total_ms"
+	printf '"critical_missing":%d,"essential_missing":%d,"recommended_missing":%d,"probes":[' \
+		"$CRITICAL_MISSING" "$ESSENTIAL_MISSING" "$RECOMMENDED_MISSING"
+	for id in "${PROBE_IDS[@]}"; do
+		status="missing" detail="" latency=0 cached=false
+		[[ -f "$PROBE_DIR/$id.result" ]] &&
+			IFS='|' read -r status detail latency cached <"$PROBE_DIR/$id.result"
+		printf '%s{"id":"%s","tier":"%s","status":"%s","detail":"%s","latency_ms":%d,"cached":%s}' \
+			"$sep" "$id" "$(probe_tier "$id")" "$status" "$(json_escape "$detail")" "$latency" "$cached"
+		sep=","
+	done
+	printf ']}\n'
+}
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN EXECUTION
 # ═══════════════════════════════════════════════════════════════════════════
 
 main() {
-	print_header
+	local arg started exit_code
+	for arg in "$@"; do
+		case "$arg" in
+		--json) JSON_MODE=true ;;
+		--no-cache) USE_CACHE=false ;;
+		--help | -h)
+			sed -n '7,20p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+			exit 0
+			;;
+		*)
+			echo "ERROR: Unknown option '$arg'. Use --help for usage information." >&2
+			exit 1
+			;;
+		esac
+	done
+
+	started=$(now_ms)
+	trace_init init.sh
+	trace_phase probes
+	run_all_probes
+	trace_phase report
+
+	# Exit code reflects validation status: 2 critical, 1 essential, 0 success
+	if $JSON_MODE; then
+		{
+			validate_critical_dependencies
+			validate_essential_dependencies
+			validate_recommended_dependencies
+		} >/dev/null
+	else
+		print_header
 
-	validate_critical_dependencies
-	validate_essential_dependencies
-	validate_recommended_dependencies
-	validate_optional_features
+		validate_critical_dependencies
+		validate_essential_dependencies
+		validate_recommended_dependencies
+		validate_optional_features
 
-	print_summary
-	print_installation_guide
-	offer_assistance
+		print_summary || true
+		print_installation_guide
+		offer_assistance
 
-	echo ""
+		echo ""
+	fi
 
-	# Exit code reflects validation status
 	if [ $CRITICAL_MISSING -gt 0 ]; then
-		exit 2 # Critical failures
+		exit_code=2 # Critical failures
 	elif [ $ESSENTIAL_MISSING -gt 0 ]; then
-		exit 1 # Essential failures
+		exit_code=1 # Essential failures
 	else
-		exit 0 # Success
+		exit_code=0 # Success
 	fi
+
+	$JSON_MODE && print_json_report "$exit_code" "$(($(now_ms) - started))"
+	exit $exit_code
 }
 
 main "$@"
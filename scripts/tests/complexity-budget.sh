@@ -0,0 +1,71 @@
+#!/bin/bash
+
+# Trivance Platform - complexity-budget.sh Tests
+# Analyze a small feature branch and check that a cached report is only reused
+# for the same ref names and the same linguist-generated attributes
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+REPO="$TEST_DIR/repo"
+
+# JSON report for extra options "$@" in $OUTPUT
+budget() {
+    OUTPUT=$(cd "$REPO" && "$REPO_ROOT/.specify/scripts/bash/complexity-budget.sh" --json "$@" 2>/dev/null)
+}
+
+git init -q "$REPO"
+echo "readme" > "$REPO/README.md"
+git -C "$REPO" add README.md
+git -C "$REPO" commit -q -m init
+git -C "$REPO" checkout -q -b feature
+mkdir -p "$REPO/gen"
+seq 100 > "$REPO/gen/client.js"
+seq 10 > "$REPO/app.py"
+git -C "$REPO" add gen app.py
+git -C "$REPO" commit -q -m feature
+
+budget --base main
+assert_contains "generated client counted without attributes" '"delta_loc":110,"files":2,"binary_files"' "$OUTPUT"
+
+# --- Ref names ---------------------------------------------------------------------------
+
+git -C "$REPO" branch release main
+budget --base release
+assert_contains "same commits under another base name show that name" '"base":"release","head":"HEAD"' "$OUTPUT"
+budget --base release --head feature
+assert_contains "same commits under another head name show that name" '"base":"release","head":"feature"' "$OUTPUT"
+
+# --- Attributes -----------------------------------------------------------------------
+# linguist-generated is read from the head commit, info/attributes and
+# core.attributesFile; a cached report must follow each of them
+
+echo "gen/** linguist-generated" > "$REPO/.gitattributes"
+budget --base main
+assert_contains "uncommitted .gitattributes ignored" '"delta_loc":110,"files":2,"binary_files"' "$OUTPUT"
+rm "$REPO/.gitattributes"
+
+echo "client.js linguist-generated" > "$REPO/gen/.gitattributes"
+git -C "$REPO" add gen/.gitattributes
+git -C "$REPO" commit -q -m "mark generated"
+budget --base main
+assert_contains "nested .gitattributes at the head commit applies" '"delta_loc":11,"files":2,"binary_files"' "$OUTPUT"
+assert_contains "generated file listed as excluded" '"paths":[{"path":"gen/client.js"' "$OUTPUT"
+git -C "$REPO" rm -q gen/.gitattributes
+git -C "$REPO" commit -q -m "unmark generated"
+
+echo "app.py linguist-generated" > "$TEST_DIR/attributes"
+git -C "$REPO" config core.attributesFile "$TEST_DIR/attributes"
+budget --base main
+assert_contains "core.attributesFile applies" '"delta_loc":100,"files":1,"binary_files"' "$OUTPUT"
+: > "$TEST_DIR/attributes"
+budget --base main
+assert_contains "emptied core.attributesFile invalidates the cached report" '"delta_loc":110,"files":2,"binary_files"' "$OUTPUT"
+
+mkdir -p "$REPO/.git/info"
+echo "gen/** linguist-generated" > "$REPO/.git/info/attributes"
+budget --base main
+assert_contains "info/attributes applies" '"delta_loc":10,"files":1,"binary_files"' "$OUTPUT"
+
+finish_tests
@@ -0,0 +1,79 @@
+#!/bin/bash
+
+# Trivance Platform - create-new-feature.sh Tests
+# Feature numbering from the shared index: where the index lives, specs/
+# changes it has not seen, worktrees, opt-in branch scanning, concurrent runs
+# and locks left behind by dead runs
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+REPO="$TEST_DIR/repo"
+
+# Create a feature in directory $1 with extra options; prints its FEATURE_NUM
+create() {
+    local dir="$1"
+    shift
+    (cd "$dir" && .specify/scripts/bash/create-new-feature.sh --json "$@" 2>/dev/null) |
+        sed -n 's/.*"FEATURE_NUM":"\([0-9]*\)".*/\1/p'
+}
+
+mkdir -p "$REPO"
+cp -R "$REPO_ROOT/.specify" "$REPO/.specify"
+git -C "$REPO" init -q
+git -C "$REPO" add .specify
+git -C "$REPO" commit -q -m init
+
+assert_eq "first feature is 001" 001 "$(create "$REPO" "first feature")"
+assert_eq "second feature is 002" 002 "$(create "$REPO" "second feature")"
+assert_eq "work tree only gains the spec" "?? specs/" "$(git -C "$REPO" status --porcelain)"
+assert_eq "index kept in the git dir" 2 "$(grep -c $'\t' "$REPO/.git/specify-feature.index")"
+
+# --- specs/ changes the index has not seen -------------------------------------------
+
+mkdir "$REPO/specs/010-added-by-hand"
+assert_eq "directory created by hand is not reused" 011 "$(create "$REPO" "after manual")"
+rm -rf "$REPO/specs/011-after-manual"
+assert_eq "removed feature's number is not reused" 012 "$(create "$REPO" "after removal")"
+rm -rf "$REPO/specs/012-after-removal"
+assert_eq "--reindex reclaims numbers from specs/" 011 "$(create "$REPO" --reindex "reindexed")"
+
+# --- Branch scanning is opt-in -----------------------------------------------------------
+
+git -C "$REPO" branch 4512-fix-login-bug
+assert_eq "issue-number branch ignored by default" 012 "$(create "$REPO" "default scan")"
+assert_eq "--branch-scan reserves branch numbers" 4513 "$(create "$REPO" --branch-scan "with scan")"
+
+# --- Worktrees share the counter -----------------------------------------------------------
+
+git -C "$REPO" worktree add -q "$TEST_DIR/wt" -b wt-base main
+assert_eq "other worktree continues the shared counter" 4514 "$(create "$TEST_DIR/wt" "from worktree")"
+
+# --- Concurrent runs and stale locks ------------------------------------------------------
+
+for i in 1 2 3 4 5 6; do
+    create "$REPO" "parallel $i" > "$TEST_DIR/parallel.$i" &
+done
+wait
+assert_eq "concurrent runs get distinct numbers" "4515 4516 4517 4518 4519 4520" \
+    "$(sort -n "$TEST_DIR"/parallel.* | tr '\n' ' ' | sed 's/ $//')"
+
+mkdir "$REPO/.git/specify-feature.lock"
+touch -d "@$(($(date +%s) - 60))" "$REPO/.git/specify-feature.lock"
+assert_eq "lock left without a pid file is broken" 4521 \
+    "$(SPECIFY_LOCK_TIMEOUT=3 create "$REPO" "after dead holder")"
+
+# --- Without git ---------------------------------------------------------------------------
+
+NOGIT="$TEST_DIR/nogit"
+mkdir -p "$NOGIT"
+cp -R "$REPO_ROOT/.specify" "$NOGIT/.specify"
+assert_eq "no git: first feature is 001" 001 "$(create "$NOGIT" "plain tree")"
+if [[ -f "$NOGIT/.specify/feature.index" && ! -e "$NOGIT/specs/.index" ]]; then
+    pass "no git: index kept in .specify/"
+else
+    fail "no git: index kept in .specify/"
+fi
+
+finish_tests
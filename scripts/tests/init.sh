@@ -0,0 +1,129 @@
+#!/bin/bash
+
+# Trivance Platform - init.sh Tests
+# Run the dependency validator against stub binaries on PATH (fake claude, git,
+# python3, node, gh, npx...) and check statuses, exit codes, the probe cache and
+# that timed-out probes leave no processes behind
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+STUBS="$TEST_DIR/stubs"
+SYSBIN="$TEST_DIR/sysbin"
+PROJECT="$TEST_DIR/project"
+STATE="$TEST_DIR/state"
+mkdir -p "$STUBS" "$SYSBIN" "$PROJECT" "$STATE" "$HOME/.config/gh"
+echo '{"mcpServers":{}}' > "$PROJECT/.mcp.json"
+
+# Only the utilities init.sh and the stubs need, so real tools never leak in
+for tool in sh cat dirname head cut stat mktemp sleep rm mkdir mv sed date grep; do
+    ln -s "$(type -P "$tool")" "$SYSBIN/$tool"
+done
+
+# stub NAME BODY: executable shell script on the stub PATH
+stub() {
+    printf '#!/bin/sh\n%s\n' "$2" > "$STUBS/$1"
+    chmod +x "$STUBS/$1"
+}
+
+for tool in claude git black shfmt jq notify-send terminal-notifier; do stub "$tool" 'exit 0'; done
+stub python3 'case "$1" in
+-c) echo "ok|3.12" ;;
+-m) command -v "$2" >/dev/null 2>&1 && echo "$2 1.0.0" || { echo "No module named $2" >&2; exit 1; } ;;
+esac'
+stub node 'echo v20.11.0'
+stub gh '[ "$1 $2" = "auth status" ] && grep -q oauth_token "$HOME/.config/gh/hosts.yml" 2>/dev/null'
+# eslint hangs like a first npx download when $STATE/eslint-hangs exists
+stub npx 'if [ "$1" = eslint ] && [ -f "'"$STATE"'/eslint-hangs" ]; then
+    sleep 30 &
+    echo $! > "'"$STATE"'/eslint.child"
+    wait
+fi
+echo "$1 9.0.0"'
+stub autopep8 'exit 0'
+echo "github.com: {oauth_token: x}" > "$HOME/.config/gh/hosts.yml"
+
+# run_init CACHE_NAME [OPTIONS...]: JSON report in $OUTPUT, exit code in $RC,
+# wall time in $ELAPSED
+run_init() {
+    local cache="$TEST_DIR/cache-$1" started
+    shift
+    RC=0
+    started=$(now_ms)
+    OUTPUT=$(cd "$PROJECT" && PATH="$STUBS:$SYSBIN" INIT_PROBE_TIMEOUT=1 \
+        INIT_PROBE_CACHE_DIR="$cache" "$REPO_ROOT/scripts/init.sh" --json "$@" 2>/dev/null) || RC=$?
+    ELAPSED=$(( $(now_ms) - started ))
+}
+
+# The JSON object of probe $1 in $OUTPUT
+probe() {
+    grep -o "{\"id\":\"$1\"[^}]*}" <<<"$OUTPUT"
+}
+
+# --- Everything installed --------------------------------------------------------
+
+run_init main
+assert_eq "all dependencies present: exit 0" 0 "$RC"
+assert_contains "python version reported" '"status":"ok","detail":"3.12"' "$(probe python)"
+assert_contains "node version reported" '"status":"ok","detail":"20"' "$(probe node)"
+assert_contains "gh authenticated" '"status":"ok","detail":"authenticated"' "$(probe gh)"
+assert_contains "ruff missing is a failure" '"status":"fail"' "$(probe ruff)"
+assert_contains "autopep8 found" '"status":"ok","detail":"autopep8 1.0.0"' "$(probe autopep8)"
+assert_contains ".mcp.json validated" '"status":"ok","detail":"valid"' "$(probe mcp)"
+
+run_init main
+assert_contains "node result cached" '"cached":true' "$(probe node)"
+assert_contains "informational failure cached" '"cached":true' "$(probe ruff)"
+
+# --- Cache keys follow the tools and credentials -----------------------------------
+
+stub ruff 'exit 0'
+run_init main
+assert_contains "newly installed ruff shows up at once" '"status":"ok","detail":"ruff 1.0.0"' "$(probe ruff)"
+
+echo "github.com: {}" > "$HOME/.config/gh/hosts.yml"
+run_init main
+assert_contains "gh logout shows up at once" '"status":"fail","detail":"not authenticated"' "$(probe gh)"
+assert_eq "unauthenticated gh is an essential failure" 1 "$RC"
+echo "github.com: {oauth_token: x}" > "$HOME/.config/gh/hosts.yml"
+
+stub node 'echo v9.1.0'
+run_init main
+assert_contains "replaced node binary re-probed" '"status":"fail","detail":"9"' "$(probe node)"
+assert_eq "node too old: exit 1" 1 "$RC"
+stub node 'echo v20.11.0'
+
+rm -f "$STUBS/claude"
+run_init main
+assert_contains "missing claude reported" '"status":"missing"' "$(probe claude)"
+assert_eq "critical dependency missing: exit 2" 2 "$RC"
+stub claude 'exit 0'
+
+# --- Timeouts ------------------------------------------------------------------------
+
+touch "$STATE/eslint-hangs"
+run_init hang
+assert_contains "hanging probe times out" '"status":"timeout","detail":"1s"' "$(probe eslint)"
+child=$(cat "$STATE/eslint.child" 2>/dev/null)
+sleep 0.2
+if [[ -n "$child" ]] && [[ -n "$(ps -o stat= -p "$child" 2>/dev/null | grep -v Z)" ]]; then
+    fail "timed-out probe's grandchild killed with its process group"
+    kill "$child" 2>/dev/null
+else
+    pass "timed-out probe's grandchild killed with its process group"
+fi
+
+run_init hang
+assert_contains "timeout of an informational probe cached" '"status":"timeout","detail":"1s","latency_ms":' "$(probe eslint)"
+assert_contains "cached timeout served from the cache" '"cached":true' "$(probe eslint)"
+if [[ $ELAPSED -lt 1000 ]]; then
+    pass "warm run does not wait for the timeout (${ELAPSED}ms)"
+else
+    fail "warm run does not wait for the timeout (${ELAPSED}ms)"
+fi
+
+run_init hang --no-cache
+assert_contains "--no-cache probes again" '"cached":false' "$(probe eslint)"
+
+finish_tests
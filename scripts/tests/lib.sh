@@ -0,0 +1,79 @@
+#!/bin/bash
+
+# Trivance Platform - Test Helpers
+# Shared by scripts/tests/*.sh. Source this file: it creates $TEST_DIR (removed
+# on exit), isolates HOME and git identity, and defines the assertions below.
+# Each test script ends with finish_tests, which exits 1 when any check failed.
+
+TESTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+REPO_ROOT="$(cd "$TESTS_DIR/../.." && pwd)"
+TEST_DIR=$(mktemp -d "${TMPDIR:-/tmp}/trivance-test.XXXXXX")
+trap 'rm -rf "$TEST_DIR" 2>/dev/null' EXIT
+PASSED=0
+FAILED=0
+
+# Millisecond wall clock: now_ms, shared with the workflow scripts
+source "$REPO_ROOT/.specify/scripts/bash/trace.sh"
+
+# No user or system git config, tool caches or credentials leak into a test
+export HOME="$TEST_DIR/home"
+export GIT_CONFIG_NOSYSTEM=1
+export GIT_AUTHOR_NAME=test GIT_AUTHOR_EMAIL=test@localhost
+export GIT_COMMITTER_NAME=test GIT_COMMITTER_EMAIL=test@localhost
+unset SPECIFY_TRACE SPECIFY_FEATURE XDG_CACHE_HOME XDG_CONFIG_HOME
+mkdir -p "$HOME"
+git config --global init.defaultBranch main
+
+pass() {
+    echo "✅ $1"
+    PASSED=$((PASSED + 1))
+}
+
+fail() {
+    echo "❌ $1"
+    FAILED=$((FAILED + 1))
+}
+
+# assert_eq LABEL EXPECTED ACTUAL
+assert_eq() {
+    if [[ "$2" == "$3" ]]; then
+        pass "$1"
+    else
+        fail "$1 (expected '$2', got '$3')"
+    fi
+}
+
+# assert_contains LABEL NEEDLE TEXT (fixed string)
+assert_contains() {
+    if [[ "$3" == *"$2"* ]]; then
+        pass "$1"
+    else
+        fail "$1 (missing '$2')"
+    fi
+}
+
+# assert_not_contains LABEL NEEDLE TEXT (fixed string)
+assert_not_contains() {
+    if [[ "$3" != *"$2"* ]]; then
+        pass "$1"
+    else
+        fail "$1 (unexpected '$2')"
+    fi
+}
+
+# assert_same_file LABEL EXPECTED_FILE ACTUAL_FILE (shows a diff on mismatch)
+assert_same_file() {
+    if cmp -s "$2" "$3"; then
+        pass "$1"
+    else
+        fail "$1 ($3 differs from $2)"
+        diff -u "$2" "$3" | head -20 | sed 's/^/      /'
+    fi
+}
+
+finish_tests() {
+    echo ""
+    echo "📊 $PASSED passed, $FAILED failed"
+    [[ $FAILED -eq 0 ]] || exit 1
+    exit 0
+}
@@ -0,0 +1,44 @@
+#!/bin/bash
+
+# Trivance Platform - Test Runner
+# Run every test script in scripts/tests (or only the ones named) and summarize
+#
+# Usage: ./scripts/tests/run.sh [NAME...]
+#   NAME   Test to run, e.g. setup or schedule-tasks (default: all)
+
+set -uo pipefail
+
+TESTS_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+declare -a TESTS=() FAILED_TESTS=()
+
+if [[ $# -gt 0 ]]; then
+    for name in "$@"; do
+        [[ -f "$TESTS_DIR/$name.sh" ]] || { echo "❌ Unknown test: $name" >&2; exit 1; }
+        TESTS+=("$TESTS_DIR/$name.sh")
+    done
+else
+    for test in "$TESTS_DIR"/*.sh; do
+        case "${test##*/}" in
+            lib.sh|run.sh) ;;
+            *) TESTS+=("$test") ;;
+        esac
+    done
+fi
+
+for test in "${TESTS[@]}"; do
+    name="${test##*/}"
+    echo "🧪 ${name%.sh}"
+    if bash "$test" 2>&1 | sed 's/^/   /'; then
+        :
+    else
+        FAILED_TESTS+=("${name%.sh}")
+    fi
+    echo ""
+done
+
+if [[ ${#FAILED_TESTS[@]} -eq 0 ]]; then
+    echo "🎉 ${#TESTS[@]} test scripts passed"
+else
+    echo "❌ Failed: ${FAILED_TESTS[*]}"
+    exit 1
+fi
@@ -0,0 +1,159 @@
+#!/bin/bash
+
+# Trivance Platform - schedule-tasks.sh Tests
+# Plan the tasks-template.md example and generated plans, and check the waves:
+# phase barriers, same-file serialization (one-character names included), prose
+# that only looks like a file name, a --run that would overlap same-file tasks,
+# and --mark-done with duplicate IDs
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+SCHEDULER="$REPO_ROOT/.specify/scripts/bash/schedule-tasks.sh"
+
+# "ID WAVE" for every task of plan $1
+waves() {
+    bash "$SCHEDULER" --tasks "$1" --json |
+        grep -o '"id":"[^"]*","line":[0-9]*,"done":[a-z]*,"parallel":[a-z]*,"story":"[^"]*","wave":[0-9]*' |
+        sed 's/"id":"\([^"]*\)".*"wave":\([0-9]*\)/\1 \2/'
+}
+
+# Wave of task $2 in the waves() output $1
+wave_of() {
+    awk -v id="$2" '$1 == id { print $2 }' <<<"$1"
+}
+
+# assert_before LABEL WAVES FIRST SECOND: task FIRST runs in an earlier wave
+assert_before() {
+    local a b
+    a=$(wave_of "$2" "$3")
+    b=$(wave_of "$2" "$4")
+    if [[ -n "$a" && -n "$b" && "$a" -lt "$b" ]]; then
+        pass "$1"
+    else
+        fail "$1 ($3 in wave '$a', $4 in wave '$b')"
+    fi
+}
+
+# --- tasks-template.md -------------------------------------------------------------
+
+W=$(waves "$REPO_ROOT/.specify/templates/tasks-template.md")
+assert_eq "template: all tasks planned" 34 "$(wc -l <<<"$W" | tr -d ' ')"
+assert_eq "template: [P] setup tasks share a wave" "$(wave_of "$W" T005)" "$(wave_of "$W" T006)"
+assert_before "template: foundational phase waits for setup" "$W" T003 T004
+assert_before "template: stories wait for the foundational phase" "$W" T009 T010
+assert_eq "template: independent stories run side by side" "$(wave_of "$W" T012)" "$(wave_of "$W" T018)"
+assert_before "template: explicit dependency honoured" "$W" T013 T014
+assert_before "template: mention of User Story 1 waits for it" "$W" T017 T023
+assert_before "template: polish waits for every story" "$W" T028 TXXX
+
+# --- Same-file tasks -----------------------------------------------------------------
+
+cat > "$TEST_DIR/files.md" << 'EOF'
+## Phase 1: Setup
+
+- [ ] T001 [P] Edit src/a.py
+- [ ] T002 [P] Edit src/a.py
+- [ ] T003 [P] Create `src/shared/2.py`.
+- [ ] T004 [P] Extend (src/shared/2.py)
+- [ ] T005 [P] Upgrade Node.js in package.json
+- [ ] T006 [P] Document Node.js support in README.md
+- [ ] T007 [P] Pin versions in package.json
+- [ ] T008 [P] Add a console script to setup.py
+- [ ] T009 [P] Package data in ./setup.py
+- [ ] T010 [P] Create the src/api/ package
+- [ ] T011 [P] Add src/api/ routes
+EOF
+W=$(waves "$TEST_DIR/files.md")
+assert_before "one-character file name serializes" "$W" T001 T002
+assert_before "one-character name in a directory serializes" "$W" T003 T004
+assert_eq "Node.js is not a file" "$(wave_of "$W" T005)" "$(wave_of "$W" T006)"
+assert_before "bare file name with a known extension serializes" "$W" T005 T007
+assert_before "./ prefix names the same file" "$W" T008 T009
+assert_before "directory mention serializes" "$W" T010 T011
+
+# --- Large generated plan --------------------------------------------------------------
+# Setup and foundational barriers, 4 stories, polish; every fifth task edits one
+# of four one-character shared files. Every task in a barrier phase must start
+# after every earlier task, story tasks after the foundational phase, and tasks
+# sharing a file must run in file order.
+
+awk -v n=400 -v meta="$TEST_DIR/large.meta" 'BEGIN {
+    setup = 20; found = 40; polish = 20; per = int((n - setup - found - polish) / 4)
+    phase("Setup", setup, "")
+    phase("Foundational", found, "")
+    for (s = 1; s <= 4; s++) phase("User Story " s, per, "US" s)
+    phase("Polish", n - t, "")
+}
+function phase(title, count, story,    i, id, file) {
+    print "## Phase: " title "\n"
+    for (i = 0; i < count; i++) {
+        id = sprintf("T%04d", ++t)
+        file = (t % 5 == 0) ? "src/shared/" (t % 4) ".py" : "src/" tolower(story == "" ? "core" : story) "/f" t ".py"
+        printf "- [ ] %s %s%sTask in %s\n", id, (t % 3 ? "[P] " : ""), (story == "" ? "" : "[" story "] "), file
+        print id, (story == "" ? title : "story"), file > meta
+        if (i == int(count / 2)) print "\n**Checkpoint**: halfway\n"
+    }
+    print ""
+}' > "$TEST_DIR/large.md"
+
+W=$(waves "$TEST_DIR/large.md")
+assert_eq "large plan: all tasks planned" 400 "$(wc -l <<<"$W" | tr -d ' ')"
+violations=$(awk '
+    NR == FNR { wave[$1] = $2; next }
+    {
+        w = wave[$1]
+        if ($2 != "story" && $2 != prev_phase && w <= max_all) print $1 " starts " $2 " before earlier tasks end"
+        if ($2 == "story" && w <= max_barrier) print $1 " starts before the foundational phase ends"
+        if (($3 in last_wave) && w <= last_wave[$3]) print $1 " overlaps an earlier task on " $3
+        last_wave[$3] = w
+        if ($2 != "story" && w > max_barrier) max_barrier = w
+        if ($2 != "story") prev_phase = $2; else prev_phase = ""
+        if (w > max_all) max_all = w
+    }' <(echo "$W") "$TEST_DIR/large.meta")
+assert_eq "large plan: barriers and same-file order hold" "" "$violations"
+
+# --- Running same-file tasks ---------------------------------------------------------
+# Each command holds a mkdir lock long enough that overlapping runs would collide
+
+RUN="$TEST_DIR/run"
+mkdir -p "$RUN"
+git -C "$RUN" init -q
+lock='mkdir lock && sleep 0.2 && rmdir lock && echo $SPECIFY_TASK_ID >> order'
+cat > "$RUN/tasks.md" << EOF
+## Phase 1: Setup
+
+- [ ] T001 [P] Write src/a.py
+  - run: \`$lock\`
+- [ ] T002 [P] Rewrite src/a.py
+  - run: \`$lock\`
+- [ ] T003 [P] Finish src/a.py
+  - run: \`$lock\`
+EOF
+rc=0
+(cd "$RUN" && bash "$SCHEDULER" --tasks tasks.md --run --jobs 4 --log-dir "$RUN/logs" > /dev/null 2>&1) || rc=$?
+assert_eq "same-file tasks never overlap under --run" 0 "$rc"
+assert_eq "same-file tasks run in file order" "T001 T002 T003" "$(tr '\n' ' ' < "$RUN/order" 2>/dev/null | sed 's/ $//')"
+
+# --- --mark-done ------------------------------------------------------------------------
+# Duplicate IDs are separate tasks: only the copy that succeeded is checked off
+
+cat > "$RUN/marks.md" << 'EOF'
+## Phase 1: Setup
+
+- [ ] T001 [P] Succeeds
+  - run: `true`
+- [ ] T001 [P] Fails under the same ID
+  - run: `false`
+- [ ] T002 [P] Also succeeds
+  - run: `true`
+EOF
+chmod 640 "$RUN/marks.md"
+(cd "$RUN" && bash "$SCHEDULER" --tasks marks.md --run --keep-going --mark-done --log-dir "$RUN/logs" > /dev/null 2>&1)
+assert_eq "--mark-done checks off only the succeeded copy of a duplicate ID" "[X] T001 [ ] T001 [X] T002" \
+    "$(grep -o '\[.\] T00[0-9]' "$RUN/marks.md" | tr '\n' ' ' | sed 's/ $//')"
+assert_eq "--mark-done keeps the file mode" 640 \
+    "$(stat -c '%a' "$RUN/marks.md" 2>/dev/null || stat -f '%Lp' "$RUN/marks.md")"
+
+finish_tests
@@ -0,0 +1,112 @@
+#!/bin/bash
+
+# Trivance Platform - setup.sh Tests
+# Sync a workspace from local bare repositories (reached through git's
+# url.<base>.insteadOf rewriting, so the github.com URL validation stays on):
+# clone, fast-forward, reference mirrors, partial clones and option checks
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+REMOTES="$TEST_DIR/remotes"
+REPOS=(trivance-mobile trivance_auth)
+
+# Orchestrator checkout at $1/trivance-ai-orchestrator with a small .claude/
+make_workspace() {
+    local orch="$1/trivance-ai-orchestrator"
+    mkdir -p "$orch/.claude/commands"
+    cp -R "$REPO_ROOT/scripts" "$REPO_ROOT/.specify" "$REPO_ROOT/.gitignore" "$orch/"
+    echo "# command" > "$orch/.claude/commands/test.md"
+}
+
+# Commit a file to remote $1 through a scratch clone; prints the new commit
+push_commit() {
+    local name="$1" seed="$TEST_DIR/seed-$1"
+    [[ -d "$seed" ]] || git clone -q "$REMOTES/$name" "$seed" 2>/dev/null
+    echo "$2" > "$seed/$2.txt"
+    git -C "$seed" add -A
+    git -C "$seed" commit -q -m "$2"
+    git -C "$seed" push -q origin HEAD:main
+    git -C "$seed" rev-parse HEAD
+}
+
+# run_setup WORKSPACE [OPTIONS...]: output in $OUTPUT, exit code in $RC
+run_setup() {
+    local ws="$1"
+    shift
+    RC=0
+    OUTPUT=$(GIT_CONFIG_COUNT=1 GIT_CONFIG_KEY_0="url.$REMOTES/.insteadOf" \
+        GIT_CONFIG_VALUE_0="https://github.com/Trivance-io/" \
+        "$ws/trivance-ai-orchestrator/scripts/core/setup.sh" --repos-file "$TEST_DIR/repos.md" "$@" 2>&1) || RC=$?
+}
+
+mkdir -p "$REMOTES"
+{
+    for name in "${REPOS[@]}"; do echo "https://github.com/Trivance-io/$name"; done
+    echo "https://example.com/Trivance-io/not-github"
+} > "$TEST_DIR/repos.md"
+for name in "${REPOS[@]}"; do
+    git init -q --bare -b main "$REMOTES/$name"
+    push_commit "$name" initial > /dev/null
+done
+
+# --- Fresh clone and fast-forward ------------------------------------------------
+
+WS="$TEST_DIR/ws"
+make_workspace "$WS"
+run_setup "$WS"
+assert_eq "first run exits 0" 0 "$RC"
+for name in "${REPOS[@]}"; do
+    assert_eq "$name cloned from its bare remote" "$(git -C "$REMOTES/$name" rev-parse main)" \
+        "$(git -C "$WS/$name" rev-parse HEAD 2>/dev/null)"
+done
+assert_contains "invalid URL skipped" "Skipping invalid URL" "$OUTPUT"
+assert_eq ".claude deployed to the workspace" "# command" "$(cat "$WS/.claude/commands/test.md" 2>/dev/null)"
+assert_eq ".gitignore deployed to the workspace" "$(cat "$REPO_ROOT/.gitignore")" "$(cat "$WS/.gitignore" 2>/dev/null)"
+
+expected=$(push_commit trivance_auth second)
+run_setup "$WS" --jobs 1
+assert_eq "second run exits 0" 0 "$RC"
+assert_contains "existing repo updated" "✅ Updated trivance_auth" "$OUTPUT"
+assert_eq "update fast-forwards to the remote" "$expected" "$(git -C "$WS/trivance_auth" rev-parse HEAD)"
+
+# --- Reference mirrors ---------------------------------------------------------
+
+WS2="$TEST_DIR/ws2"
+MIRRORS="$TEST_DIR/mirrors"
+make_workspace "$WS2"
+run_setup "$WS2" --reference-dir "$MIRRORS"
+assert_eq "clone through mirrors exits 0" 0 "$RC"
+assert_eq "mirror created for a new clone" "$expected" \
+    "$(git -C "$MIRRORS/trivance_auth.git" rev-parse main 2>/dev/null)"
+if [[ -f "$WS2/trivance_auth/.git/objects/info/alternates" ]]; then
+    fail "clone still borrows objects from the mirror"
+else
+    pass "clone dissociated from the mirror"
+fi
+
+updated=$(push_commit trivance_auth third)
+run_setup "$WS2" --reference-dir "$MIRRORS"
+assert_eq "update with mirrors exits 0" 0 "$RC"
+assert_eq "existing repo updated from its remote" "$updated" "$(git -C "$WS2/trivance_auth" rev-parse HEAD)"
+assert_eq "mirror not fetched for an existing repo" "$expected" \
+    "$(git -C "$MIRRORS/trivance_auth.git" rev-parse main 2>/dev/null)"
+
+# --- Partial clones --------------------------------------------------------------
+
+WS3="$TEST_DIR/ws3"
+make_workspace "$WS3"
+run_setup "$WS3" --filter blob
+assert_eq "blob-less clone exits 0" 0 "$RC"
+assert_eq "clone records the blob:none filter" "blob:none" \
+    "$(git -C "$WS3/trivance-mobile" config remote.origin.partialclonefilter 2>/dev/null)"
+
+run_setup "$WS3" --filter blob --reference-dir "$MIRRORS"
+assert_eq "--filter with --reference-dir rejected" 1 "$RC"
+assert_contains "rejection explains why" "cannot be combined with --reference-dir" "$OUTPUT"
+
+run_setup "$WS3" --jobs 0
+assert_eq "--jobs 0 rejected" 1 "$RC"
+
+finish_tests
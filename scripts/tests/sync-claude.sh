@@ -0,0 +1,106 @@
+#!/bin/bash
+
+# Trivance Platform - sync-claude.sh Tests
+# Deploy a small .claude/ tree to two targets and check what each sync touches:
+# user files and directories, pruning after removals, same-second edits, and
+# copies vs hardlinks between targets
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+SYNC="$REPO_ROOT/scripts/core/sync-claude.sh"
+SRC="$TEST_DIR/src"
+A="$TEST_DIR/a/.claude"
+B="$TEST_DIR/b/.claude"
+
+inode() {
+    ls -i "$1" | awk '{ print $1 }'
+}
+
+mkdir -p "$SRC/agents/old" "$SRC/commands"
+echo "reviewer" > "$SRC/agents/reviewer.md"
+echo "legacy" > "$SRC/agents/old/legacy.md"
+echo "pr" > "$SRC/commands/pr.md"
+
+"$SYNC" --quiet "$SRC" "$A" "$B"
+assert_eq "first deploy creates target a" "pr" "$(cat "$A/commands/pr.md" 2>/dev/null)"
+assert_eq "first deploy creates target b" "legacy" "$(cat "$B/agents/old/legacy.md" 2>/dev/null)"
+
+# --- User content and pruning ---------------------------------------------------
+
+mkdir -p "$A/mine" "$A/notes"
+echo "keep" > "$A/notes/todo.md"
+rm -rf "$SRC/agents/old"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+if [[ -d "$A/agents/old" ]]; then fail "directory emptied by a removal pruned"; else pass "directory emptied by a removal pruned"; fi
+if [[ -d "$A/mine" ]]; then pass "empty user directory kept"; else fail "empty user directory kept"; fi
+assert_eq "user file kept" "keep" "$(cat "$A/notes/todo.md" 2>/dev/null)"
+if [[ -d "$A/agents" ]]; then pass "non-empty parent kept"; else fail "non-empty parent kept"; fi
+
+# --- Same-size edit within the same second ----------------------------------------
+
+echo "first" > "$SRC/commands/pr.md"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+echo "again" > "$SRC/commands/pr.md"
+touch -d "@$(date -r "$SRC/commands/pr.md" +%s)" "$SRC/commands/pr.md" 2>/dev/null || true
+"$SYNC" --quiet "$SRC" "$A" "$B"
+assert_eq "same-size edit in the same second deployed" "again" "$(cat "$A/commands/pr.md")"
+
+# --- Copies by default, hardlinks with --link ---------------------------------------
+
+if [[ "$(inode "$A/agents/reviewer.md")" != "$(inode "$B/agents/reviewer.md")" ]]; then
+    pass "targets get independent copies by default"
+else
+    fail "targets get independent copies by default"
+fi
+echo "local edit" > "$A/agents/reviewer.md"
+assert_eq "edit in one target stays there" "reviewer" "$(cat "$B/agents/reviewer.md")"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+assert_eq "next sync restores the edited file" "reviewer" "$(cat "$A/agents/reviewer.md")"
+
+rm -rf "$A" "$B"
+"$SYNC" --quiet --link "$SRC" "$A" "$B"
+assert_eq "--link shares inodes between targets" "$(inode "$A/agents/reviewer.md")" "$(inode "$B/agents/reviewer.md")"
+(cd "$TEST_DIR" && "$SYNC" --quiet --link src rel-a/.claude rel-b/.claude)
+assert_eq "--link with relative targets" "$(inode "$TEST_DIR/rel-a/.claude/agents/reviewer.md")" \
+    "$(inode "$TEST_DIR/rel-b/.claude/agents/reviewer.md" 2>/dev/null)"
+
+# --- File modes and symlinks ----------------------------------------------------------
+
+rm -rf "$A" "$B"
+ln -s reviewer.md "$SRC/agents/default.md"
+"$SYNC" --quiet "$SRC" "$A"
+assert_eq "first deploy keeps a symlink" "reviewer.md" "$(readlink "$A/agents/default.md")"
+mkdir -p "$B"
+"$SYNC" --quiet "$SRC" "$B"
+assert_eq "incremental sync creates a symlink" "reviewer.md" "$(readlink "$B/agents/default.md")"
+
+chmod +x "$SRC/commands/pr.md"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+if [[ -x "$A/commands/pr.md" && -x "$B/commands/pr.md" ]]; then
+    pass "chmod +x in the source reaches every target"
+else
+    fail "chmod +x in the source reaches every target"
+fi
+chmod -x "$A/commands/pr.md"
+"$SYNC" --quiet "$SRC" "$A"
+if [[ -x "$A/commands/pr.md" ]]; then pass "mode changed in the target restored"; else fail "mode changed in the target restored"; fi
+
+ln -sfn ../commands/pr.md "$SRC/agents/default.md"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+assert_eq "retargeted symlink follows" "../commands/pr.md" "$(readlink "$B/agents/default.md")"
+rm "$SRC/agents/default.md"
+"$SYNC" --quiet "$SRC" "$A" "$B"
+if [[ -L "$B/agents/default.md" ]]; then fail "removed symlink removed"; else pass "removed symlink removed"; fi
+output=$("$SYNC" "$SRC" "$A")
+assert_contains "no-op run after mode and symlink changes" "+0 ~0 -0" "$output"
+
+# --- Dry run ------------------------------------------------------------------------
+
+echo "new" > "$SRC/commands/new.md"
+output=$("$SYNC" --dry-run "$SRC" "$A")
+assert_contains "dry run reports the delta" "+1 ~0 -0" "$output"
+if [[ -e "$A/commands/new.md" ]]; then fail "dry run writes nothing"; else pass "dry run writes nothing"; fi
+
+finish_tests
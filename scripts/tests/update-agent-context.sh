@@ -0,0 +1,88 @@
+#!/bin/bash
+
+# Trivance Platform - update-agent-context.sh Golden Tests
+# Each directory in fixtures/update-agent-context/ is one case:
+#   plan.md     plan of feature 001-demo-feature in a project named "demo"
+#   input/      files placed at the project root before the run (optional)
+#   agents      agent types, one run each (optional; default: one run, no argument)
+#   expected/   every file the run must produce, with @TODAY@ for the current date
+#
+# Usage: ./scripts/tests/update-agent-context.sh [--update]
+#   --update   Rewrite expected/ from the current output (review the diff!)
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+FIXTURES="$TESTS_DIR/fixtures/update-agent-context"
+TODAY=$(date +%Y-%m-%d)
+UPDATE=false
+[[ "${1:-}" == "--update" ]] && UPDATE=true
+
+# Project "demo" on branch 001-demo-feature for case directory $1; prints its path
+make_project() {
+    local case_dir="$1" project="$TEST_DIR/${1##*/}/demo"
+    mkdir -p "$project/specs/001-demo-feature"
+    cp -R "$REPO_ROOT/.specify" "$project/.specify"
+    cp "$case_dir/plan.md" "$project/specs/001-demo-feature/plan.md"
+    [[ -d "$case_dir/input" ]] && cp -R "$case_dir/input/." "$project/"
+    git -C "$project" init -q
+    git -C "$project" checkout -q -b 001-demo-feature
+    echo "$project"
+}
+
+for case_dir in "$FIXTURES"/*/; do
+    case_dir="${case_dir%/}"
+    name="${case_dir##*/}"
+    project=$(make_project "$case_dir")
+
+    agents=""
+    [[ -f "$case_dir/agents" ]] && agents=$(cat "$case_dir/agents")
+    rc=0
+    if [[ -z "$agents" ]]; then
+        (cd "$project" && .specify/scripts/bash/update-agent-context.sh) > /dev/null 2>&1 || rc=$?
+    else
+        for agent in $agents; do
+            (cd "$project" && .specify/scripts/bash/update-agent-context.sh "$agent") > /dev/null 2>&1 || rc=$?
+        done
+    fi
+    assert_eq "$name: exits 0" 0 "$rc"
+
+    if $UPDATE; then
+        rm -rf "$case_dir/expected"
+        mkdir -p "$case_dir/expected"
+        (cd "$project" && git ls-files --others --exclude-standard -- . ':!.specify' ':!specs') |
+            while IFS= read -r file; do
+                mkdir -p "$case_dir/expected/$(dirname "$file")"
+                sed "s/$TODAY/@TODAY@/g" "$project/$file" > "$case_dir/expected/$file"
+            done
+        echo "📝 $name: expected/ rewritten"
+        continue
+    fi
+
+    while IFS= read -r file; do
+        sed "s/@TODAY@/$TODAY/g" "$case_dir/expected/$file" > "$TEST_DIR/expected"
+        assert_same_file "$name: $file" "$TEST_DIR/expected" "$project/$file"
+    done < <(cd "$case_dir/expected" && find . -type f | sed 's|^\./||' | LC_ALL=C sort)
+    leftovers=$(cd "$project" && find . -name '*.md.*' -o -name '*.mdc.*')
+    assert_eq "$name: no temporary files left behind" "" "$leftovers"
+done
+
+# --- Interrupted run ---------------------------------------------------------------
+# A signal during the rewrite must not leave CLAUDE.md.XXXXXX in the project root
+# (TERM: background jobs of a non-interactive shell start with SIGINT ignored)
+
+project=$(make_project "$FIXTURES/existing-file")
+awk 'BEGIN { print "## Active Technologies"; for (i = 0; i < 400000; i++) print "- Tech " i " (000-old)" }' \
+    >> "$project/CLAUDE.md"
+(cd "$project" && exec .specify/scripts/bash/update-agent-context.sh claude) > /dev/null 2>&1 &
+pid=$!
+for _ in $(seq 1 200); do
+    compgen -G "$project/CLAUDE.md.*" > /dev/null && break
+    sleep 0.02
+done
+kill -TERM "$pid" 2>/dev/null
+wait "$pid" 2>/dev/null
+assert_eq "interrupted run removes its temporary file" "" "$(compgen -G "$project/CLAUDE.md.*")"
+
+finish_tests
@@ -0,0 +1,140 @@
+#!/bin/bash
+
+# Trivance Platform - workspace-status.sh Tests
+# One repository with a merged linked worktree: what the cached status may and
+# may not hide (edits before cleanup, loose remote-tracking ref updates, the TTL).
+# A second one adds ahead/behind counts, stale branches, orphans and worktree
+# paths that only differ in "/" versus "_"
+
+set -uo pipefail
+
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/lib.sh"
+
+WS="$TEST_DIR/ws"
+R="$WS/trivance-mobile"
+WT="$WS/trivance-mobile-feature"
+export WORKSPACE_STATUS_CACHE_DIR="$TEST_DIR/cache"
+
+# JSON report in $OUTPUT
+run_status() {
+    OUTPUT=$("$REPO_ROOT/scripts/core/workspace-status.sh" --workspace "$WS" \
+        --repos-file "$TEST_DIR/repos.md" --json "$@" 2>/dev/null)
+}
+
+# The JSON object of the worktree at $1 in $OUTPUT
+worktree() {
+    grep -o "{\"path\":\"$1\",\"branch\":[^}]*}" <<<"$OUTPUT"
+}
+
+echo "https://github.com/Trivance-io/trivance-mobile" > "$TEST_DIR/repos.md"
+git init -q --bare -b main "$TEST_DIR/remote.git"
+git clone -q "$TEST_DIR/remote.git" "$R" 2>/dev/null
+echo "one" > "$R/file.txt"
+git -C "$R" add file.txt
+git -C "$R" commit -q -m init
+git -C "$R" push -q origin main
+git -C "$R" remote set-head origin main
+git -C "$R" worktree add -q -b feature "$WT"
+git -C "$WT" commit -q --allow-empty -m work
+git -C "$R" merge -q --ff-only feature
+git -C "$R" push -q origin main
+
+run_status
+assert_contains "merged worktree is a cleanup candidate" \
+    "\"cleanup_candidates\":[{\"path\":\"$WT\",\"repo\":\"trivance-mobile\",\"branch\":\"feature\",\"reason\":\"merged\"}" "$OUTPUT"
+run_status
+assert_contains "unchanged main checkout served from the cache" '"cached":true' "$(worktree "$R")"
+
+# --- Edits within the TTL ----------------------------------------------------------
+
+echo "unsaved work" >> "$WT/file.txt"
+run_status
+assert_contains "edit in a merged worktree shows up at once" '"state":"dirty,merged"' "$(worktree "$WT")"
+assert_contains "edited worktree is no cleanup candidate" '"cleanup_candidates":[]' "$OUTPUT"
+
+# --- Loose remote-tracking refs ------------------------------------------------------
+
+run_status
+commit=$(git -C "$R" commit-tree "HEAD^{tree}" -p HEAD -m upstream)
+git -C "$R" update-ref refs/remotes/origin/main "$commit"
+run_status
+assert_contains "loose origin/main update invalidates the cache" '"ahead":0,"behind":1' "$(worktree "$R")"
+
+# --- Cache TTL and fresh status ----------------------------------------------------------
+
+run_status
+assert_contains "merged worktree never served from the cache" '"cached":false' "$(worktree "$WT")"
+WORKSPACE_STATUS_TTL=0 run_status
+assert_contains "expired entry not served" '"cached":false' "$(worktree "$R")"
+run_status --no-cache
+assert_contains "--no-cache ignores the cache" '"cached":false' "$(worktree "$R")"
+
+# --- Ahead/behind, stale branches and orphans in a second repository ------------------
+
+A="$WS/trivance-api"
+D="$WS/trivance-api-diverged"
+echo "https://github.com/Trivance-io/trivance-api" >> "$TEST_DIR/repos.md"
+git init -q --bare -b main "$TEST_DIR/api.git"
+git clone -q "$TEST_DIR/api.git" "$A" 2>/dev/null
+echo "api" > "$A/file.txt"
+git -C "$A" add file.txt
+git -C "$A" commit -q -m init
+git -C "$A" push -q origin main
+git -C "$A" remote set-head origin main
+
+git -C "$A" worktree add -q -b diverged "$D"
+git -C "$D" commit -q --allow-empty -m shared
+git -C "$D" push -q -u origin diverged 2>/dev/null
+commit=$(git -C "$D" commit-tree "HEAD^{tree}" -p HEAD -m remote)
+git -C "$A" update-ref refs/remotes/origin/diverged "$commit"
+git -C "$D" commit -q --allow-empty -m local1
+git -C "$D" commit -q --allow-empty -m local2
+
+git -C "$A" branch gone main
+git -C "$A" push -q -u origin gone 2>/dev/null
+git -C "$A" push -q origin --delete gone 2>/dev/null
+git -C "$A" checkout -q -b old main
+GIT_COMMITTER_DATE="$(($(date +%s) - 100 * 86400)) +0000" git -C "$A" commit -q --allow-empty -m old
+git -C "$A" checkout -q -b recent main
+git -C "$A" commit -q --allow-empty -m recent
+git -C "$A" checkout -q main
+
+git -C "$A" worktree add -q -b removed "$WS/trivance-api-removed"
+rm -rf "$WS/trivance-api-removed"
+mkdir "$WS/ghost"
+echo "gitdir: $TEST_DIR/gone.git/worktrees/ghost" > "$WS/ghost/.git"
+
+run_status
+assert_contains "ahead and behind counted" '"upstream":"origin/diverged","ahead":2,"behind":1' "$(worktree "$D")"
+assert_contains "ahead and behind is diverged" '"state":"diverged"' "$(worktree "$D")"
+assert_contains "branch whose upstream is gone is stale" \
+    '{"name":"gone","upstream":"origin/gone","merged":false,"stale":"upstream gone"' "$OUTPUT"
+assert_contains "unmerged branch without recent commits is stale" \
+    '{"name":"old","upstream":"","merged":false,"stale":"no commits in 100 days"' "$OUTPUT"
+assert_contains "unmerged branch with recent commits is not stale" \
+    '{"name":"recent","upstream":"","merged":false,"stale":null' "$OUTPUT"
+assert_contains "removed worktree directory is orphaned" \
+    "{\"path\":\"$WS/trivance-api-removed\",\"repo\":\"trivance-api\",\"reason\":\"worktree directory missing" "$OUTPUT"
+assert_contains "sibling with a missing gitdir is orphaned" \
+    "{\"path\":\"$WS/ghost\",\"repo\":\"\",\"reason\":\"gitdir $TEST_DIR/gone.git/worktrees/ghost no longer exists\"}" "$OUTPUT"
+assert_contains "orphans are cleanup candidates" \
+    "{\"path\":\"$WS/ghost\",\"repo\":\"\",\"branch\":\"\",\"reason\":\"orphaned\"}" "$OUTPUT"
+run_status --stale-days 200
+assert_contains "--stale-days moves the threshold" '{"name":"old","upstream":"","merged":false,"stale":null' "$OUTPUT"
+
+# Within the TTL an unmerged worktree is served from the cache, new files included
+echo "scratch" > "$D/scratch.txt"
+run_status
+assert_contains "edit in an unmerged worktree waits for the TTL" '"cached":true' "$(worktree "$D")"
+WORKSPACE_STATUS_TTL=0 run_status
+assert_contains "edit shows up once the entry expires" '"untracked":1' "$(worktree "$D")"
+
+# --- Cache file names ----------------------------------------------------------------------
+
+git -C "$A" worktree add -q -b p1 "$TEST_DIR/paths/a/b_c"
+git -C "$A" worktree add -q -b p2 "$TEST_DIR/paths/a_b/c"
+WORKSPACE_STATUS_CACHE_DIR="$TEST_DIR/cache2" run_status
+assert_eq "every worktree gets its own cache file" "$(grep -o '"cached":' <<<"$OUTPUT" | wc -l | tr -d ' ')" \
+    "$(ls "$TEST_DIR/cache2" | wc -l | tr -d ' ')"
+
+finish_tests